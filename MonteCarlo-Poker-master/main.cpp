@@ -46,6 +46,22 @@ vector<string> parseCards(const string& input) {
     return cards;
 }
 
+// Percent of showdowns per hand category, averaged over players [first, last)
+string categoriesJson(const vector<vector<int>>& categories, int first, int last, int iterations) {
+    stringstream out;
+    out << "[";
+    int players = max(1, last - first);
+    for (int category = 0; category < Simulator::NUM_CATEGORIES; category++) {
+        long long count = 0;
+        for (int player = first; player < last && player < static_cast<int>(categories.size()); player++) {
+            count += categories[player][category];
+        }
+        out << (category ? ", " : "") << (count * 100.0) / iterations / players;
+    }
+    out << "]";
+    return out.str();
+}
+
 void runDaemonMode() {
     try {
         cerr << "Loading lookup table..." << endl;
@@ -82,7 +98,7 @@ void runDaemonMode() {
                         parts.push_back(part);
                     }
                     if (parts.size() != 4) {
-                        cout << "{\"error\": \"Invalid command format. Expected: CALC board|hole|opponents|iterations\"}" << endl;
+                        cout << "{\"error\": \"Invalid command format. Expected: CALC board|hole[;hole...]|opponents|iterations\"}" << endl;
                         cout.flush();
                         continue;
                     }
@@ -90,11 +106,35 @@ void runDaemonMode() {
                     string hole_str = parts[1];
                     int opponents = stoi(parts[2]);
                     int iterations = stoi(parts[3]);
-                    if (opponents < 1 || opponents > 8) {
+                    // Known hands: "As,Kh" or several separated by ';' ("As,Kh;Qd,Qc")
+                    vector<vector<string>> known_hands;
+                    bool hands_valid = true;
+                    stringstream hands_stream(hole_str);
+                    string hand_str;
+                    while (getline(hands_stream, hand_str, ';')) {
+                        vector<string> hand = parseCards(hand_str);
+                        if (hand.size() != 2) {
+                            hands_valid = false;
+                            break;
+                        }
+                        known_hands.push_back(hand);
+                    }
+                    if (!hands_valid || known_hands.empty()) {
+                        cout << "{\"error\": \"Need exactly 2 hole cards\"}" << endl;
+                        cout.flush();
+                        continue;
+                    }
+                    int min_opponents = known_hands.size() > 1 ? 0 : 1;
+                    if (opponents < min_opponents || opponents > 8) {
                         cout << "{\"error\": \"Opponents must be 1-8\"}" << endl;
                         cout.flush();
                         continue;
                     }
+                    if (known_hands.size() + opponents > 10) {
+                        cout << "{\"error\": \"At most 10 players\"}" << endl;
+                        cout.flush();
+                        continue;
+                    }
                     if (iterations < 100 || iterations > 1000000) {
                         cout << "{\"error\": \"Iterations must be 100-1000000\"}" << endl;
                         cout.flush();
@@ -106,15 +146,10 @@ void runDaemonMode() {
                         cout.flush();
                         continue;
                     }
-                    vector<string> hole_cards = parseCards(hole_str);
-                    if (hole_cards.size() != 2) {
-                        cout << "{\"error\": \"Need exactly 2 hole cards\"}" << endl;
-                        cout.flush();
-                        continue;
-                    }
-                    vector<vector<string>> known_hands = {hole_cards};
                     vector<string> all_cards = comm_hand;
-                    all_cards.insert(all_cards.end(), hole_cards.begin(), hole_cards.end());
+                    for (const auto& hand : known_hands) {
+                        all_cards.insert(all_cards.end(), hand.begin(), hand.end());
+                    }
                     sort(all_cards.begin(), all_cards.end());
                     auto it = unique(all_cards.begin(), all_cards.end());
                     if (it != all_cards.end()) {
@@ -122,9 +157,11 @@ void runDaemonMode() {
                         cout.flush();
                         continue;
                     }
+                    vector<vector<int>> categories;
                     vector<vector<int>> results = sim.compute_probabilities(
-                        iterations, comm_hand, known_hands, opponents
+                        iterations, comm_hand, known_hands, opponents, &categories
                     );
+                    int known = static_cast<int>(known_hands.size());
                     double win_rate = (results[0][0] * 100.0) / iterations;
                     double tie_rate = (results[0][1] * 100.0) / iterations;
                     double lose_rate = 100.0 - win_rate - tie_rate;
@@ -132,7 +169,37 @@ void runDaemonMode() {
                          << ", \"tie_rate\": " << tie_rate
                          << ", \"lose_rate\": " << lose_rate
                          << ", \"simulations_completed\": " << iterations
-                         << "}" << endl;
+                         << ", \"hero_categories\": " << categoriesJson(categories, 0, 1, iterations)
+                         << ", \"opponent_categories\": "
+                         << categoriesJson(categories, known, static_cast<int>(categories.size()), iterations);
+                    if (known > 1) {
+                        // Per known hand results from the same simulation
+                        cout << ", \"hands\": [";
+                        for (int i = 0; i < known; i++) {
+                            double hand_win = (results[i][0] * 100.0) / iterations;
+                            double hand_tie = (results[i][1] * 100.0) / iterations;
+                            cout << (i ? ", " : "") << "{\"win_rate\": " << hand_win
+                                 << ", \"tie_rate\": " << hand_tie
+                                 << ", \"lose_rate\": " << 100.0 - hand_win - hand_tie
+                                 << ", \"categories\": " << categoriesJson(categories, i, i + 1, iterations)
+                                 << "}";
+                        }
+                        cout << "]";
+                    }
+                    if (opponents > 0) {
+                        long long unknown_wins = 0, unknown_ties = 0;
+                        for (size_t i = known; i < results.size(); i++) {
+                            unknown_wins += results[i][0];
+                            unknown_ties += results[i][1];
+                        }
+                        double unknown_win = (unknown_wins * 100.0) / iterations / opponents;
+                        double unknown_tie = (unknown_ties * 100.0) / iterations / opponents;
+                        cout << ", \"unknown\": {\"players\": " << opponents
+                             << ", \"win_rate\": " << unknown_win
+                             << ", \"tie_rate\": " << unknown_tie
+                             << ", \"lose_rate\": " << 100.0 - unknown_win - unknown_tie << "}";
+                    }
+                    cout << "}" << endl;
                     cout.flush();
                 } catch (const exception& e) {
                     cout << "{\"error\": \"" << e.what() << "\"}" << endl;
@@ -304,6 +371,10 @@ CALC Jh,Ts,9c,2d|As,Kh|1|100000
 Ривер (As Kh, борд Jh Ts 9c 2d 5h, 5 оппонентов):
 CALC Jh,Ts,9c,2d,5h|As,Kh|5|100000
 
+Несколько известных рук (As Kh против Qd Qc, без неизвестных игроков):
+CALC Jh,Ts,9c|As,Kh;Qd,Qc|0|100000
+Ответ дополнительно содержит "hands" (по каждой руке) и "unknown".
+
 ========================================
 ПОСЛЕ ПЕРЕСБОРКИ:
 ========================================
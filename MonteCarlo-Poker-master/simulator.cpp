@@ -132,6 +132,12 @@ int Simulator::evaluate_selection(vector<int> selection){
     return max_score;
 }
 
+// Score layout: category * 169 * 13^5 + kickers (see print_score in cards.cpp)
+int Simulator::category_of(int score){
+    int category = score / 371293 / 169;
+    return category < 0 ? 0 : (category >= NUM_CATEGORIES ? NUM_CATEGORIES - 1 : category);
+}
+
 void Simulator::update_winners(int my_val, int &max_val, int ix, vector<int> &winners){
     if (my_val > max_val){
         winners.clear();
@@ -143,7 +149,8 @@ void Simulator::update_winners(int my_val, int &max_val, int ix, vector<int> &wi
     }
 }
 
-vector<int> Simulator::simulate(vector<int> &selection, vector<vector<int>> &known_hands, vector<int> &sample, int start){
+vector<int> Simulator::simulate(vector<int> &selection, vector<vector<int>> &known_hands, vector<int> &sample, int start,
+                                vector<vector<int>> *categories){
     vector<int> winners;
     int max_val = 0;
 
@@ -160,6 +167,9 @@ vector<int> Simulator::simulate(vector<int> &selection, vector<vector<int>> &kno
         int eval_result = evaluate_selection(selection);
         if (eval_result >= 0) {
             update_winners(eval_result, max_val, static_cast<int>(i), winners);
+            if (categories) {
+                (*categories)[i][category_of(eval_result)]++;
+            }
         }
     }
 
@@ -170,13 +180,17 @@ vector<int> Simulator::simulate(vector<int> &selection, vector<vector<int>> &kno
         int eval_result = evaluate_selection(selection);
         if (eval_result >= 0) {
             update_winners(eval_result, max_val, static_cast<int>(known_hands.size()) + i, winners);
+            if (categories && known_hands.size() + i < categories->size()) {
+                (*categories)[known_hands.size() + i][category_of(eval_result)]++;
+            }
         }
     }
 
     return winners;
 }
 
-vector<vector<int>> Simulator::calculate(int N, vector<int> comm_hand, vector<vector<int>> known_hands, int players_unknown){
+vector<vector<int>> Simulator::calculate(int N, vector<int> comm_hand, vector<vector<int>> known_hands, int players_unknown,
+                                         vector<vector<int>> *categories){
     vector<vector<int>> samples = fill_empty(N, comm_hand, known_hands, players_unknown);
     if (samples.empty()) {
         cerr << "[Error] No samples available for calculation" << endl;
@@ -185,6 +199,10 @@ vector<vector<int>> Simulator::calculate(int N, vector<int> comm_hand, vector<ve
     
     vector<int> selection(7);
     vector<vector<int>> results(known_hands.size() + players_unknown, vector<int>(2, 0));
+    if (categories) {
+        // Showdown hand category counts per player, filled in the same pass
+        categories->assign(results.size(), vector<int>(NUM_CATEGORIES, 0));
+    }
 
     for (size_t i = 0; i < comm_hand.size() && i < 7; ++i){
         selection[i] = comm_hand[i];
@@ -199,7 +217,7 @@ vector<vector<int>> Simulator::calculate(int N, vector<int> comm_hand, vector<ve
             }
         }
 
-        vector<int> winners = simulate(selection, known_hands, const_cast<vector<int>&>(sample), s_comm);
+        vector<int> winners = simulate(selection, known_hands, const_cast<vector<int>&>(sample), s_comm, categories);
         
         if (winners.size() == 1 && winners[0] < static_cast<int>(results.size())) {
             results[winners[0]][0]++;
@@ -240,7 +258,8 @@ void Simulator::format_result(int N, vector<int> result) {
 }
 
 // ===== ИСПРАВЛЕННАЯ ФУНКЦИЯ: БЕЗ ТАБЛИЧНОГО ВЫВОДА =====
-vector<vector<int>> Simulator::compute_probabilities(int N, vector<string>& comm_hand_str, vector<vector<string>>& known_hands_str, int players_unknown){
+vector<vector<int>> Simulator::compute_probabilities(int N, vector<string>& comm_hand_str, vector<vector<string>>& known_hands_str, int players_unknown,
+                                                     vector<vector<int>> *categories){
     // Время засекаем только для внутренней диагностики (если нужно)
     // Но ничего не печатаем на stdout!
     
@@ -251,7 +270,7 @@ vector<vector<int>> Simulator::compute_probabilities(int N, vector<string>& comm
         known_hands.push_back(convert_hand(known_hand_str));
     }
 
-    vector<vector<int>> results = calculate(N, comm_hand, known_hands, players_unknown);
+    vector<vector<int>> results = calculate(N, comm_hand, known_hands, players_unknown, categories);
 
     // ====== КРИТИЧНО: НИКАКОГО cout/printf НА STDOUT! ======
     // Весь вывод табличных данных только в legacy-режиме через main.cpp!
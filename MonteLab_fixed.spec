@@ -14,6 +14,8 @@ datas = [
     ('models/*.pt', 'models'),
     ('MonteCarlo-Poker-master/MonteCarloPoker.exe', 'MonteCarlo-Poker-master'),
     ('MonteCarlo-Poker-master/lookup_tablev3.bin', 'MonteCarlo-Poker-master'),
+    ('core/poker/data/*.npz', 'core/poker/data'),
+    ('core/poker/data/*.npy', 'core/poker/data'),
 ]
 
 # Hidden imports
@@ -85,6 +85,7 @@ def build_with_nuitka():
 
         # Включить data files
         "--include-data-dir=models=models",
+        "--include-data-dir=core/poker/data=core/poker/data",
 
         # Оптимизации
         "--assume-yes-for-downloads",
@@ -75,6 +75,7 @@ a = Analysis(
     binaries=[],
     datas=[
         ('models', 'models'),  # Включить модели
+        ('core/poker/data', 'core/poker/data'),  # Таблицы модели эквити
     ],
     hiddenimports=[
         'main_start',
@@ -1,7 +1,7 @@
 """Game state enums and data structures"""
 from enum import Enum
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 from .card import Card
 
 
@@ -57,6 +57,14 @@ class GameState:
     stage: GameStage
     player_cards: List[Card]
     board_cards: List[Card]
+    # Tournament context: chip stacks (hero first) and payouts by finishing place
+    stacks: Optional[List[float]] = None
+    payouts: Optional[List[float]] = None
+    big_blind: Optional[float] = None
+    position: Optional[Position] = None
+    # Current betting: pot including the bet hero faces, and the amount to call
+    pot: Optional[float] = None
+    to_call: Optional[float] = None
     
     def get_opponents_count(self) -> int:
         """Get number of opponents based on table size"""
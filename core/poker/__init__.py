@@ -1,8 +1,20 @@
 """Poker logic package - Hand evaluation and analysis"""
 from .hand_evaluator import HandEvaluator
 from .equity_calculator import EquityCalculator, MonteCarloBackend
+from .hand_range import HandRange
+from .range_vs_range import RangeVsRangeCalculator
 from .board_analyzer import BoardAnalyzer
 from .outs_calculator import OutsCalculator
+from .fast_evaluator import FastHandEvaluator
+from .runout_analyzer import RunoutAnalyzer
+from .hand_strength import HandStrengthCalculator
+from .texture_table import BoardTextureTable
+from .texture_index import BoardTextureIndex
+from .equity_model import EquityApproximator
+from .icm import ICMCalculator
+from .ev_calculator import EVCalculator
+from .preflop_matrix import PreflopEquityMatrix
+from .push_fold import PushFoldChart
 from .monte_carlo_backend import CppMonteCarloBackend
 
 __all__ = [
@@ -10,6 +22,18 @@ __all__ = [
     'EquityCalculator',
     'MonteCarloBackend',
     'CppMonteCarloBackend',
+    'HandRange',
+    'RangeVsRangeCalculator',
     'BoardAnalyzer',
-    'OutsCalculator'
+    'OutsCalculator',
+    'FastHandEvaluator',
+    'RunoutAnalyzer',
+    'HandStrengthCalculator',
+    'BoardTextureTable',
+    'BoardTextureIndex',
+    'EquityApproximator',
+    'ICMCalculator',
+    'EVCalculator',
+    'PreflopEquityMatrix',
+    'PushFoldChart'
 ]
@@ -1,17 +1,37 @@
 """Board texture analysis"""
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import Counter
 from core.domain import Card
+from .texture_table import BoardTextureTable
 
 
 class BoardAnalyzer:
     """Analyze board texture and properties"""
     
+    def __init__(self):
+        self._texture_table: Optional[BoardTextureTable] = None
+    
+    @property
+    def texture_table(self) -> BoardTextureTable:
+        """Canonical flop texture table (generated on first use)"""
+        if self._texture_table is None:
+            self._texture_table = BoardTextureTable()
+        return self._texture_table
+    
     def analyze_texture(self, board_cards: List[Card]) -> Dict[str, any]:
         """Comprehensive board texture analysis"""
         if len(board_cards) < 3:
             return {"error": "Need at least 3 board cards"}
         
+        if len(board_cards) <= 5:
+            texture = self.texture_table.lookup(board_cards)
+            if "error" not in texture:
+                return texture
+        
+        return self._compute_texture(board_cards)
+    
+    def _compute_texture(self, board_cards: List[Card]) -> Dict[str, any]:
+        """Direct texture computation (fallback for boards the table does not cover)"""
         suit_counter = Counter(card.suit for card in board_cards)
         rank_counter = Counter(card.rank for card in board_cards)
         rank_values = sorted([card.rank_value() for card in board_cards])
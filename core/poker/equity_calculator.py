@@ -3,6 +3,8 @@ from typing import List, Dict, Optional
 from abc import ABC, abstractmethod
 import logging
 from core.domain import Card
+from .holding_equity import HoldingEquityCalculator
+from .range_equity import RangeEquityCalculator, RangeSpec
 
 logger = logging.getLogger(__name__)
 
@@ -10,11 +12,20 @@ logger = logging.getLogger(__name__)
 class MonteCarloBackend(ABC):
     """Abstract interface for Monte Carlo simulation backends"""
     
+    # Whether calculate_equity runs the requested iterations (callers may
+    # then split a budget into several calls)
+    honours_iterations: bool = True
+    
     @abstractmethod
     def calculate_equity(self, hole_cards: List[Card], board_cards: List[Card],
                         num_opponents: int, iterations: int) -> Dict[str, float]:
         """Calculate equity using Monte Carlo simulation"""
         pass
+    
+    def calculate_hands_equity(self, known_hands: List[List[Card]], board_cards: List[Card],
+                               num_unknown: int, iterations: int) -> Dict[str, any]:
+        """Per-hand equity of several known hands in one simulation (optional)"""
+        return {"error": "Multiple known hands not supported by this backend"}
 
 
 class EquityCalculator:
@@ -22,6 +33,8 @@ class EquityCalculator:
     
     def __init__(self, backend: Optional[MonteCarloBackend] = None):
         self.backend = backend
+        self._holding_equity: Optional[HoldingEquityCalculator] = None
+        self._range_equity: Optional[RangeEquityCalculator] = None
         if backend is None:
             logger.warning("No Monte Carlo backend provided - equity calculations disabled")
     
@@ -41,3 +54,58 @@ class EquityCalculator:
         
         # Delegate to backend
         return self.backend.calculate_equity(hole_cards, board_cards, num_opponents, iterations)
+    
+    def calculate_hands_equity(self, known_hands: List[List[Card]], board_cards: List[Card],
+                               num_unknown: int = 0, iterations: int = 10000) -> Dict[str, any]:
+        """
+        Equity of several known hands (showdown replays, revealed hands) at once.
+        
+        One simulation returns per-hand results in "hands" (input order) and,
+        with unknown players, their averaged rates in "unknown". Runs on the
+        backend when it supports it, otherwise on the vectorized range engine.
+        """
+        if not known_hands or any(len(hand) != 2 for hand in known_hands):
+            return {"error": "Each known hand needs exactly 2 cards"}
+        
+        if len(board_cards) > 5:
+            return {"error": "Board cannot have more than 5 cards"}
+        
+        if self.backend is not None:
+            result = self.backend.calculate_hands_equity(known_hands, board_cards, num_unknown, iterations)
+            if "error" not in result:
+                return result
+            logger.debug(f"Backend multi-hand equity unavailable: {result['error']}")
+        
+        if self._range_equity is None:
+            self._range_equity = RangeEquityCalculator()
+        return self._range_equity.calculate_hands(known_hands, board_cards, ["random"] * num_unknown, iterations)
+    
+    def equity_vs_holdings(self, hole_cards: List[Card], board_cards: List[Card]) -> Dict[str, any]:
+        """
+        Hero equity against every possible opponent holding in one pass.
+        
+        Exact enumeration on flop/turn/river (no backend needed), aggregated
+        by 169 preflop chart classes and by the opponent's made-hand category.
+        """
+        if self._holding_equity is None:
+            self._holding_equity = HoldingEquityCalculator()
+        return self._holding_equity.analyze(hole_cards, board_cards)
+    
+    def runout_breakdown(self, hole_cards: List[Card], board_cards: List[Card]) -> Dict[str, any]:
+        """Heads-up equity by next card and equity histogram over all runouts (flop/turn)"""
+        if self._holding_equity is None:
+            self._holding_equity = HoldingEquityCalculator()
+        return self._holding_equity.runout_breakdown(hole_cards, board_cards)
+    
+    def calculate_range_equity(self, hole_cards: List[Card], board_cards: List[Card],
+                               opponent_ranges: List[RangeSpec],
+                               iterations: int = 10000) -> Dict[str, float]:
+        """
+        Equity against opponents holding weighted ranges instead of random hands.
+        
+        opponent_ranges holds one range per opponent, either HandRange objects
+        or notation strings such as "TT+, AKs, A5s-A2s, KQo".
+        """
+        if self._range_equity is None:
+            self._range_equity = RangeEquityCalculator()
+        return self._range_equity.calculate(hole_cards, board_cards, opponent_ranges, iterations)
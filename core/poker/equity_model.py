@@ -0,0 +1,218 @@
+"""Equity approximation - Precomputed lookup model for instant equity previews"""
+from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+import logging
+import time
+import numpy as np
+from core.domain import Card
+from .fast_evaluator import FastHandEvaluator, cards_to_indices
+from .holding_equity import ALL_COMBOS
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = Path(__file__).parent / "data" / "equity_model.npz"
+
+MAX_OPPONENTS = 8
+HS_NODES = 20
+HS_CENTERS = (np.arange(HS_NODES) + 0.5) / HS_NODES
+# Upper edges of the draw buckets: 0, 1-2, 3-4, 5-6, 7-8, 9-10, 11+ cards
+DRAW_EDGES = np.array([0, 2, 4, 6, 8, 10])
+NUM_DRAW_BUCKETS = len(DRAW_EDGES) + 1
+STRAIGHT_CATEGORY = 4
+ERROR_QUANTILE = 95
+MIN_NODE_SPOTS = 5
+TABLE_SHAPE = (3, MAX_OPPONENTS, 2, NUM_DRAW_BUCKETS, HS_NODES)
+
+
+class EquityApproximator:
+    """
+    Equity estimate in a fraction of a millisecond from tables trained on simulations.
+
+    A spot is reduced to cheap features: street, number of opponents,
+    whether the board allows a flush, the number of next cards that give
+    hero a straight or better (bucketed) and current hand strength against
+    a random holding. For each (street, opponents, flush board, draw) group
+    the simulated win and tie rates are tabulated at HS_NODES hand strength
+    nodes and interpolated linearly. The error table holds the 95th
+    percentile absolute win-rate error of training spots near each node,
+    reported as the estimate's error bound.
+    """
+
+    def __init__(self, win: np.ndarray, tie: np.ndarray, error: np.ndarray,
+                 evaluator: Optional[FastHandEvaluator] = None):
+        # Tables: [street (flop/turn/river), opponents - 1, flush board, draw bucket, hs node]
+        self.win = win
+        self.tie = tie
+        self.error = error
+        self.evaluator = evaluator or FastHandEvaluator()
+        self._combo_keys = self.evaluator.hand_keys(ALL_COMBOS)
+
+    @classmethod
+    def load(cls, path: Path = MODEL_PATH,
+             evaluator: Optional[FastHandEvaluator] = None) -> "EquityApproximator":
+        """Load a trained model (see train_equity_model)"""
+        with np.load(path) as data:
+            return cls(data["win"], data["tie"], data["error"], evaluator)
+
+    def save(self, path: Path = MODEL_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, win=self.win.astype(np.float32), tie=self.tie.astype(np.float32),
+                            error=self.error.astype(np.float32))
+
+    # ==================== Estimate ====================
+
+    def estimate(self, hole_cards: List[Card], board_cards: List[Card],
+                 num_opponents: int = 1) -> Dict[str, any]:
+        """Approximate win/tie/lose rates (percent) with an error bound on the win rate"""
+        if len(hole_cards) != 2:
+            return {"error": "Need exactly 2 hole cards"}
+        if not 3 <= len(board_cards) <= 5:
+            return {"error": "Equity estimate requires 3 to 5 board cards"}
+        if not 1 <= num_opponents <= MAX_OPPONENTS:
+            return {"error": "Opponents must be between 1-8"}
+
+        hole = cards_to_indices(hole_cards)
+        board = cards_to_indices(board_cards)
+        if len(set(hole + board)) != len(hole) + len(board):
+            return {"error": "Duplicate cards detected"}
+
+        flush_board, draw_bucket, hand_strength = self.features(hole, board)
+        group = (len(board) - 3, num_opponents - 1, flush_board, draw_bucket)
+        win = float(np.interp(hand_strength, HS_CENTERS, self.win[group]))
+        tie = float(np.interp(hand_strength, HS_CENTERS, self.tie[group]))
+        node = min(int(hand_strength * HS_NODES), HS_NODES - 1)
+        return {
+            "win_rate": round(win, 2),
+            "tie_rate": round(tie, 2),
+            "lose_rate": round(100.0 - win - tie, 2),
+            "error_bound": round(float(self.error[group][node]), 2),
+            "calculation_mode": "approximation",
+        }
+
+    def features(self, hole: List[int], board: List[int]) -> Tuple[int, int, float]:
+        """(flush board, draw bucket, hand strength 0..1) for card indices"""
+        ev = self.evaluator
+        hero_rank, hero_suit, hero_mask = ev.hand_keys(hole + board)
+        board_rank, board_suit, board_mask = ev.hand_keys(board)
+        combo_rank, combo_suit, combo_mask = self._combo_keys
+
+        hero = int(ev.evaluate_keys(hero_rank, hero_suit, hero_mask))
+        live = (combo_mask & hero_mask) == 0
+        opponents = ev.evaluate_keys(combo_rank[live] + board_rank, combo_suit[live] + board_suit,
+                                     combo_mask[live] | board_mask)
+        hand_strength = (np.count_nonzero(opponents < hero)
+                         + np.count_nonzero(opponents == hero) / 2.0) / len(opponents)
+
+        # Next cards that make a straight or better and improve the category
+        draws = 0
+        if len(board) < 5:
+            card_rank, card_suit, card_mask = ev.card_keys(ev.remaining_indices(hole + board))
+            after = ev.category(ev.evaluate_keys(hero_rank + card_rank, hero_suit + card_suit,
+                                                 hero_mask | card_mask))
+            draws = int(np.count_nonzero((after >= STRAIGHT_CATEGORY) & (after > ev.category(hero))))
+
+        flush_board = int(np.bincount(np.asarray(board) // 13, minlength=4).max() >= 3)
+        return flush_board, int(np.searchsorted(DRAW_EDGES, draws)), hand_strength
+
+
+# ==================== Training ====================
+
+def simulate_spot(evaluator: FastHandEvaluator, rng: np.random.RandomState, hole: List[int],
+                  board: List[int], samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulated win and tie rates (percent) against 1..MAX_OPPONENTS random opponents.
+
+    One batch of runouts and opponent holdings serves every table size:
+    against n opponents hero is compared with the best of the first n.
+    """
+    ev = evaluator
+    dead = hole + board
+    needed = 5 - len(board) + 2 * MAX_OPPONENTS
+    keys = rng.random_sample((samples, 52))
+    keys[:, dead] = 2.0
+    drawn = np.argpartition(keys, needed - 1, axis=1)[:, :needed]
+    runout, holdings = drawn[:, :5 - len(board)], drawn[:, 5 - len(board):]
+
+    board_rank, board_suit, board_mask = ev.hand_keys(board)
+    run_rank, run_suit, run_mask = ev.hand_keys(runout)
+    common = (board_rank + run_rank, board_suit + run_suit, board_mask | run_mask)
+    hero_rank, hero_suit, hero_mask = ev.hand_keys(hole)
+    hero = ev.evaluate_keys(common[0] + hero_rank, common[1] + hero_suit, common[2] | hero_mask)
+    opp_rank, opp_suit, opp_mask = ev.hand_keys(holdings.reshape(samples, MAX_OPPONENTS, 2))
+    opponents = ev.evaluate_keys(common[0][:, None] + opp_rank, common[1][:, None] + opp_suit,
+                                 common[2][:, None] | opp_mask)
+
+    best = np.maximum.accumulate(opponents, axis=1)
+    win = (hero[:, None] > best).mean(axis=0) * 100.0
+    tie = (hero[:, None] == best).mean(axis=0) * 100.0
+    return win, tie
+
+
+def train_equity_model(spots_per_street: int = 20000, samples: int = 2000, seed: int = 0,
+                       evaluator: Optional[FastHandEvaluator] = None) -> EquityApproximator:
+    """
+    Fit the tables from random spots simulated with the vectorized evaluator.
+
+    Nodes without enough training spots are interpolated from their
+    neighbours; groups with too few spots use the whole street's curve.
+    """
+    ev = evaluator or FastHandEvaluator()
+    model = EquityApproximator(np.zeros(TABLE_SHAPE), np.zeros(TABLE_SHAPE), np.zeros(TABLE_SHAPE), ev)
+    rng = np.random.RandomState(seed)
+    start = time.time()
+
+    for street, board_size in enumerate((3, 4, 5)):
+        groups = np.zeros(spots_per_street, dtype=np.int64)
+        strengths = np.zeros(spots_per_street)
+        wins = np.zeros((spots_per_street, MAX_OPPONENTS))
+        ties = np.zeros((spots_per_street, MAX_OPPONENTS))
+        for spot in range(spots_per_street):
+            cards = rng.choice(52, 2 + board_size, replace=False).tolist()
+            hole, board = cards[:2], cards[2:]
+            flush_board, draw_bucket, strengths[spot] = model.features(hole, board)
+            groups[spot] = flush_board * NUM_DRAW_BUCKETS + draw_bucket
+            wins[spot], ties[spot] = simulate_spot(ev, rng, hole, board, samples)
+
+        nodes = np.minimum((strengths * HS_NODES).astype(np.int64), HS_NODES - 1)
+        for opponents in range(MAX_OPPONENTS):
+            street_curves = _fit_curves(nodes, strengths, wins[:, opponents], ties[:, opponents])
+            for group in range(2 * NUM_DRAW_BUCKETS):
+                members = groups == group
+                curves = _fit_curves(nodes[members], strengths[members], wins[members, opponents],
+                                     ties[members, opponents]) or street_curves
+                index = (street, opponents) + divmod(group, NUM_DRAW_BUCKETS)
+                model.win[index], model.tie[index], model.error[index] = curves
+        logger.info(f"Equity model: board size {board_size} trained ({time.time() - start:.0f}s)")
+
+    return model
+
+
+def _fit_curves(nodes: np.ndarray, strengths: np.ndarray, win: np.ndarray,
+                tie: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Win/tie means at the hand strength nodes and the interpolation error quantile per node"""
+    counts = np.bincount(nodes, minlength=HS_NODES)
+    filled = counts >= MIN_NODE_SPOTS
+    if filled.sum() < 2:
+        return None
+
+    centers = HS_CENTERS[filled]
+    win_curve = np.interp(HS_CENTERS, centers,
+                          np.bincount(nodes, weights=win, minlength=HS_NODES)[filled] / counts[filled])
+    tie_curve = np.interp(HS_CENTERS, centers,
+                          np.bincount(nodes, weights=tie, minlength=HS_NODES)[filled] / counts[filled])
+
+    residuals = np.abs(win - np.interp(strengths, HS_CENTERS, win_curve))
+    overall = np.percentile(residuals, ERROR_QUANTILE)
+    error_curve = np.array([
+        max(np.percentile(residuals[nodes == node], ERROR_QUANTILE), overall / 2)
+        if counts[node] >= MIN_NODE_SPOTS else overall
+        for node in range(HS_NODES)
+    ])
+    return win_curve, tie_curve, error_curve
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    trained = train_equity_model()
+    trained.save()
+    logger.info(f"Saved equity model to {MODEL_PATH}")
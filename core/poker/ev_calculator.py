@@ -0,0 +1,116 @@
+"""EV calculator - Chip EV of fold, call and every bet size in one vectorized pass"""
+from typing import List, Dict, Optional, Sequence
+import numpy as np
+
+# Default raise sizes as fractions of the pot after calling
+DEFAULT_POT_FRACTIONS = (0.33, 0.5, 0.75, 1.0, 1.5)
+
+
+class EVCalculator:
+    """
+    Immediate chip EV of each action, measured against folding (EV 0).
+
+    Call: equity * (pot + call) - call. Bet / raise to an amount: the
+    opponent folds with probability f and otherwise calls the difference,
+    EV = f * pot + (1 - f) * (equity when called * final pot - amount).
+    With a plain equity, f is the given fold_equity. With an equity
+    distribution (hero equity against each opponent holding, optionally
+    weighted), the opponent continues with exactly the holdings whose
+    equity covers the price of calling that size, which yields f and the
+    equity when called per size. All sizes are evaluated as one
+    (sizes x holdings) array; future streets are not modelled.
+    """
+
+    def __init__(self, pot_fractions: Sequence[float] = DEFAULT_POT_FRACTIONS):
+        self.pot_fractions = tuple(pot_fractions)
+
+    def bet_sizes(self, pot: float, to_call: float, stack: float) -> np.ndarray:
+        """Candidate raise-to amounts: pot fractions after calling plus all-in, capped by stack"""
+        sizes = to_call + np.asarray(self.pot_fractions) * (pot + to_call)
+        sizes = np.append(sizes[sizes < stack], stack)
+        return np.unique(np.round(sizes, 2))
+
+    def calculate(self, pot: float, to_call: float, hero_stack: float,
+                  villain_stack: Optional[float] = None, equity: Optional[float] = None,
+                  equity_distribution: Optional[np.ndarray] = None,
+                  distribution_weights: Optional[np.ndarray] = None,
+                  bet_sizes: Optional[List[float]] = None,
+                  fold_equity: float = 0.0) -> Dict[str, any]:
+        """
+        EV of fold, call/check and each bet size, ranked.
+
+        Chip amounts share one unit (chips or big blinds); equity is 0..1.
+        pot includes the bet hero is facing; bet sizes are totals hero puts in.
+        """
+        if pot < 0 or to_call < 0 or hero_stack <= 0:
+            return {"error": "Pot, call and stack must be non-negative with chips behind"}
+        if equity is None and equity_distribution is None:
+            return {"error": "Need equity or an equity distribution"}
+        if not 0.0 <= fold_equity <= 1.0:
+            return {"error": "Fold equity must be between 0-1"}
+
+        if equity_distribution is not None:
+            holdings = np.asarray(equity_distribution, dtype=np.float64)
+            weights = (np.ones(len(holdings)) if distribution_weights is None
+                       else np.asarray(distribution_weights, dtype=np.float64))
+            if len(holdings) == 0 or weights.sum() <= 0:
+                return {"error": "Equity distribution is empty"}
+            weights = weights / weights.sum()
+            hero_equity = float(holdings @ weights)
+        else:
+            holdings, weights = None, None
+            hero_equity = float(equity)
+
+        villain_stack = hero_stack if villain_stack is None else villain_stack
+        call_amount = float(min(to_call, hero_stack))
+        call_ev = hero_equity * (pot + call_amount) - call_amount
+
+        sizes = (self.bet_sizes(pot, to_call, hero_stack) if bet_sizes is None
+                 else np.unique(np.clip(np.asarray(bet_sizes, dtype=np.float64), 0, hero_stack)))
+        # Only sizes that raise, limited to what the opponent can call
+        sizes = sizes[sizes > to_call]
+        villain_call = np.minimum(sizes - to_call, villain_stack)
+        final_pot = pot + np.minimum(sizes, to_call + villain_stack) + villain_call
+        invested = np.minimum(sizes, to_call + villain_stack)
+
+        if holdings is not None:
+            # A holding continues when its equity covers the price of calling (sizes x holdings)
+            continues = (1.0 - holdings)[None, :] >= (villain_call / final_pot)[:, None]
+            continue_weight = continues @ weights
+            fold_probability = 1.0 - continue_weight
+            called_equity = np.where(continue_weight > 0,
+                                     (continues * holdings[None, :]) @ weights / np.maximum(continue_weight, 1e-12),
+                                     hero_equity)
+        else:
+            fold_probability = np.full(len(sizes), fold_equity)
+            called_equity = np.full(len(sizes), hero_equity)
+
+        raise_ev = fold_probability * pot + (1.0 - fold_probability) * (called_equity * final_pot - invested)
+
+        passive = "check" if to_call == 0 else "call"
+        aggressive = "bet" if to_call == 0 else "raise"
+        actions = [] if to_call == 0 else [{"action": "fold", "amount": 0.0, "ev": 0.0}]
+        actions.append({"action": passive, "amount": round(call_amount, 2), "ev": round(call_ev, 2)})
+        raises = []
+        for i, size in enumerate(sizes):
+            option = {
+                "action": "all_in" if size >= hero_stack else aggressive,
+                "amount": round(float(size), 2),
+                "ev": round(float(raise_ev[i]), 2),
+                "pot_fraction": round(float((size - to_call) / (pot + to_call)), 2) if pot + to_call else None,
+                "fold_probability": round(float(fold_probability[i]) * 100, 2),
+                "equity_when_called": round(float(called_equity[i]) * 100, 2),
+            }
+            raises.append(option)
+            actions.append({key: option[key] for key in ("action", "amount", "ev")})
+
+        ranked = sorted(actions, key=lambda action: action["ev"], reverse=True)
+        return {
+            "equity": round(hero_equity * 100, 2),
+            "pot_odds": round(call_amount / (pot + call_amount) * 100, 2) if call_amount else 0.0,
+            passive: {"amount": round(call_amount, 2), "ev": round(call_ev, 2)},
+            "raises": raises,
+            "actions": ranked,
+            "best": ranked[0],
+            "model": "distribution" if holdings is not None else "equity",
+        }
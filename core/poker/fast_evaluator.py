@@ -0,0 +1,294 @@
+"""Fast batch hand evaluation - Lookup tables over additive card keys"""
+from typing import List, Tuple, Dict
+from itertools import combinations_with_replacement
+import threading
+import numpy as np
+from core.domain import Card
+
+
+RANKS = '23456789TJQKA'
+SUITS = 'cdhs'
+
+# Category order matches HandEvaluator.HAND_TYPE_BASE
+HAND_CATEGORIES = [
+    'high_card', 'one_pair', 'two_pair', 'three_kind', 'straight',
+    'flush', 'full_house', 'four_kind', 'straight_flush'
+]
+
+# Same wording as HandEvaluator.get_hand_description
+CATEGORY_DESCRIPTIONS = [
+    'High card', 'One pair', 'Two pair', 'Three of a kind', 'Straight',
+    'Flush', 'Full house', 'Four of a kind', 'Straight flush'
+]
+
+CATEGORY_SHIFT = 20
+RANK_MASK_BITS = 0x1FFF
+
+
+def category_shares(counts) -> Dict[str, float]:
+    """Percent per hand category (HAND_CATEGORIES order) for non-zero counts"""
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    if total <= 0:
+        return {}
+    return {name: round(float(counts[i] * 100.0 / total), 2)
+            for i, name in enumerate(HAND_CATEGORIES) if counts[i] > 0}
+
+
+def card_to_index(card: Card) -> int:
+    """Card index in 0..51 (suit * 13 + rank, same layout as the C++ engine)"""
+    return SUITS.index(card.suit) * 13 + RANKS.index(card.rank)
+
+
+def index_to_card(index: int) -> Card:
+    """Inverse of card_to_index"""
+    return Card(RANKS[index % 13], SUITS[index // 13])
+
+
+def cards_to_indices(cards: List[Card]) -> List[int]:
+    """Convert cards to engine indices"""
+    return [card_to_index(card) for card in cards]
+
+
+class FastHandEvaluator:
+    """
+    Vectorized 5-7 card evaluator.
+
+    Every card contributes three additive keys (rank multiset key, suit count
+    key, 52-bit card mask), so partial keys of a board can be combined with
+    hole cards and runouts by plain addition and evaluated in one batch.
+    Scores are comparable integers: category << CATEGORY_SHIFT | kickers.
+    """
+
+    RANK_KEY = np.array([5 ** (i % 13) for i in range(52)], dtype=np.int64)
+    SUIT_KEY = np.array([8 ** (i // 13) for i in range(52)], dtype=np.int64)
+    CARD_BIT = np.array([1 << i for i in range(52)], dtype=np.uint64)
+
+    _tables = None
+    _tables_lock = threading.Lock()
+
+    def __init__(self):
+        with FastHandEvaluator._tables_lock:
+            if FastHandEvaluator._tables is None:
+                FastHandEvaluator._tables = _build_tables()
+        tables = FastHandEvaluator._tables
+        self._rank_keys = tables['rank_keys']
+        self._rank_scores = tables['rank_scores']
+        self._flush_suit = tables['flush_suit']
+        self._flush_scores = tables['flush_scores']
+        self._straight_high = tables['straight_high']
+
+    # ==================== Keys ====================
+
+    def hand_keys(self, indices) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Additive keys (rank, suit, mask) summed over the last axis"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return (self.RANK_KEY[indices].sum(axis=-1),
+                self.SUIT_KEY[indices].sum(axis=-1),
+                self.CARD_BIT[indices].sum(axis=-1, dtype=np.uint64))
+
+    def card_keys(self, indices) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-card keys without summation"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return self.RANK_KEY[indices], self.SUIT_KEY[indices], self.CARD_BIT[indices]
+
+    # ==================== Evaluation ====================
+
+    def evaluate_keys(self, rank_keys, suit_keys, card_masks) -> np.ndarray:
+        """Evaluate hands given their summed keys (arrays broadcast together)"""
+        rank_keys, suit_keys, card_masks = np.broadcast_arrays(
+            np.asarray(rank_keys, dtype=np.int64),
+            np.asarray(suit_keys, dtype=np.int64),
+            np.asarray(card_masks, dtype=np.uint64)
+        )
+        shape = rank_keys.shape
+        rank_keys = rank_keys.ravel()
+
+        positions = np.searchsorted(self._rank_keys, rank_keys)
+        scores = self._rank_scores[np.minimum(positions, len(self._rank_keys) - 1)]
+
+        flush_suits = self._flush_suit[suit_keys.ravel()]
+        has_flush = flush_suits >= 0
+        if has_flush.any():
+            shifts = (flush_suits[has_flush] * 13).astype(np.uint64)
+            masks = (card_masks.ravel()[has_flush] >> shifts) & np.uint64(RANK_MASK_BITS)
+            scores[has_flush] = np.maximum(scores[has_flush],
+                                           self._flush_scores[masks.astype(np.int64)])
+
+        return scores.reshape(shape)
+
+    def evaluate_batch(self, indices) -> np.ndarray:
+        """Evaluate an (..., k) array of card indices, 5 <= k <= 7"""
+        return self.evaluate_keys(*self.hand_keys(indices))
+
+    def evaluate(self, cards: List[Card]) -> int:
+        """Evaluate a single 5-7 card hand"""
+        if not 5 <= len(cards) <= 7:
+            raise ValueError(f"Need 5-7 cards, got {len(cards)}")
+        return int(self.evaluate_batch([cards_to_indices(cards)])[0])
+
+    # ==================== Helpers ====================
+
+    @staticmethod
+    def category(scores) -> np.ndarray:
+        """Hand category index (see HAND_CATEGORIES) for scores"""
+        return np.asarray(scores) >> CATEGORY_SHIFT
+
+    @staticmethod
+    def describe(score: int) -> str:
+        """Textual hand description for a score"""
+        return CATEGORY_DESCRIPTIONS[int(score) >> CATEGORY_SHIFT]
+
+    @staticmethod
+    def rank_masks(card_masks) -> np.ndarray:
+        """13-bit mask of ranks present, folded over all suits"""
+        card_masks = np.asarray(card_masks, dtype=np.uint64)
+        folded = np.zeros(card_masks.shape, dtype=np.uint64)
+        for suit in range(4):
+            folded |= (card_masks >> np.uint64(13 * suit)) & np.uint64(RANK_MASK_BITS)
+        return folded.astype(np.int64)
+
+    def straight_high(self, rank_masks) -> np.ndarray:
+        """Straight high rank index for 13-bit rank masks (0 = no straight)"""
+        return self._straight_high[np.asarray(rank_masks, dtype=np.int64)]
+
+    def flush_suit(self, suit_keys) -> np.ndarray:
+        """Suit with five or more cards for summed suit keys (-1 = none)"""
+        return self._flush_suit[np.asarray(suit_keys, dtype=np.int64)]
+
+    @staticmethod
+    def hole_combos() -> np.ndarray:
+        """All 1326 two-card combos as a (1326, 2) index array"""
+        return FastHandEvaluator.runouts(np.arange(52), 2)
+
+    @staticmethod
+    def runouts(remaining, needed: int) -> np.ndarray:
+        """All sets of `needed` (0-2) cards from remaining as an (R, needed) array, pairs in index order"""
+        remaining = np.asarray(remaining)
+        if needed == 0:
+            return np.zeros((1, 0), dtype=np.int64)
+        if needed == 1:
+            return remaining[:, None]
+        if needed != 2:
+            raise ValueError(f"Exact runouts cover up to 2 cards, got {needed}")
+        first, second = np.triu_indices(len(remaining), 1)
+        return np.stack([remaining[first], remaining[second]], axis=1)
+
+    @staticmethod
+    def remaining_indices(dead: List[int]) -> np.ndarray:
+        """Deck indices not in dead cards"""
+        alive = np.ones(52, dtype=bool)
+        alive[list(dead)] = False
+        return np.nonzero(alive)[0]
+
+
+# ==================== Table generation ====================
+
+def _top_bits(high_bit: np.ndarray, masks: np.ndarray, count: int) -> np.ndarray:
+    """Keep the `count` highest set bits of each mask"""
+    remaining = masks.copy()
+    result = np.zeros_like(masks)
+    for _ in range(count):
+        top = np.where(remaining > 0, 1 << high_bit[remaining], 0)
+        result |= top
+        remaining ^= top
+    return result
+
+
+def _score_rank_counts(counts: np.ndarray, high_bit: np.ndarray,
+                       straight_high: np.ndarray) -> np.ndarray:
+    """Non-flush scores for an (N, 13) array of rank counts"""
+    pow2 = 1 << np.arange(13, dtype=np.int64)
+    present = (counts > 0).astype(np.int64) @ pow2
+    quads = (counts == 4).astype(np.int64) @ pow2
+    trips = (counts == 3).astype(np.int64) @ pow2
+    pairs = (counts == 2).astype(np.int64) @ pow2
+    straights = straight_high[present]
+
+    quad_rank = high_bit[quads]
+    quad_detail = (quad_rank << 4) | high_bit[present & ~np.where(quads > 0, 1 << quad_rank, 0)]
+
+    trips_rank = high_bit[trips]
+    trips_bit = np.where(trips > 0, 1 << trips_rank, 0)
+    full_pair = (trips & ~trips_bit) | pairs
+    is_full_house = (trips > 0) & (full_pair > 0)
+    full_detail = (trips_rank << 4) | high_bit[full_pair]
+    trips_detail = (trips_rank << 13) | _top_bits(high_bit, present & ~trips_bit, 2)
+
+    high_pair = high_bit[pairs]
+    high_pair_bit = np.where(pairs > 0, 1 << high_pair, 0)
+    low_pairs = pairs & ~high_pair_bit
+    low_pair = high_bit[low_pairs]
+    low_pair_bit = np.where(low_pairs > 0, 1 << low_pair, 0)
+    two_pair_detail = ((high_pair << 8) | (low_pair << 4) |
+                       high_bit[present & ~high_pair_bit & ~low_pair_bit])
+    pair_detail = (high_pair << 13) | _top_bits(high_bit, present & ~high_pair_bit, 3)
+    high_detail = _top_bits(high_bit, present, 5)
+
+    categories = np.select(
+        [quads > 0, is_full_house, straights > 0, trips > 0, low_pairs > 0, pairs > 0],
+        [7, 6, 4, 3, 2, 1], default=0
+    )
+    details = np.select(
+        [quads > 0, is_full_house, straights > 0, trips > 0, low_pairs > 0, pairs > 0],
+        [quad_detail, full_detail, straights, trips_detail, two_pair_detail, pair_detail],
+        default=high_detail
+    )
+    return (categories << CATEGORY_SHIFT) | details
+
+
+def _build_tables() -> dict:
+    """Generate evaluator lookup tables (runs once per process)"""
+    masks = np.arange(1 << 13, dtype=np.int64)
+
+    high_bit = np.zeros(1 << 13, dtype=np.int64)
+    popcount = np.zeros(1 << 13, dtype=np.int64)
+    for rank in range(13):
+        high_bit[masks >= (1 << rank)] = rank
+        popcount += (masks >> rank) & 1
+
+    straight_high = np.zeros(1 << 13, dtype=np.int64)
+    wheel = 0x100F  # A-2-3-4-5
+    straight_high[(masks & wheel) == wheel] = 3
+    for high in range(4, 13):
+        window = 0x1F << (high - 4)
+        straight_high[(masks & window) == window] = high
+
+    # Flush / straight flush scores by suited rank mask
+    flush_scores = np.zeros(1 << 13, dtype=np.int64)
+    flush_masks = popcount >= 5
+    straight_flush = flush_masks & (straight_high > 0)
+    plain_flush = flush_masks & (straight_high == 0)
+    flush_scores[straight_flush] = (8 << CATEGORY_SHIFT) | straight_high[straight_flush]
+    flush_scores[plain_flush] = (5 << CATEGORY_SHIFT) | _top_bits(high_bit, masks[plain_flush], 5)
+
+    # Suit with 5+ cards by summed suit key (3 bits per suit)
+    suit_keys = np.arange(8 ** 4, dtype=np.int64)
+    flush_suit = np.full(8 ** 4, -1, dtype=np.int64)
+    for suit in range(4):
+        flush_suit[((suit_keys >> (3 * suit)) & 7) >= 5] = suit
+
+    # Non-flush scores for every rank multiset of 5-7 cards
+    rank_weights = 5 ** np.arange(13, dtype=np.int64)
+    keys, scores = [], []
+    for size in (5, 6, 7):
+        multisets = np.array(list(combinations_with_replacement(range(13), size)), dtype=np.int64)
+        counts = np.zeros((len(multisets), 13), dtype=np.int64)
+        rows = np.arange(len(multisets))
+        for column in range(size):
+            counts[rows, multisets[:, column]] += 1
+        counts = counts[counts.max(axis=1) <= 4]
+        keys.append(counts @ rank_weights)
+        scores.append(_score_rank_counts(counts, high_bit, straight_high))
+
+    keys = np.concatenate(keys)
+    scores = np.concatenate(scores)
+    order = np.argsort(keys)
+
+    return {
+        'rank_keys': keys[order],
+        'rank_scores': scores[order],
+        'flush_suit': flush_suit,
+        'flush_scores': flush_scores,
+        'straight_high': straight_high,
+    }
@@ -24,6 +24,9 @@ class HandEvaluator:
     WHEEL_RANKS = {2, 3, 4, 5, 14}
     
     def __init__(self):
+        # Strength memo shared by the analysis pool threads. It is never evicted
+        # and single dict reads and writes are atomic under the GIL, so it needs
+        # no lock; racing threads at worst store the same strength twice.
         self._cache = {}
     
     def get_best_5_card_hand(self, cards: List[Card]) -> Tuple[List[Card], int]:
@@ -45,7 +48,31 @@ class HandEvaluator:
                 best_hand = combo_list
         
         return best_hand, best_strength
-    
+
+    def extend_best_5_card_hand(self, best_hand: List[Card], best_strength: int,
+                                cards: List[Card], new_cards: List[Card]) -> Tuple[List[Card], int]:
+        """
+        Best 5-card hand after new_cards are added to cards whose best hand is known.
+
+        Only combinations that use a new card can beat the known best hand,
+        so the rest are not evaluated (15 of 21 on the river).
+        """
+        all_cards = cards + new_cards
+        if len(cards) < 5 or len(best_hand) != 5:
+            return self.get_best_5_card_hand(all_cards)
+
+        new = set(new_cards)
+        for combo in combinations(all_cards, 5):
+            if new.isdisjoint(combo):
+                continue
+            combo_list = list(combo)
+            strength = self._evaluate_hand_strength(combo_list)
+            if strength > best_strength:
+                best_strength = strength
+                best_hand = combo_list
+
+        return best_hand, best_strength
+
     def _evaluate_hand_strength(self, cards: List[Card]) -> int:
         """Precise numeric hand strength evaluation"""
         if len(cards) < 2:
@@ -0,0 +1,170 @@
+"""Hand ranges - Standard notation parser and weighted combo sets"""
+from typing import List, Dict, Optional
+from functools import lru_cache
+import numpy as np
+from .fast_evaluator import FastHandEvaluator, RANKS, SUITS
+from .holding_equity import ALL_COMBOS, ALL_COMBO_CLASSES, HAND_CLASS_NAMES, NUM_HAND_CLASSES
+
+NUM_COMBOS = 1326
+
+# Combo masks in ALL_COMBOS order (two bits of the 52-bit card mask)
+COMBO_MASKS = FastHandEvaluator.CARD_BIT[ALL_COMBOS[:, 0]] | FastHandEvaluator.CARD_BIT[ALL_COMBOS[:, 1]]
+
+_COMBO_LOOKUP = {(int(a), int(b)): i for i, (a, b) in enumerate(ALL_COMBOS)}
+_CLASS_LOOKUP = {name: i for i, name in enumerate(HAND_CLASS_NAMES)}
+
+
+class HandRange:
+    """
+    Weighted set of the 1,326 hole-card combos.
+
+    Weights are stored as a float array in ALL_COMBOS order, so card removal
+    is a mask against COMBO_MASKS and equity is a weighted sum over vectors
+    produced by the batch evaluators.
+    """
+
+    def __init__(self, weights: Optional[np.ndarray] = None, text: str = ""):
+        self.weights = np.zeros(NUM_COMBOS) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.text = text
+
+    @classmethod
+    def parse(cls, text: str) -> "HandRange":
+        """Parse notation like "TT+, AKs, A5s-A2s, KQo, AhKh, QJs:0.5" (cached)"""
+        return cls(_parse_weights(text.strip()), text.strip())
+
+    @classmethod
+    def full(cls) -> "HandRange":
+        """Every combo with weight 1 (a random hand)"""
+        return cls(np.ones(NUM_COMBOS), "random")
+
+    # ==================== Queries ====================
+
+    @property
+    def combos(self) -> float:
+        """Weighted number of combos"""
+        return float(self.weights.sum())
+
+    def live_weights(self, dead_cards: List[int]) -> np.ndarray:
+        """Weights with combos blocked by dead card indices removed"""
+        dead_mask = np.uint64(0)
+        for index in dead_cards:
+            dead_mask |= FastHandEvaluator.CARD_BIT[index]
+        return np.where((COMBO_MASKS & dead_mask) == 0, self.weights, 0.0)
+
+    def class_weights(self) -> Dict[str, float]:
+        """Weighted combo count per 169 chart class"""
+        sums = np.bincount(ALL_COMBO_CLASSES, weights=self.weights, minlength=NUM_HAND_CLASSES)
+        return {HAND_CLASS_NAMES[i]: round(float(sums[i]), 3) for i in range(NUM_HAND_CLASSES) if sums[i]}
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.weights))
+
+    def __str__(self) -> str:
+        return self.text or f"{len(self)} combos"
+
+
+# ==================== Parser ====================
+
+@lru_cache(maxsize=256)
+def _cached_weights(text: str) -> np.ndarray:
+    weights = np.zeros(NUM_COMBOS)
+    if text.lower() in ('random', 'any', '100%', '*'):
+        weights[:] = 1.0
+        return weights
+
+    for token in text.replace(';', ',').split(','):
+        token = token.strip()
+        if not token:
+            continue
+        weight = 1.0
+        if ':' in token:
+            token, weight_text = token.split(':', 1)
+            weight = float(weight_text)
+            if not 0.0 <= weight <= 1.0:
+                raise ValueError(f"Range weight must be between 0 and 1: {weight_text}")
+        indices = _token_combos(token.strip())
+        weights[indices] = weight
+    weights.setflags(write=False)
+    return weights
+
+
+def _parse_weights(text: str) -> np.ndarray:
+    return _cached_weights(text).copy()
+
+
+def _token_combos(token: str) -> np.ndarray:
+    """Combo indices for one range token"""
+    if len(token) == 4 and token[1] in SUITS and token[3] in SUITS:
+        return np.array([_specific_combo(token)])
+
+    if '-' in token:
+        start, end = (part.strip() for part in token.split('-', 1))
+        return _class_span(start, end)
+
+    plus = token.endswith('+')
+    name = token[:-1] if plus else token
+    high, low, suffix = _split_class(name)
+
+    if high == low:
+        top = 12 if plus else RANKS.index(high)
+        return _class_combos([r * 2 for r in RANKS[RANKS.index(high):top + 1]], suffix)
+
+    kickers = RANKS[RANKS.index(low):RANKS.index(high)] if plus else low
+    return _class_combos([high + kicker for kicker in kickers], suffix)
+
+
+def _class_span(start: str, end: str) -> np.ndarray:
+    """"A5s-A2s" (same high card, kicker span) or "22-55" (pair span)"""
+    high_a, low_a, suffix_a = _split_class(start)
+    high_b, low_b, suffix_b = _split_class(end)
+    if suffix_a != suffix_b:
+        raise ValueError(f"Mismatched range span: {start}-{end}")
+
+    if high_a == low_a and high_b == low_b:
+        bounds = sorted([RANKS.index(high_a), RANKS.index(high_b)])
+        return _class_combos([r * 2 for r in RANKS[bounds[0]:bounds[1] + 1]], suffix_a)
+
+    if high_a != high_b:
+        raise ValueError(f"Range span must keep the high card: {start}-{end}")
+    bounds = sorted([RANKS.index(low_a), RANKS.index(low_b)])
+    return _class_combos([high_a + kicker for kicker in RANKS[bounds[0]:bounds[1] + 1]], suffix_a)
+
+
+def _split_class(name: str):
+    """"AKs" -> ("A", "K", "s"); ranks are ordered high first"""
+    name = name.strip()
+    if len(name) not in (2, 3) or name[0].upper() not in RANKS or name[1].upper() not in RANKS:
+        raise ValueError(f"Invalid range token: {name}")
+    first, second = name[0].upper(), name[1].upper()
+    suffix = name[2].lower() if len(name) == 3 else ''
+    if suffix not in ('', 's', 'o'):
+        raise ValueError(f"Invalid range token: {name}")
+    if first == second and suffix:
+        raise ValueError(f"Pairs cannot be suited or offsuit: {name}")
+    if RANKS.index(first) < RANKS.index(second):
+        first, second = second, first
+    return first, second, suffix
+
+
+def _class_combos(names: List[str], suffix: str) -> np.ndarray:
+    """Combo indices for chart classes; no suffix means suited and offsuit"""
+    classes = []
+    for name in names:
+        if name[0] == name[1]:
+            classes.append(_CLASS_LOOKUP[name])
+        else:
+            for kind in (suffix,) if suffix else ('s', 'o'):
+                classes.append(_CLASS_LOOKUP[name + kind])
+    return np.nonzero(np.isin(ALL_COMBO_CLASSES, classes))[0]
+
+
+def _specific_combo(token: str) -> int:
+    """Combo index for an exact holding like "AhKh\""""
+    cards = []
+    for rank, suit in (token[0:2], token[2:4]):
+        if rank.upper() not in RANKS or suit not in SUITS:
+            raise ValueError(f"Invalid card in range: {token}")
+        cards.append(SUITS.index(suit) * 13 + RANKS.index(rank.upper()))
+    if cards[0] == cards[1]:
+        raise ValueError(f"Duplicate card in range: {token}")
+    return _COMBO_LOOKUP[tuple(sorted(cards))]
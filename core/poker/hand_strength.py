@@ -0,0 +1,112 @@
+"""Hand strength and potential - Exact HS, PPOT, NPOT and EHS by enumeration"""
+from typing import List, Dict, Optional
+import numpy as np
+from core.domain import Card
+from .fast_evaluator import FastHandEvaluator, cards_to_indices
+
+AHEAD, TIED, BEHIND = 0, 1, 2
+
+
+class HandStrengthCalculator:
+    """
+    Billings-style hand strength against every opponent holding.
+
+    HS is the share of opponent holdings we currently beat (ties count half).
+    PPOT / NPOT are the chances of moving from behind to ahead and from ahead
+    to behind over the next `lookahead` cards, enumerated over every
+    (holding, runout) pair that does not share a card. All values are
+    percentages, like EquityCalculator win rates.
+    """
+
+    def __init__(self, evaluator: Optional[FastHandEvaluator] = None):
+        self.evaluator = evaluator or FastHandEvaluator()
+
+    def calculate(self, hole_cards: List[Card], board_cards: List[Card],
+                  num_opponents: int = 1, lookahead: int = 1) -> Dict[str, any]:
+        """HS, PPOT, NPOT and EHS for hero on a flop, turn or river"""
+        if len(hole_cards) != 2:
+            return {"error": "Need exactly 2 hole cards"}
+        if not 3 <= len(board_cards) <= 5:
+            return {"error": "Hand strength requires 3 to 5 board cards"}
+
+        hole = cards_to_indices(hole_cards)
+        board = cards_to_indices(board_cards)
+        if len(set(hole + board)) != len(hole) + len(board):
+            return {"error": "Duplicate cards detected"}
+
+        lookahead = max(0, min(lookahead, 5 - len(board)))
+        num_opponents = max(1, num_opponents)
+
+        ev = self.evaluator
+        remaining = ev.remaining_indices(hole + board)
+        opponents = ev.runouts(remaining, 2)
+
+        hero_keys = ev.hand_keys(hole + board)
+        board_rank, board_suit, board_mask = ev.hand_keys(board)
+        opp_rank, opp_suit, opp_mask = ev.hand_keys(opponents)
+        opp_rank = opp_rank + board_rank
+        opp_suit = opp_suit + board_suit
+
+        hero_now = ev.evaluate_keys(*hero_keys)
+        status_now = self._status(hero_now, ev.evaluate_keys(opp_rank, opp_suit, opp_mask | board_mask))
+        now_counts = np.bincount(status_now, minlength=3)
+        hand_strength = (now_counts[AHEAD] + now_counts[TIED] / 2.0) / len(opponents)
+
+        ppot = npot = 0.0
+        if lookahead:
+            ppot, npot = self._potential(remaining, lookahead, hero_keys, opp_rank, opp_suit,
+                                         opp_mask | board_mask, status_now)
+
+        # Multiway: must beat every opponent independently
+        hs_n = hand_strength ** num_opponents
+        ehs = hs_n * (1 - npot) + (1 - hs_n) * ppot
+
+        return {
+            "hand_strength": self._pct(hand_strength),
+            "hand_strength_n": self._pct(hs_n),
+            "ppot": self._pct(ppot),
+            "npot": self._pct(npot),
+            "ehs": self._pct(ehs),
+            "ahead": int(now_counts[AHEAD]),
+            "tied": int(now_counts[TIED]),
+            "behind": int(now_counts[BEHIND]),
+            "opponent_holdings": len(opponents),
+            "lookahead": lookahead,
+        }
+
+    def _potential(self, remaining: np.ndarray, lookahead: int, hero_keys, opp_rank, opp_suit,
+                   opp_mask, status_now: np.ndarray):
+        """PPOT and NPOT over all (opponent holding, runout) pairs"""
+        ev = self.evaluator
+        runouts = ev.runouts(remaining, lookahead)
+        run_rank, run_suit, run_mask = ev.hand_keys(runouts)
+        hero_final = ev.evaluate_keys(hero_keys[0] + run_rank, hero_keys[1] + run_suit,
+                                      hero_keys[2] | run_mask)
+        opp_final = ev.evaluate_keys(opp_rank[:, None] + run_rank[None, :],
+                                     opp_suit[:, None] + run_suit[None, :],
+                                     opp_mask[:, None] | run_mask[None, :])
+        # Runouts sharing a card with the opponent holding are impossible
+        valid = (opp_mask[:, None] & run_mask[None, :]) == 0
+
+        status_final = self._status(hero_final[None, :], opp_final)
+        pairs = (status_now[:, None] * 3 + status_final)[valid]
+        transitions = np.bincount(pairs, minlength=9).reshape(3, 3)
+        totals = transitions.sum(axis=1)
+
+        behind_weight = totals[BEHIND] + totals[TIED] / 2.0
+        ahead_weight = totals[AHEAD] + totals[TIED] / 2.0
+        ppot = (transitions[BEHIND, AHEAD] + transitions[BEHIND, TIED] / 2.0 +
+                transitions[TIED, AHEAD] / 2.0) / behind_weight if behind_weight else 0.0
+        npot = (transitions[AHEAD, BEHIND] + transitions[TIED, BEHIND] / 2.0 +
+                transitions[AHEAD, TIED] / 2.0) / ahead_weight if ahead_weight else 0.0
+        return float(ppot), float(npot)
+
+    @staticmethod
+    def _status(hero_scores, opp_scores) -> np.ndarray:
+        """AHEAD / TIED / BEHIND for hero against each opponent score"""
+        return np.where(hero_scores > opp_scores, AHEAD,
+                        np.where(hero_scores == opp_scores, TIED, BEHIND))
+
+    @staticmethod
+    def _pct(value: float) -> float:
+        return round(float(value) * 100.0, 2)
@@ -0,0 +1,193 @@
+"""Independent Chip Model - Tournament prize equity from chip stacks"""
+from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+import numpy as np
+
+
+class ICMCalculator:
+    """
+    Malmuth-Harville prize equity.
+
+    Each place goes to a remaining player with probability proportional to
+    the player's stack. Exact equity walks the subsets of players who took the top
+    places one size layer at a time; the per-layer index tables depend only
+    on (players, paid places) and are memoized, and many stack vectors are
+    evaluated in one batch (bubble factors need 2 per opponent). A 9-handed
+    final table takes ~0.2 ms. When the number of subsets would exceed
+    EXACT_SUBSET_LIMIT, finishing orders are sampled instead.
+    """
+
+    EXACT_SUBSET_LIMIT = 250_000
+
+    def __init__(self, samples: int = 20000, seed: Optional[int] = None):
+        self.samples = samples
+        self.seed = seed
+
+    # ==================== Equity ====================
+
+    def equity(self, stacks, payouts) -> np.ndarray:
+        """Prize equity per player (payout units); stacks may be (players,) or (batch, players)"""
+        stacks = np.asarray(stacks, dtype=np.float64)
+        payouts = np.asarray(payouts, dtype=np.float64)[:stacks.shape[-1]]
+        probabilities = self.finish_probabilities(stacks, len(payouts))
+        return probabilities @ payouts
+
+    def finish_probabilities(self, stacks, places: int) -> np.ndarray:
+        """Probability of each player finishing in each of the top `places` places"""
+        stacks = np.asarray(stacks, dtype=np.float64)
+        batch = stacks.reshape(-1, stacks.shape[-1])
+        players = batch.shape[1]
+        places = min(places, players)
+
+        if self.is_exact(players, places):
+            probabilities = _exact_probabilities(batch, places)
+        else:
+            probabilities = _sampled_probabilities(batch, places, self.samples, self.seed)
+
+        # Busted players take the places the live players cannot fill, shared evenly
+        busted = batch <= 0
+        missing = np.clip(1.0 - probabilities.sum(axis=1), 0.0, 1.0)
+        share = np.where(busted, 1.0 / np.maximum(busted.sum(axis=1, keepdims=True), 1), 0.0)
+        probabilities += share[:, :, None] * missing[:, None, :]
+        return probabilities.reshape(stacks.shape + (places,))
+
+    def is_exact(self, players: int, places: int) -> bool:
+        """Whether exact enumeration stays within EXACT_SUBSET_LIMIT subsets"""
+        return sum(comb(players, size) for size in range(places + 1)) <= self.EXACT_SUBSET_LIMIT
+
+    # ==================== Decisions ====================
+
+    def bubble_factors(self, stacks, payouts, hero: int = 0) -> np.ndarray:
+        """
+        Hero's bubble factor against each opponent (NaN for hero).
+
+        Ratio of prize equity lost when losing an all-in for the effective
+        stack to equity gained when winning it; 1.0 means chip EV.
+        """
+        stacks = np.asarray(stacks, dtype=np.float64)
+        scenarios = self._all_in_scenarios(stacks, hero)
+        equities = self.equity(np.vstack([stacks[None, :], scenarios]), payouts)[:, hero]
+        base, outcomes = equities[0], equities[1:].reshape(-1, 2)
+        gain = outcomes[:, 0] - base
+        loss = base - outcomes[:, 1]
+        factors = np.where(gain > 0, loss / np.where(gain > 0, gain, 1.0), np.nan)
+        factors[hero] = np.nan
+        return factors
+
+    @staticmethod
+    def _all_in_scenarios(stacks: np.ndarray, hero: int) -> np.ndarray:
+        """Stacks after hero wins / loses an all-in against each player (2 rows per player)"""
+        players = len(stacks)
+        effective = np.minimum(stacks[hero], stacks)
+        rows = np.repeat(stacks[None, :], 2 * players, axis=0)
+        index = np.arange(players)
+        rows[2 * index, hero] += effective
+        rows[2 * index, index] -= effective
+        rows[2 * index + 1, hero] -= effective
+        rows[2 * index + 1, index] += effective
+        return rows
+
+    def calculate(self, stacks: List[float], payouts: List[float], hero: int = 0) -> Dict[str, any]:
+        """Prize equity of every player and hero's all-in risk premium against each opponent"""
+        if len(stacks) < 2:
+            return {"error": "Need at least 2 players"}
+        if any(stack < 0 for stack in stacks) or sum(stacks) <= 0:
+            return {"error": "Stacks must be non-negative with chips in play"}
+        if not payouts or any(payout < 0 for payout in payouts):
+            return {"error": "Payouts must be non-negative"}
+        if not 0 <= hero < len(stacks):
+            return {"error": "Hero index out of range"}
+
+        stacks = np.asarray(stacks, dtype=np.float64)
+        paid = np.asarray(payouts, dtype=np.float64)[:len(stacks)]
+        equity = self.equity(stacks, paid)
+        factors = self.bubble_factors(stacks, paid, hero)
+        required = factors / (1.0 + factors) * 100.0
+
+        return {
+            "equity": [round(float(value), 4) for value in equity],
+            "equity_share": [round(float(value / paid.sum()) * 100, 2) for value in equity],
+            "chip_share": [round(float(value / stacks.sum()) * 100, 2) for value in stacks],
+            "hero_equity": round(float(equity[hero]), 4),
+            "bubble_factors": [None if np.isnan(value) else round(float(value), 3) for value in factors],
+            "required_equity": [None if np.isnan(value) else round(float(value), 2) for value in required],
+            "method": "exact" if self.is_exact(len(stacks), len(paid)) else "monte_carlo",
+        }
+
+
+# ==================== Exact recursion ====================
+
+@lru_cache(maxsize=64)
+def _layer_tables(players: int, places: int) -> Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], ...]:
+    """
+    Index tables for every subset size 1..places.
+
+    For the subsets of one size: their members, for each (subset, member)
+    pair the index of the subset without that member in the previous layer,
+    the previous layer's (players, subsets) membership matrix, and a one-hot
+    matrix that sums (subset, member) terms per player.
+    """
+    layers = []
+    previous = {0: 0}
+    previous_membership = np.zeros((players, 1))
+    for size in range(1, places + 1):
+        subsets = list(combinations(range(players), size))
+        masks = [sum(1 << player for player in subset) for subset in subsets]
+        membership = np.zeros((players, len(subsets)))
+        for column, subset in enumerate(subsets):
+            membership[list(subset), column] = 1.0
+        members = np.array(subsets, dtype=np.int64)
+        parents = np.array([[previous[mask ^ (1 << player)] for player in subset]
+                            for subset, mask in zip(subsets, masks)], dtype=np.int64)
+        layers.append((members, parents, previous_membership, _one_hot(members, players)))
+        previous = {mask: column for column, mask in enumerate(masks)}
+        previous_membership = membership
+    return tuple(layers)
+
+
+def _exact_probabilities(stacks: np.ndarray, places: int) -> np.ndarray:
+    """(batch, players, places) finishing probabilities by subset recursion"""
+    batch, players = stacks.shape
+    weights = np.maximum(stacks, 0.0)
+    total = weights.sum(axis=1, keepdims=True)
+    result = np.zeros((batch, players, places))
+
+    taken = np.ones((batch, 1))
+    for place, (members, parents, parent_membership, one_hot) in enumerate(_layer_tables(players, places)):
+        remaining = total - weights @ parent_membership
+        share = np.divide(taken, remaining, out=np.zeros_like(taken), where=remaining > 0)
+        # Probability that the subset took the top places with `member` taking the last one
+        terms = share[:, parents] * weights[:, members]
+        taken = terms.sum(axis=2)
+        result[:, :, place] = terms.reshape(batch, -1) @ one_hot
+    return result
+
+
+def _one_hot(members: np.ndarray, players: int) -> np.ndarray:
+    rows = np.zeros((members.size, players))
+    rows[np.arange(members.size), members.ravel()] = 1.0
+    return rows
+
+
+# ==================== Monte Carlo ====================
+
+def _sampled_probabilities(stacks: np.ndarray, places: int, samples: int,
+                           seed: Optional[int]) -> np.ndarray:
+    """
+    Finishing probabilities from sampled orders.
+
+    Sorting Exp(1) / stack keys draws a Malmuth-Harville finishing order
+    directly (the smallest key takes first place).
+    """
+    rng = np.random.RandomState(seed)
+    batch, players = stacks.shape
+    result = np.zeros((batch, players, places))
+    for row, weights in enumerate(stacks):
+        alive = np.nonzero(weights > 0)[0]
+        keys = rng.exponential(size=(samples, len(alive))) / weights[alive]
+        order = np.argsort(keys, axis=1)[:, :places]
+        for place in range(order.shape[1]):
+            result[row, alive, place] = np.bincount(order[:, place], minlength=len(alive)) / samples
+    return result
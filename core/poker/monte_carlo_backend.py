@@ -2,6 +2,7 @@
 from typing import List, Dict
 import logging
 from core.poker import MonteCarloBackend
+from core.poker.fast_evaluator import HAND_CATEGORIES
 from core.domain import Card
 from monte_carlo_engine_v3 import MonteCarloEngineDaemon
 
@@ -19,7 +20,37 @@ class CppMonteCarloBackend(MonteCarloBackend):
             logger.error(f"Failed to initialize C++ backend: {e}")
             raise
     
+    @property
+    def honours_iterations(self) -> bool:
+        """False while the engine runs in legacy mode"""
+        return self.engine.honours_iterations
+    
     def calculate_equity(self, hole_cards: List[Card], board_cards: List[Card],
                         num_opponents: int, iterations: int) -> Dict[str, float]:
         """Calculate equity using C++ engine"""
-        return self.engine.calculate_equity(hole_cards, board_cards, num_opponents, iterations)
+        result = self.engine.calculate_equity(hole_cards, board_cards, num_opponents, iterations)
+        for key in ('hero_categories', 'opponent_categories'):
+            if isinstance(result.get(key), list):
+                result[key] = self._category_dict(result[key])
+        return result
+    
+    def calculate_hands_equity(self, known_hands: List[List[Card]], board_cards: List[Card],
+                               num_unknown: int, iterations: int) -> Dict[str, any]:
+        """Per-hand equity of several known hands in one C++ simulation"""
+        result = self.engine.calculate_hands_equity(known_hands, board_cards, num_unknown, iterations)
+        for hand in result.get('hands', []):
+            if isinstance(hand.get('categories'), list):
+                hand['categories'] = self._category_dict(hand['categories'])
+        if isinstance(result.get('opponent_categories'), list):
+            result['opponent_categories'] = self._category_dict(result['opponent_categories'])
+        return result
+    
+    @staticmethod
+    def _category_dict(percentages: List[float]) -> Dict[str, float]:
+        """Engine category array (HIGH CARD .. ROYAL FLUSH) to HAND_CATEGORIES names"""
+        values = list(percentages[:len(HAND_CATEGORIES)])
+        values += [0.0] * (len(HAND_CATEGORIES) - len(values))
+        if len(percentages) > len(HAND_CATEGORIES):
+            # Royal flush is reported separately by the engine
+            values[-1] += sum(percentages[len(HAND_CATEGORIES):])
+        return {name: round(float(value), 2) for name, value in zip(HAND_CATEGORIES, values) if value > 0}
@@ -0,0 +1,179 @@
+"""Preflop equity matrix - Heads-up all-in equity between every pair of hand classes"""
+from typing import Dict, Union
+from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import time
+import numpy as np
+from .fast_evaluator import FastHandEvaluator
+from .holding_equity import ALL_COMBOS, ALL_COMBO_CLASSES, HAND_CLASS_NAMES, NUM_HAND_CLASSES
+from .hand_range import HandRange, COMBO_MASKS
+from .range_equity import RangeSpec
+
+logger = logging.getLogger(__name__)
+
+MATRIX_PATH = Path(__file__).parent / "data" / "preflop_equity.npy"
+
+CLASS_INDEX = {name: i for i, name in enumerate(HAND_CLASS_NAMES)}
+
+HandClass = Union[str, int]
+
+
+class PreflopEquityMatrix:
+    """
+    169 x 169 heads-up all-in equity (0..1, ties count half) of row class vs column class.
+
+    The shipped file is a plain float32 .npy, memory-mapped on load, so
+    a lookup is one array index. Class-level averages are combo weighted:
+    pair_counts holds the number of card-disjoint combo pairs for every
+    (class, class), which is the weight to use when averaging over ranges.
+    """
+
+    def __init__(self, equity: np.ndarray):
+        self.equity = equity
+        self.pair_counts = class_pair_counts()
+
+    @classmethod
+    def load(cls, path: Path = MATRIX_PATH, mmap: bool = True) -> "PreflopEquityMatrix":
+        """Load the matrix written by generate_preflop_matrix"""
+        return cls(np.load(path, mmap_mode='r' if mmap else None))
+
+    def save(self, path: Path = MATRIX_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, np.asarray(self.equity, dtype=np.float32))
+
+    # ==================== Lookup ====================
+
+    def lookup(self, hand_a: HandClass, hand_b: HandClass) -> float:
+        """Equity of hand class a against hand class b ("AKs", "QQ" or chart indices)"""
+        return float(self.equity[class_index(hand_a), class_index(hand_b)])
+
+    def versus_random(self, hand: HandClass) -> float:
+        """Equity of a hand class against a random hand"""
+        row = class_index(hand)
+        return float(self.pair_counts[row] @ self.equity[row] / self.pair_counts[row].sum())
+
+    def range_equity(self, range_a: RangeSpec, range_b: RangeSpec) -> Dict[str, any]:
+        """
+        Preflop equity of one range against another from class-level lookups.
+
+        Combo weights are summed per class; card removal between the two
+        ranges is approximated at class level by pair_counts.
+        """
+        try:
+            ranges = [spec if isinstance(spec, HandRange) else HandRange.parse(spec)
+                      for spec in (range_a, range_b)]
+        except ValueError as e:
+            return {"error": str(e)}
+
+        class_combos = np.bincount(ALL_COMBO_CLASSES, minlength=NUM_HAND_CLASSES)
+        weights = [np.bincount(ALL_COMBO_CLASSES, weights=hand_range.weights, minlength=NUM_HAND_CLASSES)
+                   / class_combos for hand_range in ranges]
+        if any(w.sum() <= 0 for w in weights):
+            return {"error": "Range is empty"}
+
+        matchups = weights[0][:, None] * weights[1][None, :] * self.pair_counts
+        equity_a = float((matchups * self.equity).sum() / matchups.sum())
+        return {
+            "equity": [round(equity_a * 100, 2), round((1 - equity_a) * 100, 2)],
+            "matchups": round(float(matchups.sum()), 2),
+        }
+
+
+def class_index(hand: HandClass) -> int:
+    """Chart index of a hand class name ("AKs") or pass-through index"""
+    if isinstance(hand, str):
+        if hand not in CLASS_INDEX:
+            raise ValueError(f"Unknown hand class: {hand}")
+        return CLASS_INDEX[hand]
+    return int(hand)
+
+
+@lru_cache(maxsize=1)
+def class_pair_counts() -> np.ndarray:
+    """Number of card-disjoint combo pairs for every (hand class, hand class)"""
+    disjoint = (COMBO_MASKS[:, None] & COMBO_MASKS[None, :]) == 0
+    classes = np.eye(NUM_HAND_CLASSES)[ALL_COMBO_CLASSES]
+    return classes.T @ disjoint @ classes
+
+
+# ==================== Generation ====================
+
+def generate_preflop_matrix(samples: int = 20000, workers: int = 1, seed: int = 0) -> PreflopEquityMatrix:
+    """
+    Sample every class pair above the diagonal, split across worker processes.
+
+    Each sample draws a card-disjoint combo pair of the two classes
+    uniformly, which weights suit configurations by their combo counts,
+    and a random five-card board; 20,000 samples give ~0.35% standard
+    error per pair. The lower triangle is the complement, the diagonal 0.5.
+    """
+    rows, cols = np.triu_indices(NUM_HAND_CLASSES, 1)
+    pairs = rows * NUM_HAND_CLASSES + cols
+    chunks = np.array_split(pairs, max(1, workers))
+    seeds = [seed + i for i in range(len(chunks))]
+    start = time.time()
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            parts = list(pool.map(_sample_pairs, chunks, [samples] * len(chunks), seeds))
+    else:
+        parts = [_sample_pairs(chunk, samples, chunk_seed) for chunk, chunk_seed in zip(chunks, seeds)]
+    logger.info(f"Preflop equity: {len(pairs)} class pairs x {samples} samples ({time.time() - start:.0f}s)")
+
+    equity = np.full((NUM_HAND_CLASSES, NUM_HAND_CLASSES), 0.5)
+    equity[rows, cols] = np.concatenate(parts)
+    equity[cols, rows] = 1.0 - equity[rows, cols]
+    return PreflopEquityMatrix(equity)
+
+
+def _sample_pairs(pairs: np.ndarray, samples: int, seed: int, batch_size: int = 200000) -> np.ndarray:
+    """
+    Sampled equity for flat (row * 169 + col) class pairs.
+
+    Module-level so it can run in a worker process.
+    """
+    ev = FastHandEvaluator()
+    rng = np.random.RandomState(seed)
+    disjoint = (COMBO_MASKS[:, None] & COMBO_MASKS[None, :]) == 0
+    hero, villain = np.nonzero(disjoint)
+    keys = ALL_COMBO_CLASSES[hero] * NUM_HAND_CLASSES + ALL_COMBO_CLASSES[villain]
+    order = np.argsort(keys, kind='stable')
+    hero, villain = hero[order], villain[order]
+    counts = np.bincount(keys, minlength=NUM_HAND_CLASSES ** 2)
+    starts = np.cumsum(counts) - counts
+
+    result = np.zeros(len(pairs))
+    batch_pairs = max(1, batch_size // samples)
+    start = time.time()
+    for offset in range(0, len(pairs), batch_pairs):
+        batch = np.repeat(pairs[offset:offset + batch_pairs], samples)
+        pick = starts[batch] + (rng.random_sample(len(batch)) * counts[batch]).astype(np.int64)
+        hero_cards, villain_cards = ALL_COMBOS[hero[pick]], ALL_COMBOS[villain[pick]]
+
+        deck = rng.random_sample((len(batch), 52))
+        index = np.arange(len(batch))[:, None]
+        deck[index, hero_cards] = 2.0
+        deck[index, villain_cards] = 2.0
+        board = np.argpartition(deck, 4, axis=1)[:, :5]
+
+        board_rank, board_suit, board_mask = ev.hand_keys(board)
+        hero_rank, hero_suit, hero_mask = ev.hand_keys(hero_cards)
+        villain_rank, villain_suit, villain_mask = ev.hand_keys(villain_cards)
+        hero_score = ev.evaluate_keys(board_rank + hero_rank, board_suit + hero_suit, board_mask | hero_mask)
+        villain_score = ev.evaluate_keys(board_rank + villain_rank, board_suit + villain_suit,
+                                         board_mask | villain_mask)
+        points = (hero_score > villain_score) + (hero_score == villain_score) / 2.0
+        result[offset:offset + batch_pairs] = points.reshape(-1, samples).mean(axis=1)
+        if offset // batch_pairs % 200 == 0:
+            logger.info(f"Preflop equity: {offset + batch_pairs}/{len(pairs)} pairs ({time.time() - start:.0f}s)")
+    return result
+
+
+if __name__ == "__main__":
+    import os
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    matrix = generate_preflop_matrix(workers=os.cpu_count() or 1)
+    matrix.save()
+    logger.info(f"Saved preflop equity matrix to {MATRIX_PATH}")
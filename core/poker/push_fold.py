@@ -0,0 +1,216 @@
+"""Push/fold charts - Nash short-stack shoving and calling ranges for tournaments"""
+from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+import logging
+import time
+import numpy as np
+from core.domain import Position
+from .holding_equity import ALL_COMBO_CLASSES, HAND_CLASS_NAMES, NUM_HAND_CLASSES
+from .preflop_matrix import PreflopEquityMatrix
+
+logger = logging.getLogger(__name__)
+
+CHART_PATH = Path(__file__).parent / "data" / "push_fold.npz"
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 9
+STACK_DEPTHS = np.arange(1, 21)  # effective stack, big blinds
+ANTE = 0.125  # per player, big blinds
+SMALL_BLIND = 0.5
+SOLVER_ITERATIONS = 400
+CLASS_COMBOS = np.bincount(ALL_COMBO_CLASSES, minlength=NUM_HAND_CLASSES)
+
+# Players left to act behind each position (UTG is first to act at any table size)
+POSITION_BEHIND = {Position.BB: 0, Position.SB: 1, Position.BTN: 2, Position.CO: 3, Position.MP: 4}
+
+
+class PushFoldChart:
+    """
+    Nash push/fold ranges by table size, stack depth and seat.
+
+    A seat is identified by the number of players left to act behind it
+    (0 = big blind), which is what the all-in decision depends on. Ranges
+    are bit tables over the 169 hand classes, so every lookup is a single
+    array index:
+
+        push[players - 2, depth, behind - 1, hand]
+        call[players - 2, depth, pusher behind - 1, caller behind, hand]
+
+    Generated by generate_push_fold_charts for STACK_DEPTHS with ANTE per
+    player; stacks deeper than the last depth are not push/fold spots.
+    """
+
+    def __init__(self, push: np.ndarray, call: np.ndarray, depths: np.ndarray, ante: float):
+        self.push = push.astype(bool)
+        self.call = call.astype(bool)
+        self.depths = np.asarray(depths)
+        self.ante = float(ante)
+        # Share of all 1,326 combos in each push range (percent)
+        self.push_share = self.push @ CLASS_COMBOS / CLASS_COMBOS.sum() * 100.0
+
+    @classmethod
+    def load(cls, path: Path = CHART_PATH) -> "PushFoldChart":
+        """Load charts saved by save() (bit-packed over hand classes)"""
+        with np.load(path) as data:
+            push = np.unpackbits(data["push"], axis=-1, count=NUM_HAND_CLASSES)
+            call = np.unpackbits(data["call"], axis=-1, count=NUM_HAND_CLASSES)
+            return cls(push, call, data["depths"], float(data["ante"]))
+
+    def save(self, path: Path = CHART_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, push=np.packbits(self.push, axis=-1), call=np.packbits(self.call, axis=-1),
+                            depths=self.depths, ante=self.ante)
+
+    # ==================== Lookup ====================
+
+    def depth_index(self, stack_bb: float) -> Optional[int]:
+        """Nearest charted depth, None when the stack is too deep for push/fold"""
+        if stack_bb <= 0 or stack_bb > self.depths[-1] + 0.5:
+            return None
+        return int(np.abs(self.depths - stack_bb).argmin())
+
+    def should_push(self, players: int, behind: int, stack_bb: float, hand_class: int) -> Optional[bool]:
+        """First-in shove decision, None outside the charts"""
+        depth = self.depth_index(stack_bb)
+        if depth is None or not MIN_PLAYERS <= players <= MAX_PLAYERS or not 1 <= behind < players:
+            return None
+        return bool(self.push[players - 2, depth, behind - 1, hand_class])
+
+    def should_call(self, players: int, pusher_behind: int, caller_behind: int, stack_bb: float,
+                    hand_class: int) -> Optional[bool]:
+        """Call decision against a shove with everyone in between folded, None outside the charts"""
+        depth = self.depth_index(stack_bb)
+        if depth is None or not MIN_PLAYERS <= players <= MAX_PLAYERS:
+            return None
+        if not 0 <= caller_behind < pusher_behind < players:
+            return None
+        return bool(self.call[players - 2, depth, pusher_behind - 1, caller_behind, hand_class])
+
+    def push_range(self, players: int, behind: int, stack_bb: float) -> List[str]:
+        """Hand classes in the shoving range"""
+        depth = self.depth_index(stack_bb)
+        if depth is None:
+            return []
+        row = self.push[players - 2, depth, behind - 1]
+        return [HAND_CLASS_NAMES[i] for i in np.nonzero(row)[0]]
+
+    def advice(self, hand_class: int, players: int, behind: int, stack_bb: float) -> Dict[str, any]:
+        """Shove decision for the seat and call decisions against every earlier shover"""
+        depth = self.depth_index(stack_bb)
+        if depth is None or not MIN_PLAYERS <= players <= MAX_PLAYERS or not 0 <= behind < players:
+            return {}
+        table = players - 2
+        advice = {
+            "hand": HAND_CLASS_NAMES[hand_class],
+            "stack_bb": int(self.depths[depth]),
+            "players": players,
+            "seat": seat_name(players, behind),
+            "call_vs": [
+                {"pusher": seat_name(players, pusher), "call": bool(self.call[table, depth, pusher - 1, behind, hand_class])}
+                for pusher in range(players - 1, behind, -1)
+            ],
+        }
+        if behind > 0:
+            advice["push"] = bool(self.push[table, depth, behind - 1, hand_class])
+            advice["push_range_pct"] = round(float(self.push_share[table, depth, behind - 1]), 1)
+        return advice
+
+
+def seats_behind(position: Position, players: int) -> int:
+    """Players left to act behind a position at the given table size"""
+    if position == Position.UTG:
+        return players - 1
+    return min(POSITION_BEHIND[position], players - 1)
+
+
+def seat_name(players: int, behind: int) -> str:
+    """Position label for a seat given the players left to act behind it"""
+    names = {0: "BB", 1: "SB", 2: "BTN", 3: "CO"}
+    if behind == players - 1 and behind >= 3:
+        return "UTG"
+    return names.get(behind, "MP")
+
+
+# ==================== Solver ====================
+
+def solve_push_fold(equity: np.ndarray, pair_counts: np.ndarray, players: int, stack_bb: float,
+                    ante: float = ANTE, iterations: int = SOLVER_ITERATIONS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Push and call frequencies for one table size and effective stack.
+
+    Seats are numbered in order of action (players - 1 is the big blind).
+    Everyone starts with stack_bb and posts ante; all-ins are heads-up
+    (a caller assumes the players behind fold). Fictitious play: each
+    iteration every seat best-responds to the current averaged strategies
+    of the others and the averages move towards the responses.
+
+    Returns push (players - 1, 169) and call (players - 1, players, 169)
+    frequencies indexed by pusher seat and caller seat.
+    """
+    all_in = stack_bb - ante
+    posted = np.zeros(players)
+    posted[players - 2] = min(SMALL_BLIND, all_in)
+    posted[players - 1] = min(1.0, all_in)
+    dead = players * ante + posted.sum()
+    fold_value = all_in - posted
+    pot = 2 * all_in + dead - posted[:, None] - posted[None, :]
+
+    weighted_equity = pair_counts * equity
+    combos = pair_counts.sum(axis=1)
+    push = np.full((players - 1, NUM_HAND_CLASSES), 0.5)
+    call = np.full((players - 1, players, NUM_HAND_CLASSES), 0.5)
+
+    for iteration in range(iterations):
+        push_response = np.zeros_like(push)
+        call_response = np.zeros_like(call)
+        for pusher in range(players - 1):
+            callers = call[pusher, pusher + 1:]
+            called = pair_counts @ callers.T
+            call_chance = called / combos[:, None]
+            called_equity = (weighted_equity @ callers.T) / np.maximum(called, 1e-12)
+            # Chance that every earlier caller folded
+            reach = np.cumprod(np.hstack([np.ones((NUM_HAND_CLASSES, 1)), 1 - call_chance]), axis=1)
+            gain = called_equity * pot[pusher, pusher + 1:] - fold_value[pusher]
+            ev = (reach[:, :-1] * call_chance * gain).sum(axis=1) + reach[:, -1] * dead
+            push_response[pusher] = ev > 0
+
+            shoved = pair_counts @ push[pusher]
+            equity_vs_push = (weighted_equity @ push[pusher]) / np.maximum(shoved, 1e-12)
+            caller_ev = equity_vs_push[None, :] * pot[pusher, pusher + 1:, None] - fold_value[pusher + 1:, None]
+            call_response[pusher, pusher + 1:] = caller_ev > 0
+
+        step = 1.0 / (iteration + 2)
+        push += (push_response - push) * step
+        call += (call_response - call) * step
+
+    return push, call
+
+
+def generate_push_fold_charts(equity: np.ndarray, pair_counts: np.ndarray, depths: np.ndarray = STACK_DEPTHS,
+                              ante: float = ANTE, iterations: int = SOLVER_ITERATIONS) -> PushFoldChart:
+    """Solve every table size and depth and store the ranges by seats behind"""
+    tables = MAX_PLAYERS - MIN_PLAYERS + 1
+    seats = MAX_PLAYERS - 1
+    push = np.zeros((tables, len(depths), seats, NUM_HAND_CLASSES), dtype=bool)
+    call = np.zeros((tables, len(depths), seats, MAX_PLAYERS - 1, NUM_HAND_CLASSES), dtype=bool)
+    start = time.time()
+
+    for players in range(MIN_PLAYERS, MAX_PLAYERS + 1):
+        for depth, stack_bb in enumerate(depths):
+            push_freq, call_freq = solve_push_fold(equity, pair_counts, players, float(stack_bb), ante, iterations)
+            for pusher in range(players - 1):
+                behind = players - 1 - pusher
+                push[players - 2, depth, behind - 1] = push_freq[pusher] >= 0.5
+                for caller in range(pusher + 1, players):
+                    call[players - 2, depth, behind - 1, players - 1 - caller] = call_freq[pusher, caller] >= 0.5
+        logger.info(f"Push/fold: {players} players solved ({time.time() - start:.0f}s)")
+
+    return PushFoldChart(push, call, depths, ante)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    matrix = PreflopEquityMatrix.load()
+    charts = generate_push_fold_charts(matrix.equity, matrix.pair_counts)
+    charts.save()
+    logger.info(f"Saved push/fold charts to {CHART_PATH}")
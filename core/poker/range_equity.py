@@ -0,0 +1,235 @@
+"""Range-aware equity - Hero against weighted opponent ranges"""
+from typing import List, Dict, Optional, Union
+import numpy as np
+from core.domain import Card
+from .fast_evaluator import FastHandEvaluator, HAND_CATEGORIES, cards_to_indices, category_shares
+from .holding_equity import HoldingEquityCalculator, ALL_COMBOS
+from .hand_range import HandRange
+
+RangeSpec = Union[str, HandRange]
+
+
+class RangeEquityCalculator:
+    """
+    Hero equity against one or more opponent ranges.
+
+    Heads-up, the exact per-holding outcome vector is weighted by the range
+    (card removal falls out of the live mask). Multiway, opponent holdings
+    are drawn from their ranges in one vectorized batch; draws where two
+    opponents share a card are rejected, which samples the joint
+    distribution exactly. Results use the same keys as the Monte Carlo
+    backends (percentages).
+    """
+
+    def __init__(self, evaluator: Optional[FastHandEvaluator] = None):
+        self.evaluator = evaluator or FastHandEvaluator()
+        self.holding_equity = HoldingEquityCalculator(self.evaluator)
+
+    def calculate(self, hole_cards: List[Card], board_cards: List[Card],
+                  opponent_ranges: List[RangeSpec], iterations: int = 10000,
+                  seed: Optional[int] = None) -> Dict[str, any]:
+        """Win/tie/lose rates against the given ranges"""
+        if len(hole_cards) != 2:
+            return {"error": "Need exactly 2 hole cards"}
+        if len(board_cards) > 5:
+            return {"error": "Board cannot have more than 5 cards"}
+        if not 1 <= len(opponent_ranges) <= 8:
+            return {"error": "Opponents must be between 1-8"}
+
+        dead = cards_to_indices(hole_cards + board_cards)
+        if len(set(dead)) != len(dead):
+            return {"error": "Duplicate cards detected"}
+
+        try:
+            ranges = [spec if isinstance(spec, HandRange) else HandRange.parse(spec)
+                      for spec in opponent_ranges]
+        except ValueError as e:
+            return {"error": str(e)}
+
+        live_weights = [hand_range.live_weights(dead) for hand_range in ranges]
+        if any(weights.sum() <= 0 for weights in live_weights):
+            return {"error": "Opponent range is empty after card removal"}
+
+        if len(ranges) == 1 and len(board_cards) >= 3:
+            result = self._heads_up_exact(hole_cards, board_cards, live_weights[0])
+        else:
+            result = self._sampled(dead, len(board_cards), live_weights, iterations, seed)
+
+        result["opponent_combos"] = [round(float(weights.sum()), 2) for weights in live_weights]
+        return result
+
+    def calculate_hands(self, known_hands: List[List[Card]], board_cards: List[Card],
+                        opponent_ranges: List[RangeSpec] = (), iterations: int = 10000,
+                        seed: Optional[int] = None) -> Dict[str, any]:
+        """
+        Per-hand win/tie/lose rates for several known hands in one pass.
+
+        Unknown players hold `opponent_ranges` ("random" for any two cards).
+        Known hands only, from the flop on, every runout is enumerated;
+        otherwise runouts (and unknown holdings) are sampled.
+        """
+        if not known_hands or any(len(hand) != 2 for hand in known_hands):
+            return {"error": "Each known hand needs exactly 2 cards"}
+        if len(board_cards) > 5:
+            return {"error": "Board cannot have more than 5 cards"}
+        if not 2 <= len(known_hands) + len(opponent_ranges) <= 10:
+            return {"error": "Players must be between 2-10"}
+
+        hands = [cards_to_indices(hand) for hand in known_hands]
+        board = cards_to_indices(board_cards)
+        dead = [index for hand in hands for index in hand] + board
+        if len(set(dead)) != len(dead):
+            return {"error": "Duplicate cards detected"}
+
+        try:
+            ranges = [spec if isinstance(spec, HandRange) else HandRange.parse(spec)
+                      for spec in opponent_ranges]
+        except ValueError as e:
+            return {"error": str(e)}
+        live_weights = [hand_range.live_weights(dead) for hand_range in ranges]
+        if any(weights.sum() <= 0 for weights in live_weights):
+            return {"error": "Opponent range is empty after card removal"}
+
+        ev = self.evaluator
+        rng = np.random.RandomState(seed)
+        needed = 5 - len(board)
+        exact = not ranges and needed <= 2
+        if exact:
+            runout = self.holding_equity._runouts(ev.remaining_indices(dead), needed, 0)
+            cards = np.zeros((len(runout), 0), dtype=np.int64)
+        else:
+            cards = (self._draw_holdings(rng, live_weights, iterations) if ranges
+                     else np.zeros((iterations, 0), dtype=np.int64))
+            if len(cards) == 0:
+                return {"error": "Opponent ranges conflict on every sample"}
+            runout = self._sample_runouts(rng, dead, cards, needed)
+        samples = len(runout)
+
+        board_rank, board_suit, board_mask = ev.hand_keys(board)
+        run_rank, run_suit, run_mask = ev.hand_keys(runout)
+        common = (board_rank + run_rank, board_suit + run_suit, board_mask | run_mask)
+        players = np.concatenate([np.array(hands, dtype=np.int64)[None, :, :].repeat(samples, axis=0),
+                                  cards.reshape(samples, -1, 2)], axis=1)
+        rank, suit, mask = ev.hand_keys(players)
+        scores = ev.evaluate_keys(common[0][:, None] + rank, common[1][:, None] + suit, common[2][:, None] | mask)
+
+        at_best = scores == scores.max(axis=1, keepdims=True)
+        shared = at_best.sum(axis=1, keepdims=True) > 1
+        wins = (at_best & ~shared).mean(axis=0)
+        ties = (at_best & shared).mean(axis=0)
+        categories = ev.category(scores)
+        size = len(HAND_CATEGORIES)
+
+        result = {"hands": [
+            {
+                "hand": ''.join(str(card) for card in hand),
+                **self._percentages(float(wins[i]), float(ties[i])),
+                "categories": category_shares(np.bincount(categories[:, i], minlength=size)),
+            }
+            for i, hand in enumerate(known_hands)
+        ]}
+        if ranges:
+            unknown = len(hands)
+            result["unknown"] = {
+                "players": len(ranges),
+                **self._percentages(float(wins[unknown:].mean()), float(ties[unknown:].mean())),
+            }
+            result["opponent_categories"] = category_shares(
+                np.bincount(categories[:, len(hands):].ravel(), minlength=size))
+        result["simulations_completed"] = samples
+        result["calculation_mode"] = "known_exact" if exact else "known_sampled"
+        return result
+
+    def _heads_up_exact(self, hole_cards: List[Card], board_cards: List[Card],
+                        weights: np.ndarray) -> Dict[str, any]:
+        """Range-weighted average of the exact per-holding outcomes"""
+        win, tie, live = self.holding_equity.outcome_vectors(hole_cards, board_cards)
+        weights = weights * live
+        total = weights.sum()
+        win_rate = float(np.nansum(win * weights) / total)
+        tie_rate = float(np.nansum(tie * weights) / total)
+        result = self._rates(win_rate, tie_rate, int(np.count_nonzero(weights)), 'range_exact')
+        categories = self.holding_equity.showdown_categories(hole_cards, board_cards, weights)
+        result['hero_categories'] = categories['hero']
+        result['opponent_categories'] = categories['opponents']
+        return result
+
+    def _sampled(self, dead: List[int], board_size: int, live_weights: List[np.ndarray],
+                 iterations: int, seed: Optional[int]) -> Dict[str, any]:
+        """Vectorized rejection sampling of opponent holdings and runouts"""
+        ev = self.evaluator
+        rng = np.random.RandomState(seed)
+        hole, board = dead[:2], dead[2:]
+
+        cards = self._draw_holdings(rng, live_weights, iterations)
+        samples = len(cards)
+        if samples == 0:
+            return {"error": "Opponent ranges conflict on every sample"}
+
+        runout = self._sample_runouts(rng, dead, cards, 5 - board_size)
+
+        board_rank, board_suit, board_mask = ev.hand_keys(board)
+        run_rank, run_suit, run_mask = ev.hand_keys(runout)
+        common = (board_rank + run_rank, board_suit + run_suit, board_mask | run_mask)
+
+        hero_rank, hero_suit, hero_mask = ev.hand_keys(hole)
+        hero = ev.evaluate_keys(common[0] + hero_rank, common[1] + hero_suit, common[2] | hero_mask)
+
+        opp_rank, opp_suit, opp_mask = ev.hand_keys(cards.reshape(samples, -1, 2))
+        opponents = ev.evaluate_keys(common[0][:, None] + opp_rank, common[1][:, None] + opp_suit,
+                                     common[2][:, None] | opp_mask)
+        best_opponent = opponents.max(axis=1)
+
+        win_rate = float((hero > best_opponent).mean())
+        tie_rate = float((hero == best_opponent).mean())
+        result = self._rates(win_rate, tie_rate, samples, 'range_sampled')
+        size = len(HAND_CATEGORIES)
+        result['hero_categories'] = category_shares(np.bincount(ev.category(hero), minlength=size))
+        result['opponent_categories'] = category_shares(np.bincount(ev.category(opponents).ravel(), minlength=size))
+        return result
+
+    @staticmethod
+    def _sample_runouts(rng: np.random.RandomState, dead: List[int], cards: np.ndarray,
+                        needed: int) -> np.ndarray:
+        """Board completion per sample from the cards nobody holds"""
+        samples = len(cards)
+        if not needed:
+            return np.zeros((samples, 0), dtype=np.int64)
+        keys = rng.random_sample((samples, 52))
+        keys[:, dead] = 2.0
+        keys[np.arange(samples)[:, None], cards] = 2.0
+        return np.argpartition(keys, needed - 1, axis=1)[:, :needed]
+
+    @staticmethod
+    def _draw_holdings(rng: np.random.RandomState, live_weights: List[np.ndarray],
+                       iterations: int, max_rounds: int = 4) -> np.ndarray:
+        """(samples, 2 * opponents) card indices with no card shared between opponents"""
+        probabilities = [weights / weights.sum() for weights in live_weights]
+        batches, accepted_total, size = [], 0, iterations
+        for _ in range(max_rounds):
+            holdings = np.stack([rng.choice(len(ALL_COMBOS), size=size, p=p) for p in probabilities], axis=1)
+            cards = ALL_COMBOS[holdings].reshape(size, -1)
+            accepted = (np.diff(np.sort(cards, axis=1), axis=1) != 0).all(axis=1)
+            batches.append(cards[accepted])
+            accepted_total += int(accepted.sum())
+            if accepted_total >= iterations or not accepted.any():
+                break
+            # Oversample the shortfall by the observed rejection rate
+            size = int((iterations - accepted_total) * size / accepted.sum() * 1.1) + 1
+        return np.concatenate(batches)[:iterations]
+
+    @staticmethod
+    def _percentages(win_rate: float, tie_rate: float) -> Dict[str, float]:
+        return {
+            'win_rate': round(win_rate * 100.0, 2),
+            'tie_rate': round(tie_rate * 100.0, 2),
+            'lose_rate': round((1.0 - win_rate - tie_rate) * 100.0, 2),
+        }
+
+    @classmethod
+    def _rates(cls, win_rate: float, tie_rate: float, samples: int, mode: str) -> Dict[str, any]:
+        return {
+            **cls._percentages(win_rate, tie_rate),
+            'simulations_completed': samples,
+            'calculation_mode': mode,
+        }
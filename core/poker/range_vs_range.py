@@ -0,0 +1,179 @@
+"""Range versus range - Board equity, nut advantage and equity distributions"""
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from core.domain import Card
+from .fast_evaluator import FastHandEvaluator, HAND_CATEGORIES, cards_to_indices
+from .holding_equity import ALL_COMBOS
+from .hand_range import HandRange, COMBO_MASKS
+from .range_equity import RangeSpec
+
+HISTOGRAM_BUCKETS = 10
+NEAR_NUT_SHARE = 0.05
+
+
+class RangeVsRangeCalculator:
+    """
+    Exact equity of one weighted range against another on a 3-5 card board.
+
+    For each runout, every live combo is scored once and scores are ranked.
+    Per-combo win/tie weight against the other range comes from cumulative
+    weight by rank; combos sharing a card are removed by inclusion-exclusion
+    over a (card, rank) table, so a runout costs O(n log n) instead of the
+    O(n^2) pairwise matrix. Runouts can be split across worker processes.
+    """
+
+    def __init__(self, evaluator: Optional[FastHandEvaluator] = None):
+        self.evaluator = evaluator or FastHandEvaluator()
+
+    def calculate(self, range_a: RangeSpec, range_b: RangeSpec, board_cards: List[Card],
+                  workers: int = 1) -> Dict[str, any]:
+        """Equity, nut share, categories and equity histogram for both ranges"""
+        if not 3 <= len(board_cards) <= 5:
+            return {"error": "Range vs range requires 3 to 5 board cards"}
+
+        board = cards_to_indices(board_cards)
+        if len(set(board)) != len(board):
+            return {"error": "Duplicate cards detected"}
+
+        try:
+            ranges = [spec if isinstance(spec, HandRange) else HandRange.parse(spec)
+                      for spec in (range_a, range_b)]
+        except ValueError as e:
+            return {"error": str(e)}
+
+        weights = [hand_range.live_weights(board) for hand_range in ranges]
+        if any(w.sum() <= 0 for w in weights):
+            return {"error": "Range is empty after card removal"}
+
+        runouts = FastHandEvaluator.runouts(self.evaluator.remaining_indices(board), 5 - len(board))
+        chunks = np.array_split(runouts, max(1, min(workers, len(runouts))))
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+                parts = list(pool.map(_accumulate, [board] * len(chunks), chunks,
+                                      [weights[0]] * len(chunks), [weights[1]] * len(chunks)))
+        else:
+            parts = [_accumulate(board, chunk, weights[0], weights[1], self.evaluator)
+                     for chunk in chunks]
+        points = sum(part[0] for part in parts)
+        totals = sum(part[1] for part in parts)
+
+        current = self._current_scores(board)
+        summaries = [self._summarize(points[side], totals[side], weights[side], current)
+                     for side in range(2)]
+
+        matchups = float((weights[0] * totals[0]).sum())
+        equity_a = float((weights[0] * points[0]).sum() / matchups) if matchups else 0.0
+        return {
+            "equity": [round(equity_a * 100, 2), round((1 - equity_a) * 100, 2)],
+            "ranges": summaries,
+            "runouts": len(runouts),
+            "matchups": round(matchups, 2),
+        }
+
+    def _current_scores(self, board: List[int]) -> np.ndarray:
+        """Score of every combo on the current board (-1 where blocked)"""
+        ev = self.evaluator
+        board_rank, board_suit, board_mask = ev.hand_keys(board)
+        combo_rank, combo_suit, combo_mask = ev.hand_keys(ALL_COMBOS)
+        scores = ev.evaluate_keys(combo_rank + board_rank, combo_suit + board_suit, combo_mask | board_mask)
+        dead = np.uint64(int(board_mask))
+        return np.where((COMBO_MASKS & dead) == 0, scores, -1)
+
+    def _summarize(self, points: np.ndarray, totals: np.ndarray, weights: np.ndarray,
+                   current: np.ndarray) -> Dict[str, any]:
+        """Per-range nut share, category mix and per-combo equity histogram"""
+        in_range = (weights > 0) & (totals > 0)
+        combo_equity = np.where(in_range, points / np.maximum(totals, 1e-12), 0.0)
+        weight_sum = weights[in_range].sum()
+
+        live_scores = np.sort(current[current >= 0])
+        near_nut_threshold = live_scores[int(len(live_scores) * (1 - NEAR_NUT_SHARE))]
+        nuts = in_range & (current == live_scores[-1])
+        near_nuts = in_range & (current >= near_nut_threshold)
+
+        buckets = np.minimum((combo_equity * HISTOGRAM_BUCKETS).astype(np.int64), HISTOGRAM_BUCKETS - 1)
+        histogram = np.bincount(buckets[in_range], weights=weights[in_range], minlength=HISTOGRAM_BUCKETS)
+        categories = np.bincount(self.evaluator.category(current[in_range]), weights=weights[in_range],
+                                 minlength=len(HAND_CATEGORIES))
+
+        return {
+            "combos": round(float(weight_sum), 2),
+            "nut_share": round(float(weights[nuts].sum() / weight_sum) * 100, 2),
+            "near_nut_share": round(float(weights[near_nuts].sum() / weight_sum) * 100, 2),
+            "histogram": [round(float(value / weight_sum) * 100, 2) for value in histogram],
+            "categories": {
+                name: round(float(categories[i] / weight_sum) * 100, 2)
+                for i, name in enumerate(HAND_CATEGORIES) if categories[i]
+            },
+        }
+
+
+def _accumulate(board: List[int], runouts: np.ndarray, weights_a: np.ndarray, weights_b: np.ndarray,
+                evaluator: Optional[FastHandEvaluator] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Summed (win + tie / 2) weight and valid opponent weight per combo, both sides.
+
+    Module-level so it can run in a worker process.
+    """
+    ev = evaluator or FastHandEvaluator()
+    board_rank, board_suit, board_mask = ev.hand_keys(board)
+    combo_rank, combo_suit, combo_mask = ev.hand_keys(ALL_COMBOS)
+    run_rank, run_suit, run_mask = ev.hand_keys(runouts)
+
+    involved = (weights_a > 0) | (weights_b > 0)
+    combos = np.nonzero(involved)[0]
+    scores = ev.evaluate_keys((combo_rank + board_rank)[combos][:, None] + run_rank[None, :],
+                              (combo_suit + board_suit)[combos][:, None] + run_suit[None, :],
+                              (combo_mask | board_mask)[combos][:, None] | run_mask[None, :])
+    alive = (COMBO_MASKS[combos][:, None] & run_mask[None, :]) == 0
+
+    points = np.zeros((2, len(ALL_COMBOS)))
+    totals = np.zeros((2, len(ALL_COMBOS)))
+    villain_weights = (weights_b[combos], weights_a[combos])
+    cards = ALL_COMBOS[combos]
+
+    for runout in range(len(runouts)):
+        live = np.nonzero(alive[:, runout])[0]
+        # Dense score ranks shared by both sides
+        _, ranks = np.unique(scores[live, runout], return_inverse=True)
+        ranks = ranks.ravel()
+        num_ranks = int(ranks.max()) + 2
+        card_index = cards[live] * num_ranks + ranks[:, None]
+        for side in range(2):
+            weights = villain_weights[side][live]
+            if not weights.any():
+                continue
+            win, tie, total = _versus(ranks, card_index, weights, num_ranks)
+            points[side, combos[live]] += win + tie / 2.0
+            totals[side, combos[live]] += total
+    return points, totals
+
+
+def _versus(ranks: np.ndarray, card_index: np.ndarray, weights: np.ndarray,
+            num_ranks: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Villain weight beaten, tied and compatible for every live combo on one board.
+
+    Combos sharing a card with the hero combo are subtracted per card using a
+    (card, rank) cumulative table; the identical combo is subtracted twice and
+    added back once.
+    """
+    cumulative = np.zeros(num_ranks)
+    cumulative[1:] = np.cumsum(np.bincount(ranks, weights=weights, minlength=num_ranks - 1))
+    below = cumulative[ranks]
+    at_or_below = cumulative[ranks + 1]
+
+    per_card = np.zeros((52, num_ranks))
+    per_card[:, 1:] = np.bincount(card_index.ravel(), weights=np.repeat(weights, 2),
+                                  minlength=52 * num_ranks)[:52 * num_ranks].reshape(52, num_ranks)[:, :-1]
+    per_card = per_card.cumsum(axis=1)
+    card_rows = card_index // num_ranks
+    blocked_below = per_card.ravel()[card_index].sum(axis=1)
+    blocked_at_or_below = per_card.ravel()[card_index + 1].sum(axis=1)
+    blocked_total = per_card[card_rows, -1].sum(axis=1)
+
+    win = below - blocked_below
+    tie = (at_or_below - below) - (blocked_at_or_below - blocked_below) + weights
+    total = cumulative[-1] - blocked_total + weights
+    return win, tie, total
@@ -0,0 +1,107 @@
+"""Two-card runout analysis - Backdoor (runner-runner) draws on the flop"""
+from typing import List, Dict, Optional
+import numpy as np
+from core.domain import Card
+from .fast_evaluator import FastHandEvaluator, HAND_CATEGORIES, cards_to_indices
+
+
+class RunoutAnalyzer:
+    """Enumerate every turn/river pair with the fast evaluator"""
+
+    def __init__(self, evaluator: Optional[FastHandEvaluator] = None):
+        self.evaluator = evaluator or FastHandEvaluator()
+
+    def analyze_backdoors(self, hole_cards: List[Card], board_cards: List[Card]) -> Dict[str, any]:
+        """
+        Exact backdoor draw probabilities over all C(47,2) runouts.
+
+        All probabilities are percentages. A runner-runner improvement needs
+        both the turn and the river: neither card alone reaches the category.
+        """
+        if len(hole_cards) != 2:
+            return {"error": "Need exactly 2 hole cards"}
+        if len(board_cards) != 3:
+            return {"error": "Backdoor analysis requires exactly 3 board cards"}
+
+        hole = cards_to_indices(hole_cards)
+        board = cards_to_indices(board_cards)
+        if len(set(hole + board)) != 5:
+            return {"error": "Duplicate cards detected"}
+
+        ev = self.evaluator
+        remaining = ev.remaining_indices(hole + board)
+        # Positions in remaining of both cards of every runout
+        first, second = ev.runouts(np.arange(len(remaining)), 2).T
+
+        hero_rank, hero_suit, hero_mask = ev.hand_keys(hole + board)
+        _, board_suit, board_mask = ev.hand_keys(board)
+        card_rank, card_suit, card_mask = ev.card_keys(remaining)
+        runout_rank = card_rank[first] + card_rank[second]
+        runout_suit = card_suit[first] + card_suit[second]
+        runout_mask = card_mask[first] | card_mask[second]
+
+        # Hero after flop, after one card, after both cards
+        flop_category = int(ev.category(ev.evaluate_keys(hero_rank, hero_suit, hero_mask)))
+        one_card = ev.category(ev.evaluate_keys(hero_rank + card_rank, hero_suit + card_suit,
+                                                hero_mask | card_mask))
+        final_rank = hero_rank + runout_rank
+        final_suit = hero_suit + runout_suit
+        final_mask = hero_mask | runout_mask
+        final = ev.category(ev.evaluate_keys(final_rank, final_suit, final_mask))
+        best_single = np.maximum(one_card[first], one_card[second])
+
+        runner_runner = (final > flop_category) & (final > best_single)
+        total = len(final)
+
+        backdoor_flush = self._backdoor_flush(
+            hole, final_suit, hero_suit + card_suit[first], hero_suit + card_suit[second],
+            board_suit + runout_suit
+        )
+        backdoor_straight = self._backdoor_straight(
+            hero_mask, final_mask, card_mask[first], card_mask[second], board_mask | runout_mask
+        )
+
+        category_counts = np.bincount(final, minlength=len(HAND_CATEGORIES))
+        runner_counts = np.bincount(final[runner_runner], minlength=len(HAND_CATEGORIES))
+
+        return {
+            "runouts": total,
+            "backdoor_flush": self._pct(backdoor_flush.sum(), total),
+            "backdoor_straight": self._pct(backdoor_straight.sum(), total),
+            "backdoor_any": self._pct((backdoor_flush | backdoor_straight).sum(), total),
+            "improve": self._pct((final > flop_category).sum(), total),
+            "runner_runner": {
+                name: self._pct(runner_counts[i], total)
+                for i, name in enumerate(HAND_CATEGORIES) if runner_counts[i]
+            },
+            "category_distribution": {
+                name: self._pct(category_counts[i], total)
+                for i, name in enumerate(HAND_CATEGORIES) if category_counts[i]
+            }
+        }
+
+    def _backdoor_flush(self, hole: List[int], final_suit, turn_suit, river_suit,
+                        board_suit) -> np.ndarray:
+        """Flush completed only by both cards, using at least one hole card"""
+        ev = self.evaluator
+        flush_suit = ev.flush_suit(final_suit)
+        hole_suits = np.array([card // 13 for card in hole])
+        uses_hole = (flush_suit[:, None] == hole_suits[None, :]).any(axis=1)
+        return ((flush_suit >= 0) & uses_hole &
+                (ev.flush_suit(turn_suit) < 0) & (ev.flush_suit(river_suit) < 0) &
+                (ev.flush_suit(board_suit) < 0))
+
+    def _backdoor_straight(self, hero_mask, final_mask, turn_mask, river_mask,
+                           board_mask) -> np.ndarray:
+        """Straight completed only by both cards and not played from the board"""
+        ev = self.evaluator
+        made = ev.straight_high(ev.rank_masks(final_mask)) > 0
+        with_turn = ev.straight_high(ev.rank_masks(hero_mask | turn_mask)) > 0
+        with_river = ev.straight_high(ev.rank_masks(hero_mask | river_mask)) > 0
+        on_flop = ev.straight_high(ev.rank_masks(hero_mask)) > 0
+        on_board = ev.straight_high(ev.rank_masks(board_mask)) > 0
+        return made & ~with_turn & ~with_river & ~on_flop & ~on_board
+
+    @staticmethod
+    def _pct(count, total: int) -> float:
+        return round(float(count) * 100.0 / total, 2) if total else 0.0
@@ -0,0 +1,182 @@
+"""Flop texture feature vectors, clustering and similar-board queries"""
+from typing import List, Dict, Tuple
+import threading
+import numpy as np
+from core.domain import Card
+from .texture_table import BoardTextureTable, HIGH_CARD_BUCKETS
+
+
+FEATURE_NAMES = [
+    'high_rank', 'middle_rank', 'low_rank', 'paired', 'trips',
+    'monotone', 'two_tone', 'rainbow', 'connectedness', 'straight_draws',
+    'nut_change_likelihood', 'high_card_bucket'
+]
+
+
+class BoardTextureIndex:
+    """
+    Numeric texture index over all canonical flops.
+
+    Every canonical flop gets a feature vector, a k-means bucket id and a
+    readable family name ("paired low rainbow", "monotone broadway", ...).
+    Bucket and family ids are plain arrays indexed by flop id, so stored
+    hands can be grouped with a single take() instead of re-analyzing boards.
+    Turn and river boards are grouped by their flop.
+    """
+
+    DEFAULT_BUCKETS = 24
+
+    _shared: Dict[int, Dict] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, table: BoardTextureTable = None, num_buckets: int = DEFAULT_BUCKETS):
+        self.table = table or BoardTextureTable()
+        with BoardTextureIndex._shared_lock:
+            if num_buckets not in BoardTextureIndex._shared:
+                BoardTextureIndex._shared[num_buckets] = _build_index(self.table, num_buckets)
+        shared = BoardTextureIndex._shared[num_buckets]
+        self.num_buckets = num_buckets
+        self.vectors: np.ndarray = shared['vectors']
+        self.bucket_ids: np.ndarray = shared['bucket_ids']
+        self.centroids: np.ndarray = shared['centroids']
+        self.family_names: List[str] = shared['family_names']
+        self.family_ids: np.ndarray = shared['family_ids']
+        self._scaled: np.ndarray = shared['scaled']
+
+    # ==================== Single board ====================
+
+    def vector(self, board_cards: List[Card]) -> np.ndarray:
+        """Raw feature vector of the board's flop (see FEATURE_NAMES)"""
+        return self.vectors[self.table.flop_id(board_cards)]
+
+    def bucket(self, board_cards: List[Card]) -> int:
+        """Cluster id of the board's flop"""
+        return int(self.bucket_ids[self.table.flop_id(board_cards)])
+
+    def family(self, board_cards: List[Card]) -> str:
+        """Readable family name of the board's flop"""
+        return self.family_names[self.family_ids[self.table.flop_id(board_cards)]]
+
+    def nearest(self, board_cards: List[Card], count: int = 10) -> List[Tuple[int, float]]:
+        """
+        Most similar canonical flops as (flop_id, distance), closest first.
+        
+        The board's own flop always comes first; many flops share a feature
+        vector, so other flops at distance 0 follow it, and equal distances
+        are ordered by flop id.
+        """
+        flop_id = self.table.flop_id(board_cards)
+        distances = np.linalg.norm(self._scaled - self._scaled[flop_id], axis=1)
+        order = np.argsort(distances, kind='stable')
+        order = np.concatenate(([flop_id], order[order != flop_id]))[:count]
+        return [(int(i), round(float(distances[i]), 4)) for i in order]
+
+    # ==================== Bulk queries ====================
+
+    def flops_in_bucket(self, bucket_id: int) -> np.ndarray:
+        """Canonical flop ids in a bucket"""
+        return np.nonzero(self.bucket_ids == bucket_id)[0]
+
+    def flops_in_family(self, family: str) -> np.ndarray:
+        """Canonical flop ids of a named family"""
+        if family not in self.family_names:
+            return np.array([], dtype=np.int64)
+        return np.nonzero(self.family_ids == self.family_names.index(family))[0]
+
+    def buckets_for(self, flop_ids) -> np.ndarray:
+        """Bucket ids for an array of canonical flop ids"""
+        return self.bucket_ids[np.asarray(flop_ids, dtype=np.int64)]
+
+    def families_for(self, flop_ids) -> np.ndarray:
+        """Family ids for an array of canonical flop ids (names in family_names)"""
+        return self.family_ids[np.asarray(flop_ids, dtype=np.int64)]
+
+    def bucket_summary(self) -> List[Dict[str, any]]:
+        """Size and dominant family of every bucket"""
+        summary = []
+        for bucket_id in range(self.num_buckets):
+            members = self.flops_in_bucket(bucket_id)
+            families = np.bincount(self.family_ids[members], minlength=len(self.family_names))
+            summary.append({
+                "bucket": bucket_id,
+                "flops": int(len(members)),
+                "family": self.family_names[int(families.argmax())] if len(members) else "",
+            })
+        return summary
+
+
+def _family_name(texture: Dict[str, any], trips: bool) -> str:
+    """Board family from pairing, height and suits"""
+    if trips:
+        pairing = "trips"
+    elif texture["paired"]:
+        pairing = "paired"
+    else:
+        pairing = "unpaired"
+
+    if texture["monotone"]:
+        suits = "monotone"
+    elif texture["two_tone"] or texture["flush_draw"]:
+        suits = "two-tone"
+    else:
+        suits = "rainbow"
+
+    return f"{pairing} {texture['high_card_bucket']} {suits}"
+
+
+def _kmeans(points: np.ndarray, k: int, iterations: int = 50, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Deterministic k-means with k-means++ seeding"""
+    rng = np.random.RandomState(seed)
+    centroids = [points[rng.randint(len(points))]]
+    for _ in range(1, k):
+        distances = np.min(((points[:, None, :] - np.array(centroids)[None]) ** 2).sum(axis=2), axis=1)
+        probabilities = distances / distances.sum()
+        centroids.append(points[rng.choice(len(points), p=probabilities)])
+    centroids = np.array(centroids)
+
+    labels = np.zeros(len(points), dtype=np.int64)
+    for iteration in range(iterations):
+        distances = ((points[:, None, :] - centroids[None]) ** 2).sum(axis=2)
+        new_labels = distances.argmin(axis=1)
+        if iteration > 0 and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for cluster in range(k):
+            members = points[labels == cluster]
+            if len(members):
+                centroids[cluster] = members.mean(axis=0)
+    return labels, centroids
+
+
+def _build_index(table: BoardTextureTable, num_buckets: int) -> Dict[str, any]:
+    """Feature vectors, clusters and families for all canonical flops"""
+    vectors = np.zeros((BoardTextureTable.NUM_CANONICAL_FLOPS, len(FEATURE_NAMES)), dtype=np.float64)
+    family_of = []
+    for flop_id in range(BoardTextureTable.NUM_CANONICAL_FLOPS):
+        texture = table.texture_by_id(flop_id)
+        ranks = sorted((card.rank_value() for card in table.flop_cards(flop_id)), reverse=True)
+        trips = ranks[0] == ranks[2]
+        vectors[flop_id] = [
+            (ranks[0] - 2) / 12, (ranks[1] - 2) / 12, (ranks[2] - 2) / 12,
+            float(texture["paired"]), float(trips),
+            float(texture["monotone"]), float(texture["two_tone"] or texture["flush_draw"]),
+            float(texture["rainbow"]), texture["connectedness"], texture["straight_draws"] / 3,
+            texture["nut_change_likelihood"], HIGH_CARD_BUCKETS.index(texture["high_card_bucket"]) / 3
+        ]
+        family_of.append(_family_name(texture, trips))
+
+    spread = vectors.std(axis=0)
+    scaled = (vectors - vectors.mean(axis=0)) / np.where(spread > 0, spread, 1.0)
+    bucket_ids, centroids = _kmeans(scaled, num_buckets)
+
+    family_names = sorted(set(family_of))
+    family_ids = np.array([family_names.index(name) for name in family_of], dtype=np.int64)
+
+    return {
+        'vectors': vectors,
+        'scaled': scaled,
+        'bucket_ids': bucket_ids,
+        'centroids': centroids,
+        'family_names': family_names,
+        'family_ids': family_ids,
+    }
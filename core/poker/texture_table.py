@@ -0,0 +1,261 @@
+"""Precomputed board texture table - All 1,755 canonical flops"""
+from typing import List, Dict, Tuple
+from collections import OrderedDict
+from itertools import combinations
+import threading
+import numpy as np
+from core.domain import Card
+from .fast_evaluator import cards_to_indices
+
+
+# Straight windows over rank indices (2..A = 0..12), wheel last
+STRAIGHT_WINDOWS = [0x1F << low for low in range(9)] + [0x100F]
+
+NUT_CATEGORIES = ['three_kind', 'straight', 'flush', 'four_kind', 'straight_flush']
+
+HIGH_CARD_BUCKETS = ['low', 'middle', 'broadway', 'ace']
+
+SuitMasks = Tuple[int, int, int, int]
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+class BoardTextureTable:
+    """
+    Constant-time board texture lookup.
+
+    A board is stored as four per-suit 13-bit rank masks; sorting them gives
+    a key that is invariant under suit permutation, so the 22,100 raw flops
+    collapse to 1,755 canonical ids. Flop textures are generated once, turn
+    and river textures are derived from the flop state card by card and
+    memoized by canonical key (least recently used first out).
+    """
+
+    NUM_CANONICAL_FLOPS = 1755
+    MEMO_SIZE = 4096  # turn and river textures kept
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        with BoardTextureTable._shared_lock:
+            if BoardTextureTable._shared is None:
+                BoardTextureTable._shared = _generate_table()
+        shared = BoardTextureTable._shared
+        self._rank_tables = shared['rank_tables']
+        self._flop_keys: List[SuitMasks] = shared['flop_keys']
+        self._flop_ids: Dict[SuitMasks, int] = shared['flop_ids']
+        self._flop_textures: List[Dict] = shared['flop_textures']
+        self._memo: OrderedDict = shared['memo']
+        self._memo_lock = shared['memo_lock']
+
+    # ==================== Lookup ====================
+
+    def flop_id(self, board_cards: List[Card]) -> int:
+        """Canonical id (0..1754) of the first three board cards"""
+        return self._flop_ids[self._canonical(self._suit_masks(cards_to_indices(board_cards[:3])))]
+
+    def flop_ids(self, boards: List[List[Card]]) -> np.ndarray:
+        """Canonical flop ids for many boards"""
+        return np.array([self.flop_id(board) for board in boards], dtype=np.int32)
+
+    def texture_by_id(self, flop_id: int) -> Dict[str, any]:
+        """Texture of a canonical flop"""
+        return dict(self._flop_textures[flop_id])
+
+    def flop_cards(self, flop_id: int) -> List[Card]:
+        """Representative cards of a canonical flop"""
+        cards = []
+        for suit, mask in enumerate(self._flop_keys[flop_id]):
+            for rank in range(13):
+                if mask >> rank & 1:
+                    cards.append(Card('23456789TJQKA'[rank], 'cdhs'[suit]))
+        return cards
+
+    def lookup(self, board_cards: List[Card]) -> Dict[str, any]:
+        """Texture for a 3-5 card board: flop from the table, later streets incrementally"""
+        if not 3 <= len(board_cards) <= 5:
+            return {"error": "Need 3 to 5 board cards"}
+
+        indices = cards_to_indices(board_cards)
+        if len(set(indices)) != len(indices):
+            return {"error": "Duplicate cards detected"}
+
+        state = self._suit_masks(indices[:3])
+        flop_id = self._flop_ids[self._canonical(state)]
+        if len(indices) == 3:
+            return self.texture_by_id(flop_id)
+
+        for index in indices[3:]:
+            state = self.extend(state, index)
+
+        texture = dict(self.texture_for_state(state))
+        texture["flop_id"] = flop_id
+        return texture
+
+    def extend(self, state: SuitMasks, card_index: int) -> SuitMasks:
+        """Add one card (engine index) to a board state"""
+        masks = list(state)
+        masks[card_index // 13] |= 1 << (card_index % 13)
+        return tuple(masks)
+
+    def texture_for_state(self, state: SuitMasks) -> Dict[str, any]:
+        """Texture for any board state, memoized by canonical key"""
+        key = self._canonical(state)
+        with self._memo_lock:
+            texture = self._memo.get(key)
+            if texture is not None:
+                self._memo.move_to_end(key)  # Mark as recently used
+                return texture
+        texture = _texture_from_masks(key, self._rank_tables)
+        with self._memo_lock:
+            self._memo[key] = texture
+            while len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return texture
+
+    # ==================== Bulk access ====================
+
+    def feature_arrays(self) -> Dict[str, np.ndarray]:
+        """Column arrays indexed by canonical flop id (for bulk analysis)"""
+        columns = {}
+        for name, value in self._flop_textures[0].items():
+            if isinstance(value, str):
+                continue
+            columns[name] = np.array([t[name] for t in self._flop_textures])
+        columns["high_card_bucket"] = np.array(
+            [HIGH_CARD_BUCKETS.index(t["high_card_bucket"]) for t in self._flop_textures], dtype=np.int8
+        )
+        columns["nut_category"] = np.array(
+            [NUT_CATEGORIES.index(t["nut_category"]) for t in self._flop_textures], dtype=np.int8
+        )
+        return columns
+
+    # ==================== Internals ====================
+
+    @staticmethod
+    def _suit_masks(indices: List[int]) -> SuitMasks:
+        masks = [0, 0, 0, 0]
+        for index in indices:
+            masks[index // 13] |= 1 << (index % 13)
+        return tuple(masks)
+
+    @staticmethod
+    def _canonical(state: SuitMasks) -> SuitMasks:
+        return tuple(sorted(state, reverse=True))
+
+
+def _build_rank_tables() -> Dict[str, list]:
+    """Per 13-bit rank mask tables (straight windows, connectedness)"""
+    masks = np.arange(1 << 13, dtype=np.int64)
+    window_counts = np.zeros((len(STRAIGHT_WINDOWS), 1 << 13), dtype=np.int64)
+    for i, window in enumerate(STRAIGHT_WINDOWS):
+        hits = masks & window
+        for rank in range(13):
+            window_counts[i] += (hits >> rank) & 1
+    max_in_window = window_counts.max(axis=0)
+
+    # Share of unpaired hole-rank pairs giving a straight or a four-card straight draw
+    pairs = [(1 << a) | (1 << b) for a, b in combinations(range(13), 2)]
+    draw_share = np.zeros(1 << 13)
+    for pair in pairs:
+        draw_share += max_in_window[masks | pair] >= 4
+    draw_share /= len(pairs)
+
+    return {
+        'straight_draws': (window_counts >= 3).sum(axis=0).tolist(),
+        'max_in_window': max_in_window.tolist(),
+        'connectedness': np.round(draw_share, 3).tolist(),
+    }
+
+
+def _nut_category(masks: SuitMasks, rank_tables: Dict[str, list]) -> int:
+    """Best hand category any holding can reach on this board (blockers ignored)"""
+    max_in_window = rank_tables['max_in_window']
+    if any(max_in_window[mask] >= 3 for mask in masks):
+        return NUT_CATEGORIES.index('straight_flush')
+    if (masks[0] & masks[1]) | (masks[0] & masks[2]) | (masks[0] & masks[3]) | \
+            (masks[1] & masks[2]) | (masks[1] & masks[3]) | (masks[2] & masks[3]):
+        return NUT_CATEGORIES.index('four_kind')
+    if any(_popcount(mask) >= 3 for mask in masks):
+        return NUT_CATEGORIES.index('flush')
+    if max_in_window[masks[0] | masks[1] | masks[2] | masks[3]] >= 3:
+        return NUT_CATEGORIES.index('straight')
+    return NUT_CATEGORIES.index('three_kind')
+
+
+def _texture_from_masks(masks: SuitMasks, rank_tables: Dict[str, list]) -> Dict[str, any]:
+    """All texture fields from per-suit rank masks"""
+    rank_mask = masks[0] | masks[1] | masks[2] | masks[3]
+    suit_counts = [_popcount(mask) for mask in masks]
+    board_size = sum(suit_counts)
+    max_suit_count = max(suit_counts)
+    paired = _popcount(rank_mask) < board_size
+    # Sorted ranks with a gap <= 2 (a pair is a gap of 0)
+    coordinated = paired or bool(rank_mask & ((rank_mask >> 1) | (rank_mask >> 2)))
+
+    nut = _nut_category(masks, rank_tables)
+    unseen = 52 - board_size
+    nut_changes = 0
+    if board_size < 5:
+        for suit in range(4):
+            for rank in range(13):
+                bit = 1 << rank
+                if masks[suit] & bit:
+                    continue
+                next_masks = list(masks)
+                next_masks[suit] |= bit
+                if _nut_category(tuple(next_masks), rank_tables) != nut:
+                    nut_changes += 1
+
+    top_rank = rank_mask.bit_length() - 1
+    if top_rank == 12:
+        high_card_bucket = 'ace'
+    elif top_rank >= 8:
+        high_card_bucket = 'broadway'
+    elif top_rank >= 5:
+        high_card_bucket = 'middle'
+    else:
+        high_card_bucket = 'low'
+
+    return {
+        "monotone": max_suit_count >= 3,
+        "two_tone": sum(1 for count in suit_counts if count >= 2) >= 2,
+        "rainbow": sum(1 for count in suit_counts if count > 0) >= 3,
+        "paired": paired,
+        "coordinated": coordinated,
+        "straight_draws": rank_tables['straight_draws'][rank_mask],
+        "flush_draw": max_suit_count == 2,
+        "dry": max_suit_count == 1 and not coordinated,
+        "connectedness": rank_tables['connectedness'][rank_mask],
+        "high_card_bucket": high_card_bucket,
+        "nut_category": NUT_CATEGORIES[nut],
+        "nut_change_likelihood": round(nut_changes / unseen, 3) if board_size < 5 else 0.0,
+    }
+
+
+def _generate_table() -> Dict[str, any]:
+    """Enumerate all flops and build the canonical texture table"""
+    rank_tables = _build_rank_tables()
+
+    keys = set()
+    for flop in combinations(range(52), 3):
+        keys.add(BoardTextureTable._canonical(BoardTextureTable._suit_masks(flop)))
+    flop_keys = sorted(keys, reverse=True)
+
+    flop_textures = []
+    for flop_id, key in enumerate(flop_keys):
+        texture = _texture_from_masks(key, rank_tables)
+        texture["flop_id"] = flop_id
+        flop_textures.append(texture)
+
+    return {
+        'rank_tables': rank_tables,
+        'flop_keys': flop_keys,
+        'flop_ids': {key: flop_id for flop_id, key in enumerate(flop_keys)},
+        'flop_textures': flop_textures,
+        'memo': OrderedDict(),
+        'memo_lock': threading.Lock(),
+    }
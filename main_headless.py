@@ -0,0 +1,79 @@
+"""
+MonteLab headless server - Analysis without Qt
+Serves AnalysisService and MLService as line-delimited JSON over stdin/stdout or a local TCP port
+"""
+
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+# Logs go to stderr: stdout carries the protocol
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    stream=sys.stderr
+)
+logger = logging.getLogger(__name__)
+
+
+def create_analysis_service():
+    """AnalysisService on the C++ Monte Carlo backend, or without simulation if it is unavailable"""
+    from core.poker import EquityCalculator, CppMonteCarloBackend
+    from services.analysis_service import AnalysisService
+
+    try:
+        equity_calculator = EquityCalculator(backend=CppMonteCarloBackend())
+        logger.info("✅ Monte Carlo backend initialized successfully")
+    except Exception as e:
+        logger.warning(f"⚠️  Monte Carlo backend unavailable: {e}")
+        equity_calculator = EquityCalculator(backend=None)
+    return AnalysisService(equity_calculator)
+
+
+def create_ml_service(yolo_path: Path, resnet_path: Path):
+    """MLService from weights, on GPU when available (torch is only imported here)"""
+    from services.ml_service import MLService
+    import torch
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    logger.info(f"Loading detection models on {device}")
+    return MLService.from_weights(str(yolo_path), str(resnet_path), device)
+
+
+def main():
+    """Headless entry point"""
+    script_dir = Path(__file__).parent
+    arguments = argparse.ArgumentParser(description="MonteLab analysis server (JSON lines, no GUI)")
+    arguments.add_argument("--port", type=int, help="listen on this localhost TCP port instead of stdin/stdout")
+    arguments.add_argument("--host", default="127.0.0.1")
+    arguments.add_argument("--workers", type=int, default=8, help="requests handled concurrently")
+    arguments.add_argument("--no-ml", action="store_true", help="disable card detection")
+    arguments.add_argument("--yolo", type=Path, default=script_dir / "models" / "epoch_50_ckpt.pth")
+    arguments.add_argument("--resnet", type=Path,
+                           default=script_dir / "models" / "fine_tuned_resnet_cards_240EPOCH.pt")
+    args = arguments.parse_args()
+
+    from services.analysis_server import AnalysisServer
+
+    ml_factory = None if args.no_ml else (lambda: create_ml_service(args.yolo, args.resnet))
+    server = AnalysisServer(create_analysis_service, ml_factory, max_workers=args.workers)
+    server.warm_up()
+
+    if args.port is None:
+        server.serve_stdio(sys.stdin, sys.stdout)
+        return 0
+
+    tcp = server.serve_tcp(args.host, args.port)
+    try:
+        server.stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tcp.shutdown()
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,10 @@ from core.domain import Card
 
 logger = logging.getLogger(__name__)
 
+# The command line (legacy) mode always simulates this many boards (N in
+# main.cpp) and takes no iteration count
+LEGACY_SIMULATIONS = 100000
+
 
 class MonteCarloEngineDaemon:
     """Оптимизированный Monte Carlo движок с персистентным процессом"""
@@ -240,6 +244,11 @@ class MonteCarloEngineDaemon:
         
         return True
     
+    @property
+    def honours_iterations(self) -> bool:
+        """Only the daemon takes an iteration count; legacy runs always simulate a fixed number"""
+        return self.daemon_mode and self.process is not None
+    
     def calculate_equity(self, hole_cards: List[Card], board_cards: List[Card],
                         opponents: int = 1, iterations: int = 100000) -> Dict[str, float]:
         """Calculate equity using daemon (if available) or legacy mode"""
@@ -282,6 +291,92 @@ class MonteCarloEngineDaemon:
         
         return result
     
+    def calculate_hands_equity(self, known_hands: List[List[Card]], board_cards: List[Card],
+                               opponents: int = 0, iterations: int = 100000) -> Dict:
+        """
+        Per-hand results for several known hands (plus unknown players) in one simulation.
+        
+        Returns {'hands': [{'hand', 'win_rate', 'tie_rate', 'lose_rate', ...}],
+        'unknown': {...} (only with unknown players), 'simulations_completed', 'calculation_mode'}.
+        """
+        start_time = time.time()
+        
+        if not known_hands or any(len(hand) != 2 for hand in known_hands):
+            return {'error': 'Each known hand needs exactly 2 cards'}
+        
+        if len(board_cards) > 5:
+            return {'error': 'Board cannot have more than 5 cards'}
+        
+        if opponents < 0 or opponents > 8:
+            return {'error': 'Opponents must be between 0-8'}
+        
+        if not 2 <= len(known_hands) + opponents <= 10:
+            return {'error': 'Players must be between 2-10'}
+        
+        if not self._validate_unique_cards([card for hand in known_hands for card in hand], board_cards):
+            return {'error': 'Duplicate cards detected'}
+        
+        board_str = ','.join(self._convert_card_to_cpp_format(card) for card in board_cards)
+        hand_strs = [','.join(self._convert_card_to_cpp_format(card) for card in hand) for hand in known_hands]
+        
+        result = None
+        if self.daemon_mode and self.process:
+            with self.process_lock:
+                try:
+                    if self.process.poll() is None:
+                        result = self._daemon_request(
+                            f"CALC {board_str}|{';'.join(hand_strs)}|{opponents}|{iterations}\n")
+                except (json.JSONDecodeError, RuntimeError) as e:
+                    logger.error(f"❌ Daemon error: {e}")
+            if result is not None and ('error' in result or not self._validate_result(result)):
+                # Executables built before multi-hand support reject the request
+                logger.warning(f"⚠️ Daemon cannot run multi-hand request ({result.get('error')}), using legacy")
+                result = None
+            if result is not None:
+                result = self._hands_result(result, len(known_hands))
+                result['calculation_mode'] = 'daemon'
+                self.daemon_call_count += 1
+        
+        if result is None:
+            if self.daemon_mode:
+                self.legacy_fallback_count += 1
+            result = self._calculate_hands_legacy(board_str, hand_strs, opponents, iterations)
+        
+        if 'error' in result:
+            logger.error(f"❌ Multi-hand calculation failed: {result['error']}")
+            return result
+        
+        for hand, hand_result in zip(known_hands, result['hands']):
+            hand_result['hand'] = ''.join(self._convert_card_to_cpp_format(card) for card in hand)
+        if 'unknown' in result:
+            result['unknown']['players'] = opponents
+        
+        elapsed = time.time() - start_time
+        self.call_count += 1
+        self.total_time += elapsed
+        logger.info(f"✅ Multi-hand calculation #{self.call_count}: {len(known_hands)} hands (took {elapsed:.3f}s)")
+        return result
+    
+    @staticmethod
+    def _hands_result(result: Dict, num_hands: int) -> Dict:
+        """Normalize a daemon reply into the per-hand layout"""
+        hands = result.get('hands')
+        if hands is None:
+            hands = [{
+                'win_rate': result['win_rate'],
+                'tie_rate': result['tie_rate'],
+                'lose_rate': result['lose_rate'],
+                'categories': result.get('hero_categories'),
+            }]
+        normalized = {
+            'hands': hands[:num_hands],
+            'simulations_completed': result.get('simulations_completed'),
+        }
+        if 'unknown' in result:
+            normalized['unknown'] = result['unknown']
+            normalized['opponent_categories'] = result.get('opponent_categories')
+        return normalized
+    
     def _calculate_daemon(self, hole_cards: List[Card], board_cards: List[Card],
                          opponents: int, iterations: int) -> Dict[str, float]:
         """
@@ -307,87 +402,7 @@ class MonteCarloEngineDaemon:
                 command = f"CALC {board_str}|{hole_str}|{opponents}|{iterations}\n"
                 logger.debug(f"Sending to daemon: {command.strip()}")
                 
-                # Отправка команды
-                self.process.stdin.write(command)
-                self.process.stdin.flush()
-                
-                # ✅ ПРАКТИКА 2: Улучшенный timeout на readline
-                result_line = None
-                read_timeout = 5.0  # Сокращённый timeout для daemon (должен быть быстрым)
-                start_time = time.time()
-                retry_count = 0
-                max_retries = 3
-                
-                while time.time() - start_time < read_timeout and retry_count < max_retries:
-                    try:
-                        # Проверяем что процесс ещё жив
-                        if self.process.poll() is not None:
-                            raise RuntimeError("Daemon process died during calculation")
-                        
-                        result_line = self.process.stdout.readline().strip()
-                        
-                        if result_line:
-                            logger.debug(f"Received from daemon: {result_line[:100]}...")
-                            break
-                        
-                        retry_count += 1
-                        time.sleep(0.01)  # Небольшая задержка перед retry
-                        
-                    except Exception as e:
-                        logger.warning(f"Read attempt {retry_count + 1} failed: {e}")
-                        retry_count += 1
-                        time.sleep(0.05)
-                
-                if not result_line:
-                    raise RuntimeError(f"Daemon returned empty result after {retry_count} retries (timeout: {read_timeout}s)")
-                
-                # Парсинг JSON
-                try:
-                    result = json.loads(result_line)
-                    logger.debug(f"Parsed JSON keys: {list(result.keys())}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"❌ Failed to parse JSON: {e}")
-                    logger.error(f"Raw output: {result_line}")
-                    raise
-                
-                # ✅ ИСПРАВЛЕНИЕ: Игнорируем маркер и читаем реальный результат
-                if 'marker' in result and 'win_rate' not in result:
-                    logger.info("✅ Received daemon marker, reading actual result...")
-                    
-                    # Читаем следующую строку с реальным результатом
-                    result_line = None
-                    retry_count = 0
-                    start_time = time.time()
-                    
-                    while time.time() - start_time < read_timeout and retry_count < max_retries:
-                        try:
-                            if self.process.poll() is not None:
-                                raise RuntimeError("Daemon process died during calculation")
-                            
-                            result_line = self.process.stdout.readline().strip()
-                            
-                            if result_line:
-                                logger.debug(f"Received actual result: {result_line[:100]}...")
-                                break
-                            
-                            retry_count += 1
-                            time.sleep(0.01)
-                            
-                        except Exception as e:
-                            logger.warning(f"Read attempt {retry_count + 1} failed: {e}")
-                            retry_count += 1
-                            time.sleep(0.05)
-                    
-                    if not result_line:
-                        raise RuntimeError(f"Daemon returned empty result after marker (timeout: {read_timeout}s)")
-                    
-                    # Парсим реальный результат
-                    try:
-                        result = json.loads(result_line)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"❌ Failed to parse actual result JSON: {e}")
-                        logger.error(f"Raw output: {result_line}")
-                        raise
+                result = self._daemon_request(command)
                 
                 # ✅ ПРАКТИКА 1: Валидация результата
                 if not self._validate_result(result):
@@ -406,7 +421,7 @@ class MonteCarloEngineDaemon:
                 
             except json.JSONDecodeError as e:
                 # ✅ ПРАКТИКА 3: Fallback на Legacy при ошибке парсинга
-                logger.error(f"❌ Failed to parse daemon result: {result_line if 'result_line' in locals() else 'N/A'}")
+                logger.error(f"❌ Failed to parse daemon result: {e}")
                 logger.warning("⚠️ Falling back to legacy mode for this calculation")
                 self.legacy_fallback_count += 1
                 return self._calculate_legacy(hole_cards, board_cards, opponents, iterations)
@@ -427,6 +442,67 @@ class MonteCarloEngineDaemon:
                 self.legacy_fallback_count += 1
                 return self._calculate_legacy(hole_cards, board_cards, opponents, iterations)
     
+    def _daemon_request(self, command: str) -> Dict:
+        """
+        Send one command to the daemon and parse its JSON reply.
+        
+        The first CALC reply is preceded by a marker line, which is skipped.
+        Raises RuntimeError on timeout or process death, JSONDecodeError on bad output.
+        """
+        self.process.stdin.write(command)
+        self.process.stdin.flush()
+        
+        result = self._parse_daemon_line(self._read_daemon_line())
+        
+        # ✅ ИСПРАВЛЕНИЕ: Игнорируем маркер и читаем реальный результат
+        if 'marker' in result and 'win_rate' not in result:
+            logger.info("✅ Received daemon marker, reading actual result...")
+            result = self._parse_daemon_line(self._read_daemon_line())
+        return result
+    
+    def _read_daemon_line(self, read_timeout: float = 5.0, max_retries: int = 3) -> str:
+        """✅ ПРАКТИКА 2: readline с timeout и retry"""
+        result_line = None
+        start_time = time.time()
+        retry_count = 0
+        
+        while time.time() - start_time < read_timeout and retry_count < max_retries:
+            try:
+                # Проверяем что процесс ещё жив
+                if self.process.poll() is not None:
+                    raise RuntimeError("Daemon process died during calculation")
+                
+                result_line = self.process.stdout.readline().strip()
+                
+                if result_line:
+                    logger.debug(f"Received from daemon: {result_line[:100]}...")
+                    break
+                
+                retry_count += 1
+                time.sleep(0.01)  # Небольшая задержка перед retry
+                
+            except RuntimeError:
+                raise
+            except Exception as e:
+                logger.warning(f"Read attempt {retry_count + 1} failed: {e}")
+                retry_count += 1
+                time.sleep(0.05)
+        
+        if not result_line:
+            raise RuntimeError(f"Daemon returned empty result after {retry_count} retries (timeout: {read_timeout}s)")
+        return result_line
+    
+    @staticmethod
+    def _parse_daemon_line(result_line: str) -> Dict:
+        try:
+            result = json.loads(result_line)
+            logger.debug(f"Parsed JSON keys: {list(result.keys())}")
+            return result
+        except json.JSONDecodeError as e:
+            logger.error(f"❌ Failed to parse JSON: {e}")
+            logger.error(f"Raw output: {result_line}")
+            raise
+    
     def _calculate_legacy(self, hole_cards: List[Card], board_cards: List[Card],
                          opponents: int, iterations: int) -> Dict[str, float]:
         """Calculate using legacy subprocess.run() - SLOW but RELIABLE"""
@@ -459,7 +535,8 @@ class MonteCarloEngineDaemon:
             stdout = result.stdout.strip()
             
             if stdout:
-                parsed_result = self._parse_text_output(stdout, iterations)
+                self._log_ignored_iterations(iterations)
+                parsed_result = self._parse_text_output(stdout)
                 parsed_result['calculation_mode'] = 'legacy'
                 return parsed_result
             
@@ -472,7 +549,68 @@ class MonteCarloEngineDaemon:
             logger.error(f"❌ Legacy calculation error: {e}", exc_info=True)
             return {'error': f'Calculation error: {e}'}
     
-    def _parse_text_output(self, output: str, total_sims: int = 100000) -> Dict[str, float]:
+    def _calculate_hands_legacy(self, board_str: str, hand_strs: List[str], opponents: int,
+                                iterations: int) -> Dict:
+        """Multi-hand run through the command line mode (accepts 'Ad,Kh|2c,7d')"""
+        try:
+            result = subprocess.run(
+                [str(self.executable_path), board_str, '|'.join(hand_strs), str(opponents)],
+                capture_output=True,
+                text=True,
+                timeout=60,
+                cwd=self.executable_path.parent,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+        except subprocess.TimeoutExpired:
+            logger.error("❌ C++ simulation timeout (60s)")
+            return {'error': 'Simulation timeout'}
+        except Exception as e:
+            logger.error(f"❌ Legacy calculation error: {e}", exc_info=True)
+            return {'error': f'Calculation error: {e}'}
+        
+        self._log_ignored_iterations(iterations)
+        parsed = self._parse_hands_output(result.stdout.strip(), len(hand_strs))
+        if 'error' not in parsed:
+            parsed['calculation_mode'] = 'legacy'
+        return parsed
+    
+    @staticmethod
+    def _log_ignored_iterations(iterations: int):
+        """Legacy runs report LEGACY_SIMULATIONS whatever was requested"""
+        if iterations != LEGACY_SIMULATIONS:
+            logger.info(f"Legacy mode ignores the requested {iterations} iterations "
+                        f"and runs {LEGACY_SIMULATIONS}")
+    
+    def _parse_hands_output(self, output: str, num_hands: int, total_sims: int = LEGACY_SIMULATIONS) -> Dict:
+        """Parse one result line per known hand, then the '?? ??' line for unknown players"""
+        import re
+        
+        hands, unknown = [], None
+        for line in output.split('\n'):
+            numbers = re.findall(r'\d+\.\d+', line)
+            if len(numbers) < 2:
+                continue
+            win_rate, tie_rate = float(numbers[0]), float(numbers[1])
+            rates = {
+                'win_rate': round(win_rate, 2),
+                'tie_rate': round(tie_rate, 2),
+                'lose_rate': round(max(0.0, 100.0 - win_rate - tie_rate), 2),
+            }
+            if line.strip().startswith('??'):
+                unknown = rates
+            else:
+                hands.append(rates)
+        
+        if len(hands) != num_hands:
+            logger.error(f"❌ Expected {num_hands} hand results in output:\n{output}")
+            return {'error': 'Could not parse results'}
+        
+        result = {'hands': hands, 'simulations_completed': total_sims}
+        if unknown is not None:
+            result['unknown'] = unknown
+        return result
+    
+    def _parse_text_output(self, output: str, total_sims: int = LEGACY_SIMULATIONS) -> Dict[str, float]:
         """Parse text output from C++ program (legacy format) - НАДЁЖНЫЙ"""
         import re
         
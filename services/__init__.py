@@ -1,5 +1,10 @@
 """Services package"""
 from .ml_service import MLService
 from .analysis_service import AnalysisService
+from .hand_history import HandHistoryParser
+from .result_store import AnalysisResultStore
+from .analysis_server import AnalysisServer
+from .recommendation_table import CompiledRecommendationEngine
 
-__all__ = ['MLService', 'AnalysisService']
+__all__ = ['MLService', 'AnalysisService', 'HandHistoryParser', 'AnalysisResultStore', 'AnalysisServer',
+           'CompiledRecommendationEngine']
@@ -0,0 +1,327 @@
+"""Analysis server - AnalysisService and MLService over a line-delimited JSON protocol (no Qt)"""
+from typing import Dict, List, Optional, Callable, TextIO
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+import json
+import logging
+import socketserver
+import threading
+import time
+import numpy as np
+from core.domain import Card, GameState, GameStage, GameType, TableSize, Position, DetectedCard
+from services.analysis_service import AnalysisService
+from services.ml_service import MLService
+
+logger = logging.getLogger(__name__)
+
+STAGE_BY_BOARD = {0: GameStage.PREFLOP, 3: GameStage.FLOP, 4: GameStage.TURN, 5: GameStage.RIVER}
+
+
+class AnalysisServer:
+    """
+    Line-delimited JSON front end for the analysis core.
+
+    Each request is one line {"id": ..., "method": ..., "params": {...}}
+    and is answered by one line {"id": ..., "result": ...} or
+    {"id": ..., "error": "..."}; requests run concurrently on a thread
+    pool, so responses can arrive out of order and are matched by id.
+    Ids are required and scoped to the connection; an id still in flight
+    on the same connection is rejected.
+    Analysis requests with "progress": true also stream
+    {"id": ..., "progress": stage, "data": {...}} lines, and
+    {"method": "cancel", "params": {"id": ...}} drops a running analysis
+    (the reply is false if it had already finished).
+
+    Services come from factories and are built on first use (or by
+    warm_up() in the background), so the server answers immediately and
+    never imports Qt or torch unless detection is requested.
+    """
+
+    MAX_WORKERS = 8
+
+    def __init__(self, analysis_factory: Callable[[], AnalysisService],
+                 ml_factory: Optional[Callable[[], MLService]] = None,
+                 max_workers: int = MAX_WORKERS):
+        self._analysis_factory = analysis_factory
+        self._ml_factory = ml_factory
+        self._analysis_service = None
+        self._ml_service = None
+        self._services_lock = threading.Lock()
+        self._ml_lock = threading.RLock()  # Detection models are not thread-safe
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="server")
+        self._active = set()
+        self._cancelled = set()
+        self._cancel_lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._requests = 0
+        self.stopped = threading.Event()
+
+        self._methods: Dict[str, Callable[[Dict, Callable[[str, Dict], None], Callable[[], bool]], any]] = {
+            "ping": self._ping,
+            "analyze_hand": self._analyze_hand,
+            "analyze_many": self._analyze_many,
+            "detect": self._detect,
+            "stats": self._stats,
+        }
+
+    # ==================== Services ====================
+
+    @property
+    def analysis_service(self) -> AnalysisService:
+        with self._services_lock:
+            if self._analysis_service is None:
+                start = time.perf_counter()
+                self._analysis_service = self._analysis_factory()
+                logger.info(f"Analysis service ready in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return self._analysis_service
+
+    @property
+    def ml_service(self) -> Optional[MLService]:
+        if self._ml_factory is None:
+            return None
+        with self._ml_lock:
+            if self._ml_service is None:
+                self._ml_service = self._ml_factory()
+            return self._ml_service
+
+    def warm_up(self):
+        """Build the analysis service in the background so the first request does not wait for it"""
+        threading.Thread(target=lambda: self.analysis_service, name="server-warmup", daemon=True).start()
+
+    def shutdown(self):
+        """Finish running requests and stop the services"""
+        self.stopped.set()
+        self._executor.shutdown(wait=True)
+        if self._analysis_service is not None:
+            self._analysis_service.shutdown()
+
+    # ==================== Dispatch ====================
+
+    def submit(self, line: str, send: Callable[[Dict], None]):
+        """
+        Parse one request line and run it on the pool; replies go through send.
+
+        send identifies the connection: running requests are tracked by
+        (send, id), so clients reusing ids never see each other's requests.
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            if request.get("id") is None:
+                raise ValueError("Request id is required")
+        except ValueError as e:
+            send({"id": None, "error": f"Invalid request: {e}"})
+            return
+
+        method = request.get("method")
+        request_id = request["id"]
+        if method == "cancel":
+            target = (send, (request.get("params") or {}).get("id"))
+            with self._cancel_lock:
+                running = target in self._active
+                if running:
+                    self._cancelled.add(target)
+            send({"id": request_id, "result": running})
+            return
+        if method == "shutdown":
+            send({"id": request_id, "result": True})
+            self.stopped.set()
+            return
+        key = (send, request_id)
+        with self._cancel_lock:
+            duplicate = key in self._active
+            if not duplicate:
+                self._requests += 1
+                self._active.add(key)
+        if duplicate:
+            send({"id": request_id, "error": f"Duplicate request id: {request_id}"})
+            return
+        self._executor.submit(self._run, key, method, request.get("params") or {}, send)
+
+    def _run(self, key: tuple, method: str, params: Dict, send: Callable[[Dict], None]):
+        """Execute one request (key is (send, id)) and send its result or error"""
+        request_id = key[1]
+        handler = self._methods.get(method)
+
+        def progress(stage: str, data: Dict):
+            send({"id": request_id, "progress": stage, "data": data})
+
+        def cancelled() -> bool:
+            return key in self._cancelled
+
+        try:
+            if handler is None:
+                send({"id": request_id, "error": f"Unknown method: {method}"})
+                return
+            result = handler(params, progress if params.get("progress") else None, cancelled)
+            if isinstance(result, dict) and "error" in result and len(result) == 1:
+                send({"id": request_id, "error": result["error"]})
+            else:
+                send({"id": request_id, "result": result})
+        except Exception as e:
+            logger.error(f"Request {request_id} ({method}) failed: {e}", exc_info=True)
+            send({"id": request_id, "error": str(e)})
+        finally:
+            with self._cancel_lock:
+                self._active.discard(key)
+                self._cancelled.discard(key)
+
+    # ==================== Methods ====================
+
+    def _ping(self, params: Dict, progress, cancelled) -> Dict:
+        return {"uptime": round(time.perf_counter() - self._started, 3)}
+
+    def _analyze_hand(self, params: Dict, progress, cancelled) -> Dict:
+        result = self.analysis_service.analyze_hand(state_from_json(params), progress=progress,
+                                                    cancelled=cancelled)
+        return _select(result, params.get("fields"))
+
+    def _analyze_many(self, params: Dict, progress, cancelled) -> List[Dict]:
+        states = [state_from_json(state) for state in params.get("states", [])]
+        results = self.analysis_service.analyze_many(states, workers=int(params.get("workers", 1)))
+        return [_select(result, params.get("fields")) for result in results]
+
+    def _detect(self, params: Dict, progress, cancelled) -> Dict:
+        ml_service = self.ml_service
+        if ml_service is None or not ml_service.is_available:
+            return {"error": "Card detection not available"}
+        import cv2
+
+        frame = cv2.imread(params["path"])
+        if frame is None:
+            return {"error": f"Cannot read image: {params['path']}"}
+        with self._ml_lock:
+            player, board = ml_service.detect_and_classify(frame, params.get("confidence_threshold", 0.4))
+        return {
+            "player_cards": [_detection_json(detection) for detection in player],
+            "board_cards": [_detection_json(detection) for detection in board],
+        }
+
+    def _stats(self, params: Dict, progress, cancelled) -> Dict:
+        stats = {"requests": self._requests, "uptime": round(time.perf_counter() - self._started, 3)}
+        if self._analysis_service is not None:
+            stats["analysis_cache"] = self._analysis_service.get_cache_stats()
+            stats["batch"] = self._analysis_service.get_batch_stats()
+        if self._ml_service is not None:
+            stats["ml_cache"] = self._ml_service.get_cache_stats()
+        return stats
+
+    # ==================== Transports ====================
+
+    def serve_stdio(self, stdin: TextIO, stdout: TextIO):
+        """Serve requests from stdin lines until EOF or a shutdown request"""
+        write_lock = threading.Lock()
+
+        def send(message: Dict):
+            line = encode(message)
+            with write_lock:
+                stdout.write(line)
+                stdout.flush()
+
+        send({"id": None, "result": {"ready": True}})
+        for line in stdin:
+            if line.strip():
+                self.submit(line, send)
+            if self.stopped.is_set():
+                break
+        self.shutdown()
+
+    def serve_tcp(self, host: str = "127.0.0.1", port: int = 0) -> socketserver.ThreadingTCPServer:
+        """Start a threaded TCP server (one JSON line per request) and return it; port 0 picks a free one"""
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                write_lock = threading.Lock()
+
+                def send(message: Dict):
+                    with write_lock:
+                        try:
+                            self.wfile.write(encode(message).encode("utf-8"))
+                            self.wfile.flush()
+                        except OSError:
+                            pass  # Client went away
+
+                for raw in self.rfile:
+                    line = raw.decode("utf-8", errors="replace")
+                    if line.strip():
+                        server.submit(line, send)
+                    if server.stopped.is_set():
+                        break
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        tcp = Server((host, port), Handler)
+        threading.Thread(target=tcp.serve_forever, name="server-tcp", daemon=True).start()
+        logger.info(f"Analysis server listening on {host}:{tcp.server_address[1]}")
+        return tcp
+
+
+# ==================== JSON conversion ====================
+
+def state_from_json(params: Dict) -> GameState:
+    """
+    GameState from request params.
+
+    Cards are "Ah Kd" strings or lists; table_size, game_type, stage and
+    position take enum values ("6max", "Cash", "Flop", "BTN"); stage
+    defaults to the one implied by the board. A board that is not 0, 3,
+    4 or 5 cards raises ValueError (an error reply).
+    """
+    player_cards = _cards(params.get("player_cards", []))
+    board_cards = _cards(params.get("board_cards", []))
+    if len(board_cards) not in STAGE_BY_BOARD:
+        raise ValueError(f"Board must have 0, 3, 4 or 5 cards, got {len(board_cards)}")
+    stage = params.get("stage")
+    return GameState(
+        table_size=TableSize(params.get("table_size", TableSize.SIX_MAX.value)),
+        game_type=GameType(params.get("game_type", GameType.CASH.value)),
+        stage=GameStage(stage) if stage else STAGE_BY_BOARD[len(board_cards)],
+        player_cards=player_cards,
+        board_cards=board_cards,
+        stacks=params.get("stacks"),
+        payouts=params.get("payouts"),
+        big_blind=params.get("big_blind"),
+        position=Position(params["position"]) if params.get("position") else None,
+        pot=params.get("pot"),
+        to_call=params.get("to_call"),
+    )
+
+
+def encode(message: Dict) -> str:
+    """One compact JSON line"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=_json_default) + "\n"
+
+
+def _cards(cards) -> List[Card]:
+    if isinstance(cards, str):
+        cards = cards.split()
+    return [Card.parse(card) for card in cards]
+
+
+def _select(result: Dict, fields: Optional[List[str]]) -> Dict:
+    """Only the requested result keys (errors are always kept)"""
+    if not fields or "error" in result:
+        return result
+    return {key: result[key] for key in fields if key in result}
+
+
+def _detection_json(detection: DetectedCard) -> Dict:
+    return {"card": detection.classification, "bbox": list(detection.bbox), "score": round(detection.score, 4)}
+
+
+def _json_default(value):
+    if isinstance(value, Card):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
@@ -1,109 +1,539 @@
 """Analysis Service - Orchestrates poker analysis with improved recommendations"""
-from typing import Dict, List
+from typing import Dict, List, Tuple, Callable, Optional, Iterable, Iterator
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
 import logging
-from core.domain import Card, GameState, GameStage
-from core.poker import HandEvaluator, EquityCalculator, BoardAnalyzer, OutsCalculator
+import threading
+import time
+import numpy as np
+from core.domain import Card, GameState, GameStage, GameType
+from core.poker import (
+    HandEvaluator, EquityCalculator, MonteCarloBackend, BoardAnalyzer, OutsCalculator, RunoutAnalyzer,
+    HandStrengthCalculator, EquityApproximator, ICMCalculator, PushFoldChart,
+    PreflopEquityMatrix, EVCalculator
+)
+from core.poker.fast_evaluator import cards_to_indices, index_to_card
+from core.poker.holding_equity import ALL_COMBOS, hand_class_indices
+from core.poker.push_fold import seats_behind
 
 logger = logging.getLogger(__name__)
 
 
+def _card_text_table(suit_map: Tuple[Tuple[str, str], ...]) -> Dict[str, str]:
+    """Renamed text of every card ("Ah") and holding key ("AhKd") under a suit map"""
+    rename = dict(suit_map)
+    names = [str(index_to_card(i)) for i in range(52)]
+    renamed = [cards_to_indices([Card(name[0], rename[name[1]])])[0] for name in names]
+    table = dict(zip(names, (names[i] for i in renamed)))
+    for a, b in ALL_COMBOS.tolist():
+        # Holding keys list the lower engine index first
+        low, high = sorted((renamed[a], renamed[b]))
+        table[names[a] + names[b]] = names[low] + names[high]
+    return table
+
+
 class AnalysisService:
     """High-level poker analysis orchestration with improved ABC recommendations"""
     
+    SIMULATION_ITERATIONS = 50000
+    EQUITY_FIRST_CHUNK = 2000
+    PIPELINE_WORKERS = 6
+    CANCEL_POLL_SECONDS = 0.02
+    RESULT_CACHE_SIZE = 256
+    BATCH_CHUNK_SIZE = 16
+    
+    # Progress stages and the result fields each one reports
+    PROGRESS_FIELDS = {
+        "equity_estimate": ["equity_estimate"],
+        "hand": ["stage", "current_hand", "hand_strength_numeric", "best_5_cards"],
+        "outs": ["outs_analysis", "total_outs", "backdoor_analysis"],
+        "texture": ["board_texture"],
+        "equity": ["equity"],
+        "holdings": ["hand_strength_analysis", "holding_equity", "runout_breakdown"],
+        "recommendation": ["strategy_recommendation", "ev_analysis"],
+    }
+    
     def __init__(self, equity_calculator: EquityCalculator):
         self.hand_evaluator = HandEvaluator()
         self.board_analyzer = BoardAnalyzer()
         self.outs_calculator = OutsCalculator()
+        self.runout_analyzer = RunoutAnalyzer()
+        self.hand_strength_calculator = HandStrengthCalculator(self.runout_analyzer.evaluator)
         self.equity_calculator = equity_calculator
+        self.icm_calculator = ICMCalculator()
+        self.ev_calculator = EVCalculator()
+        self._executor = ThreadPoolExecutor(max_workers=self.PIPELINE_WORKERS,
+                                            thread_name_prefix="analysis")
+        
+        # Stage inputs and results of the previous postflop analysis (incremental re-analysis)
+        self._last_inputs: Dict[str, tuple] = {}
+        self._last_stages: Dict[str, any] = {}
+        self._last_lock = threading.Lock()
+        
+        # LRU cache of complete results keyed by canonical situation
+        self._cache = OrderedDict()
+        self._cache_max_size = self.RESULT_CACHE_SIZE
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self._cache_lock = threading.Lock()
+        self._batch_stats: Dict[str, any] = {}
+        
+        # Precomputed equity model for instant previews (optional data file)
+        try:
+            self.equity_approximator = EquityApproximator.load(evaluator=self.runout_analyzer.evaluator)
+        except (OSError, KeyError) as e:
+            logger.warning(f"Equity model not available, previews disabled: {e}")
+            self.equity_approximator = None
+        
+        # Heads-up preflop equity between hand classes (optional data file)
+        try:
+            self.preflop_matrix = PreflopEquityMatrix.load()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Preflop equity matrix not available: {e}")
+            self.preflop_matrix = None
+        
+        # Nash push/fold charts for short-stacked tournament play (optional data file)
+        try:
+            self.push_fold_chart = PushFoldChart.load()
+        except (OSError, KeyError) as e:
+            logger.warning(f"Push/fold charts not available: {e}")
+            self.push_fold_chart = None
         
         # Import recommendation engine
         try:
-            from services.improved_abc_recommendations import ImprovedRecommendationEngine
-            self.recommendation_engine = ImprovedRecommendationEngine()
+            from services.recommendation_table import CompiledRecommendationEngine
+            self.recommendation_engine = CompiledRecommendationEngine()
             self.use_improved_recommendations = True
-            logger.info("Loaded improved recommendation engine")
+            logger.info("Loaded improved recommendation engine (compiled decision table)")
         except ImportError:
             logger.warning("Improved recommendation engine not found, using basic recommendations")
             self.recommendation_engine = None
             self.use_improved_recommendations = False
     
-    def analyze_hand(self, game_state: GameState) -> Dict[str, any]:
-        """Comprehensive hand analysis"""
+    def shutdown(self):
+        """Stop the analysis pool (pending stages finish first)"""
+        self._executor.shutdown(wait=True)
+    
+    def analyze_hand(self, game_state: GameState,
+                     progress: Optional[Callable[[str, Dict], None]] = None,
+                     cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, any]:
+        """
+        Comprehensive hand analysis.
+        
+        progress, if given, receives partial results as (stage, fields), where
+        fields are keys of the final result: "equity_estimate" (model
+        preview), then "hand", "outs" and "texture" within milliseconds,
+        "equity" after every simulation chunk (refined, with "ci"),
+        "holdings", and last "recommendation".
+        cancelled, if given, is polled while postflop stages run; once it
+        returns True the remaining stages are dropped and {"cancelled": True}
+        is returned. A cached postflop result is reported as one event per
+        stage with its final fields.
+        """
         
         # Validation
         if len(game_state.player_cards) != 2:
             return {"error": "Need exactly 2 player cards"}
         
-        # Determine analysis type based on stage
+        # Identical situations up to suit permutation and card order come from the cache
+        start = time.perf_counter()
+        cache_key, suits = self._canonical_state(game_state)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            result, cached_suits = cached
+            result = self._relabel_suits(result, tuple(zip(cached_suits, suits)))
+            if "board_cards_list" in result:
+                result["board_cards_list"] = list(game_state.board_cards)
+            result["cached"] = True
+            result["timings"] = {"total": round((time.perf_counter() - start) * 1000, 3)}
+            if progress:
+                for stage, fields in self.PROGRESS_FIELDS.items():
+                    if not all(field in result for field in fields):
+                        continue
+                    # As on a miss, equity is only reported once it has a win rate
+                    if stage in ("equity", "equity_estimate") and "win_rate" not in result[stage]:
+                        continue
+                    progress(stage, {field: result[field] for field in fields})
+            return result
+        
+        result = self._analyze_uncached(game_state, progress, cancelled)
+        if "error" not in result and not result.get("cancelled"):
+            # Callers may modify their result: the cache keeps its own copy
+            self._add_to_cache(cache_key, (self._relabel_suits(result, tuple(zip(suits, suits))), suits))
+        return result
+    
+    def _analyze_uncached(self, game_state: GameState,
+                          progress: Optional[Callable[[str, Dict], None]] = None,
+                          cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, any]:
+        """Determine analysis type based on stage"""
         if game_state.stage == GameStage.PREFLOP:
             return self._analyze_preflop(game_state)
-        else:
-            return self._analyze_postflop(game_state)
+        return self._analyze_postflop(game_state, progress, cancelled)
+    
+    # ==================== Result cache ====================
+    
+    @staticmethod
+    def _canonical_state(game_state: GameState) -> Tuple[tuple, str]:
+        """
+        Cache key invariant under suit permutation and the order of the hole
+        cards and of the flop cards, and the suit order it implies.
+        
+        Each suit is described by its rank masks in the hole cards, the flop,
+        the turn and the river (the flop id and texture depend on which cards
+        are the flop); sorting these gives the canonical card key (suits with
+        equal masks are interchangeable), and the sorted suits map canonical
+        positions back to actual suits. Stage, table, game type and the
+        betting context complete the key, since EV and ICM depend on them.
+        """
+        board = game_state.board_cards
+        masks = {suit: [0, 0, 0, 0] for suit in "cdhs"}
+        for side, cards in enumerate((game_state.player_cards, board[:3], board[3:4], board[4:])):
+            for card in cards:
+                masks[card.suit][side] |= 1 << "23456789TJQKA".index(card.rank)
+        suits = sorted(masks, key=lambda suit: masks[suit], reverse=True)
+        key = (
+            tuple(tuple(masks[suit]) for suit in suits),
+            game_state.stage, game_state.table_size, game_state.game_type,
+            tuple(game_state.stacks or ()), tuple(game_state.payouts or ()),
+            game_state.big_blind, game_state.position, game_state.pot, game_state.to_call,
+        )
+        return key, "".join(suits)
+    
+    def _get_cached(self, key: tuple) -> Optional[Tuple[Dict, str]]:
+        """Cached (result, suit order) or None, counting hits and misses"""
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache_hits += 1
+                self._cache.move_to_end(key)  # Mark as recently used
+                return self._cache[key]
+            self._cache_misses += 1
+            return None
+    
+    def _add_to_cache(self, key: tuple, entry: Tuple[Dict, str]):
+        """Add result to LRU cache"""
+        with self._cache_lock:
+            # Remove least recently used if cache is full
+            if key not in self._cache and len(self._cache) >= self._cache_max_size:
+                self._cache.popitem(last=False)
+                self._cache_evictions += 1
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+    
+    def get_cache_stats(self) -> dict:
+        """Get result cache statistics"""
+        with self._cache_lock:
+            total_requests = self._cache_hits + self._cache_misses
+            hit_rate = (self._cache_hits / total_requests * 100) if total_requests > 0 else 0
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "evictions": self._cache_evictions,
+                "hit_rate": f"{hit_rate:.1f}%",
+                "cache_size": len(self._cache)
+            }
+    
+    def clear_cache(self):
+        """Drop cached results (statistics are kept)"""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    _card_tables: Dict[tuple, Dict[str, str]] = {}
+    
+    @classmethod
+    def _relabel_suits(cls, result: Dict, suit_map: Tuple[Tuple[str, str], ...]) -> Dict:
+        """
+        Deep copy of a cached result with suits renamed (cached suit -> requested suit).
+        
+        Cards appear as Card objects, "Ah" strings, "AhKd" holding keys and
+        space-separated card lists; other strings are left alone.
+        """
+        table = cls._card_tables.get(suit_map)
+        if table is None:
+            # At most 24 suit permutations
+            table = cls._card_tables[suit_map] = _card_text_table(suit_map)
+        rename = dict(suit_map)
+        
+        def relabel(value):
+            if isinstance(value, dict):
+                return {relabel(k): relabel(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [relabel(item) for item in value]
+            if isinstance(value, Card):
+                return Card(value.rank, rename[value.suit])
+            if isinstance(value, str):
+                renamed = table.get(value)
+                if renamed is not None:
+                    return renamed
+                if " " in value:
+                    tokens = value.split(" ")
+                    if all(token in table for token in tokens):
+                        return " ".join(table[token] for token in tokens)
+            return value
+        
+        return relabel(result)
+    
+    # ==================== Batch analysis ====================
+    
+    def analyze_many(self, states: Iterable[GameState], workers: int = 1,
+                     backend_factory: Optional[Callable[[], MonteCarloBackend]] = None,
+                     chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[Dict[str, any]]:
+        """
+        Analyze many states, yielding one result per state in input order.
+        
+        States are read lazily and sent in chunks to worker processes, each
+        with its own AnalysisService built around backend_factory() (default:
+        this service's backend class, constructed without arguments; it must
+        be importable so the pool can pickle it). Identical situations, up to
+        suit permutation and card order, are analyzed once while in flight
+        and served from the result cache afterwards. With workers=1 states
+        are analyzed in this process. Throughput of the last batch is in
+        get_batch_stats().
+        """
+        if backend_factory is None and self.equity_calculator.backend is not None:
+            backend_factory = type(self.equity_calculator.backend)
+        
+        pool = None
+        if workers > 1:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                       initargs=(backend_factory,))
+        max_pending = max(1, workers) * 2
+        stats = {"states": 0, "analyzed": 0, "duplicates": 0, "workers": max(1, workers)}
+        self._batch_stats = stats
+        start = time.perf_counter()
+        
+        order = deque()  # (key, suits) of every state not yet yielded
+        entries: Dict[tuple, list] = {}  # key -> [result or None, suits of result, states waiting]
+        batch: List[Tuple[tuple, GameState]] = []
+        pending: Dict[Future, List[tuple]] = {}
+        
+        def submit():
+            keys, chunk = [key for key, _ in batch], [state for _, state in batch]
+            batch.clear()
+            if pool is not None:
+                pending[pool.submit(_analyze_batch, chunk)] = keys
+            else:
+                future = Future()
+                future.set_result([self._analyze_uncached(state) for state in chunk])
+                pending[future] = keys
+        
+        def collect(block: bool):
+            done, _ = wait(pending, return_when=FIRST_COMPLETED, timeout=None if block else 0)
+            for future in done:
+                for key, result in zip(pending.pop(future), future.result()):
+                    entries[key][0] = result
+                    stats["analyzed"] += 1
+                    if "error" not in result and not result.get("cancelled"):
+                        self._add_to_cache(key, (dict(result), entries[key][1]))
+        
+        def ready() -> Iterator[Dict[str, any]]:
+            while order and entries[order[0][0]][0] is not None:
+                key, suits = order.popleft()
+                entry = entries[key]
+                entry[2] -= 1
+                if entry[2] == 0:
+                    del entries[key]
+                yield self._relabel_suits(entry[0], tuple(zip(entry[1], suits)))
+        
+        try:
+            for state in states:
+                stats["states"] += 1
+                key, suits = self._canonical_state(state)
+                order.append((key, suits))
+                if key in entries:
+                    entries[key][2] += 1
+                    stats["duplicates"] += 1
+                elif len(state.player_cards) != 2:
+                    entries[key] = [{"error": "Need exactly 2 player cards"}, suits, 1]
+                else:
+                    cached = self._get_cached(key)
+                    if cached is not None:
+                        entries[key] = [cached[0], cached[1], 1]
+                        stats["duplicates"] += 1
+                    else:
+                        entries[key] = [None, suits, 1]
+                        batch.append((key, state))
+                        if len(batch) >= chunk_size:
+                            submit()
+                
+                # Bound the work in flight and the results held back for ordering
+                while pending and (len(pending) >= max_pending or len(order) >= max_pending * chunk_size * 4):
+                    collect(block=True)
+                    yield from ready()
+                if pending:
+                    collect(block=False)
+                yield from ready()
+            
+            if batch:
+                submit()
+            while pending:
+                collect(block=True)
+                yield from ready()
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+            elapsed = time.perf_counter() - start
+            stats["elapsed"] = round(elapsed, 3)
+            stats["states_per_second"] = round(stats["states"] / elapsed, 1) if elapsed > 0 else 0.0
+            logger.info(f"Batch analysis: {stats['states']} states ({stats['duplicates']} duplicates) "
+                        f"in {elapsed:.1f}s, {stats['states_per_second']} states/s on {stats['workers']} worker(s)")
+    
+    def get_batch_stats(self) -> dict:
+        """Throughput of the last (or running) analyze_many batch"""
+        return dict(self._batch_stats)
     
     def _analyze_preflop(self, game_state: GameState) -> Dict[str, any]:
         """Preflop analysis (would integrate with GTO charts)"""
         hand_key = self.hand_evaluator.get_hand_key(game_state.player_cards)
+        hand_class = int(hand_class_indices([cards_to_indices(game_state.player_cards)])[0])
         
         return {
             "stage": "preflop",
             "hand_key": hand_key,
             "cards_display": " ".join(str(c) for c in game_state.player_cards),
+            "equity_vs_random": (round(self.preflop_matrix.versus_random(hand_class) * 100, 2)
+                                 if self.preflop_matrix is not None else None),
+            "icm": self.tournament_equity(game_state),
+            "push_fold": self.push_fold_advice(game_state),
             # GTO recommendations would go here
         }
     
-    def _analyze_postflop(self, game_state: GameState) -> Dict[str, any]:
-        """Postflop analysis with hand strength, outs, equity"""
+    def _analyze_postflop(self, game_state: GameState,
+                          progress: Optional[Callable[[str, Dict], None]] = None,
+                          cancelled: Optional[Callable[[], bool]] = None) -> Dict[str, any]:
+        """
+        Postflop analysis with hand strength, outs, equity.
         
-        # Hand strength evaluation
-        all_cards = game_state.player_cards + game_state.board_cards
-        best_hand, strength = self.hand_evaluator.get_best_5_card_hand(all_cards)
-        current_hand = self.hand_evaluator.get_hand_description(best_hand)
+        The quick stages (hand, outs, texture) run first and are reported at
+        once; the holding grid and hand strength then run on the analysis
+        pool (numpy and the engine pipe release the GIL) while the equity
+        simulation runs in chunks on the calling thread, and the
+        recommendation is built once all of them are done.
         
-        # Outs calculation
-        outs_data = {}
-        total_outs = 0
-        if len(game_state.board_cards) < 5:
-            outs_data = self.outs_calculator.calculate_outs(
-                game_state.player_cards,
-                game_state.board_cards
-            )
-            total_outs = sum(outs_data.values())
+        Stages whose inputs (_stage_inputs) are unchanged since the previous
+        analysis are carried forward: changing only the opponent count reruns
+        the estimate, strength and equity; EV and the recommendation always
+        rerun. Their names are listed in "reused_stages".
+        """
+        start = time.perf_counter()
+        timings = {}
         
-        # Board texture analysis
-        texture_analysis = {}
-        if len(game_state.board_cards) >= 3:
-            texture_analysis = self.board_analyzer.analyze_texture(game_state.board_cards)
+        def report(stage: str, fields: Dict):
+            if progress:
+                progress(stage, fields)
         
-        # Equity simulation
-        equity_data = {}
-        if len(game_state.board_cards) >= 3:
-            try:
-                equity_data = self.equity_calculator.calculate_equity(
-                    game_state.player_cards,
-                    game_state.board_cards,
-                    num_opponents=game_state.get_opponents_count(),
-                    iterations=50000
-                )
-            except Exception as e:
-                logger.error(f"Equity calculation failed: {e}")
-                equity_data = {"error": str(e)}
+        # Stages whose inputs match the previous analysis are carried forward
+        inputs = self._stage_inputs(game_state)
+        with self._last_lock:
+            last_inputs, last_stages = self._last_inputs, self._last_stages
+        reused = {name: last_stages[name] for name, key in inputs.items()
+                  if name in last_stages and last_inputs.get(name) == key}
+        stages = {}
+        
+        def run(name: str, stage: Callable, *args):
+            stages[name] = reused[name] if name in reused else self._timed(timings, name, stage, *args)
+            return stages[name]
+        
+        # Instant equity preview, replaced by the simulated equity below
+        equity_estimate = run("estimate", self.estimate_equity, game_state)
+        if "win_rate" in equity_estimate:
+            report("equity_estimate", {"equity_estimate": equity_estimate})
+        if cancelled and cancelled():
+            return {"cancelled": True}
+        
+        # Hand, outs and texture take about a millisecond: run them before anything
+        # competes for the GIL so they can be shown right away
+        best_hand, strength, current_hand = run("hand", self._evaluate_hand, game_state,
+                                                last_inputs.get("hand"), last_stages.get("hand"))
+        outs_data, total_outs, backdoor_data = run("outs", self._outs_analysis, game_state)
+        texture_analysis = run("texture", self._texture_analysis, game_state)
+        report("hand", {
+            "stage": game_state.stage.value,
+            "current_hand": current_hand,
+            "hand_strength_numeric": strength,
+            "best_5_cards": [str(c) for c in best_hand],
+        })
+        report("outs", {"outs_analysis": outs_data, "total_outs": total_outs, "backdoor_analysis": backdoor_data})
+        report("texture", {"board_texture": texture_analysis})
+        
+        def submit(name: str, stage: Callable, *args) -> Future:
+            if name in reused:
+                future = Future()
+                future.set_result(reused[name])
+                return future
+            return self._executor.submit(self._timed, timings, name, stage, *args)
+        
+        holdings_future = submit("holdings", self._holding_analysis, game_state)
+        strength_future = submit("strength", self.hand_strength_calculator.calculate,
+                                 game_state.player_cards, game_state.board_cards,
+                                 game_state.get_opponents_count())
+        futures = [holdings_future, strength_future]
+        
+        # Simulated equity in growing chunks on this thread, each refinement reported
+        if "equity" in reused:
+            equity_data = reused["equity"]
+            report("equity", {"equity": equity_data})
+        else:
+            equity_data = self._timed(timings, "equity", self._simulate_equity, game_state,
+                                      lambda equity: report("equity", {"equity": equity}), cancelled)
+        if equity_data.get("cancelled") or not self._wait_stages(futures, cancelled):
+            return self._cancel_stages(futures)
+        strength_data = strength_future.result()
+        holding_equity, runout_data = holdings_future.result()
+        stages.update(equity=equity_data, strength=strength_data, holdings=(holding_equity, runout_data))
+        self._remember_stages(inputs, stages)
+        report("holdings", {
+            "hand_strength_analysis": strength_data,
+            "holding_equity": holding_equity,
+            "runout_breakdown": runout_data,
+        })
+        
+        # Hand categories at showdown: from the simulation, else from the exact grid
+        showdown_categories = {}
+        if equity_data.get("hero_categories"):
+            showdown_categories = {
+                "hero": equity_data["hero_categories"],
+                "opponents": equity_data.get("opponent_categories", {})
+            }
+        elif holding_equity.get("showdown_categories"):
+            showdown_categories = holding_equity["showdown_categories"]
+        
+        # Without a Monte Carlo result, recommend from the model estimate or effective hand strength
+        strategy_equity = equity_data
+        if "win_rate" not in equity_data:
+            if "win_rate" in equity_estimate:
+                strategy_equity = equity_estimate
+            elif "ehs" in strength_data:
+                strategy_equity = {"win_rate": strength_data["ehs"]}
+        
+        # EV of fold / call / bet sizes when the betting situation is known
+        ev_analysis = self._timed(timings, "ev", self.expected_values,
+                                  game_state, strategy_equity, holding_equity)
         
         # Strategic recommendation - NEW IMPROVED VERSION
         if self.use_improved_recommendations and self.recommendation_engine:
-            strategy = self._generate_improved_strategy(
+            strategy = self._timed(
+                timings, "recommendation", self._generate_improved_strategy,
                 current_hand=current_hand,
-                equity_data=equity_data,
+                equity_data=strategy_equity,
                 outs_data=outs_data,
                 total_outs=total_outs,
                 texture_analysis=texture_analysis,
-                game_state=game_state
+                game_state=game_state,
+                ev_analysis=ev_analysis
             )
         else:
             # Fallback to basic strategy
-            strategy = self._generate_basic_strategy(
-                current_hand, total_outs, equity_data, texture_analysis, len(game_state.board_cards)
+            strategy = self._timed(
+                timings, "recommendation", self._generate_basic_strategy,
+                current_hand, total_outs, strategy_equity, texture_analysis, len(game_state.board_cards)
             )
         
+        report("recommendation", {"strategy_recommendation": strategy, "ev_analysis": ev_analysis})
+        
+        timings["total"] = round((time.perf_counter() - start) * 1000, 2)
+        logger.debug(f"Postflop analysis timings (ms): {timings}")
+        
         return {
             "stage": game_state.stage.value,
             "current_hand": current_hand,
@@ -111,14 +541,307 @@ class AnalysisService:
             "best_5_cards": [str(c) for c in best_hand],
             "outs_analysis": outs_data,
             "total_outs": total_outs,
+            "backdoor_analysis": backdoor_data,
+            "hand_strength_analysis": strength_data,
             "board_texture": texture_analysis,
             "equity": equity_data,
+            "equity_estimate": equity_estimate,
+            "holding_equity": holding_equity,
+            "runout_breakdown": runout_data,
+            "showdown_categories": showdown_categories,
             "strategy_recommendation": strategy,
+            "ev_analysis": ev_analysis,
+            "icm": self.tournament_equity(game_state),
+            "timings": timings,
+            "reused_stages": sorted(reused),
             # Additional data for improved recommendations
             "num_opponents": game_state.get_opponents_count(),
             "board_cards_list": game_state.board_cards
         }
     
+    # ==================== Postflop stages ====================
+    
+    def _wait_stages(self, futures: List[Future], cancelled: Optional[Callable[[], bool]]) -> bool:
+        """Wait for the stages to finish, False as soon as the analysis is cancelled"""
+        if cancelled is None:
+            wait(futures)
+            return True
+        pending = set(futures)
+        while pending:
+            if cancelled():
+                return False
+            _, pending = wait(pending, timeout=self.CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+        return not cancelled()
+    
+    @staticmethod
+    def _stage_inputs(game_state: GameState) -> Dict[str, tuple]:
+        """Inputs each carried-forward stage depends on (EV and recommendation always rerun)"""
+        cards = (tuple(game_state.player_cards), tuple(game_state.board_cards))
+        opponents = game_state.get_opponents_count()
+        return {
+            "estimate": (cards, opponents),
+            "hand": cards,
+            "outs": cards,
+            "texture": cards[1],
+            "holdings": cards,
+            "strength": (cards, opponents),
+            "equity": (cards, opponents),
+        }
+    
+    def _remember_stages(self, inputs: Dict[str, tuple], stages: Dict[str, any]):
+        """Keep this analysis' stage results for the next one; failed stages are not kept"""
+        def failed(result) -> bool:
+            parts = result if isinstance(result, tuple) else (result,)
+            return any(isinstance(part, dict) and "error" in part for part in parts)
+        
+        kept = {name: result for name, result in stages.items() if not failed(result)}
+        with self._last_lock:
+            self._last_inputs = {name: inputs[name] for name in kept}
+            self._last_stages = kept
+    
+    @staticmethod
+    def _cancel_stages(futures: List[Future]) -> Dict[str, any]:
+        """Drop stages that have not started and mark the analysis cancelled"""
+        for future in futures:
+            future.cancel()
+        logger.debug("Postflop analysis cancelled")
+        return {"cancelled": True}
+    
+    @staticmethod
+    def _timed(timings: Dict[str, float], name: str, stage: Callable, *args, **kwargs):
+        """Run one stage and record its wall time in milliseconds"""
+        start = time.perf_counter()
+        try:
+            return stage(*args, **kwargs)
+        finally:
+            timings[name] = round((time.perf_counter() - start) * 1000, 2)
+    
+    def _evaluate_hand(self, game_state: GameState, previous_cards: Optional[tuple] = None,
+                       previous: Optional[Tuple[List[Card], int, str]] = None) -> Tuple[List[Card], int, str]:
+        """
+        Best five cards, numeric strength and description.
+        
+        When the previous analysis had the same hole cards and the board only
+        gained cards since, its best hand is extended instead of re-searched.
+        """
+        all_cards = game_state.player_cards + game_state.board_cards
+        if previous_cards and previous:
+            player, board = previous_cards
+            if (list(player) == game_state.player_cards and len(board) < len(game_state.board_cards)
+                    and list(board) == game_state.board_cards[:len(board)]):
+                best_hand, strength = self.hand_evaluator.extend_best_5_card_hand(
+                    previous[0], previous[1], list(player) + list(board), game_state.board_cards[len(board):]
+                )
+                return best_hand, strength, self.hand_evaluator.get_hand_description(best_hand)
+        best_hand, strength = self.hand_evaluator.get_best_5_card_hand(all_cards)
+        return best_hand, strength, self.hand_evaluator.get_hand_description(best_hand)
+    
+    def _outs_analysis(self, game_state: GameState) -> Tuple[Dict, int, Dict]:
+        """Outs by draw type, their total and runner-runner draws (flop only)"""
+        outs_data = {}
+        total_outs = 0
+        if len(game_state.board_cards) < 5:
+            outs_data = self.outs_calculator.calculate_outs(
+                game_state.player_cards,
+                game_state.board_cards
+            )
+            total_outs = sum(outs_data.values())
+        
+        backdoor_data = {}
+        if len(game_state.board_cards) == 3:
+            backdoor_data = self.runout_analyzer.analyze_backdoors(
+                game_state.player_cards,
+                game_state.board_cards
+            )
+        return outs_data, total_outs, backdoor_data
+    
+    def _texture_analysis(self, game_state: GameState) -> Dict:
+        if len(game_state.board_cards) < 3:
+            return {}
+        return self.board_analyzer.analyze_texture(game_state.board_cards)
+    
+    def _simulate_equity(self, game_state: GameState,
+                         on_chunk: Optional[Callable[[Dict], None]] = None,
+                         cancelled: Optional[Callable[[], bool]] = None) -> Dict:
+        """
+        Monte Carlo equity against the table's opponents.
+        
+        SIMULATION_ITERATIONS are run in chunks that double from
+        EQUITY_FIRST_CHUNK; after each chunk the pooled result, with the 95%
+        confidence half-width of the equity in "ci", goes to on_chunk. Exact
+        backends, and backends that do not honour the iteration count, finish
+        in one chunk.
+        """
+        if len(game_state.board_cards) < 3:
+            return {}
+        equity_data = None
+        chunk = self.SIMULATION_ITERATIONS
+        if getattr(self.equity_calculator.backend, "honours_iterations", False):
+            chunk = min(self.EQUITY_FIRST_CHUNK, chunk)
+        completed = 0
+        while completed < self.SIMULATION_ITERATIONS:
+            if cancelled and cancelled():
+                return {"cancelled": True}
+            try:
+                result = self.equity_calculator.calculate_equity(
+                    game_state.player_cards,
+                    game_state.board_cards,
+                    num_opponents=game_state.get_opponents_count(),
+                    iterations=chunk
+                )
+            except Exception as e:
+                logger.error(f"Equity calculation failed: {e}")
+                result = {"error": str(e)}
+            if "win_rate" not in result:
+                return equity_data or result
+            
+            equity_data = result if equity_data is None else self._merge_equity(equity_data, result)
+            exact = "exact" in str(equity_data.get("calculation_mode", ""))
+            equity_data["ci"] = 0.0 if exact else self._equity_ci(equity_data)
+            completed += chunk
+            if on_chunk:
+                on_chunk(dict(equity_data))
+            if exact:
+                break
+            chunk = min(chunk * 2, self.SIMULATION_ITERATIONS - completed)
+        return equity_data
+    
+    @staticmethod
+    def _merge_equity(total: Dict, chunk: Dict) -> Dict:
+        """Pool two simulation results, weighting rates and category shares by their sample counts"""
+        n_total = total.get("simulations_completed", 0)
+        n_chunk = chunk.get("simulations_completed", 0)
+        samples = n_total + n_chunk
+        if samples <= 0:
+            return chunk
+        
+        def pooled(a: float, b: float) -> float:
+            return round((a * n_total + b * n_chunk) / samples, 3)
+        
+        merged = dict(chunk)
+        for key in ("win_rate", "tie_rate", "lose_rate"):
+            merged[key] = pooled(total.get(key, 0.0), chunk.get(key, 0.0))
+        for key in ("hero_categories", "opponent_categories"):
+            if isinstance(total.get(key), dict) and isinstance(chunk.get(key), dict):
+                names = set(total[key]) | set(chunk[key])
+                merged[key] = {name: round(pooled(total[key].get(name, 0.0), chunk[key].get(name, 0.0)), 2)
+                               for name in names}
+        merged["simulations_completed"] = samples
+        return merged
+    
+    @staticmethod
+    def _equity_ci(equity_data: Dict) -> float:
+        """95% confidence half-width (percentage points) of win + tie / 2 from the sample count"""
+        samples = equity_data.get("simulations_completed", 0)
+        if samples <= 0:
+            return 100.0
+        equity = (equity_data["win_rate"] + equity_data.get("tie_rate", 0) / 2) / 100.0
+        equity = min(max(equity, 0.0), 1.0)
+        return round(1.96 * float(np.sqrt(equity * (1 - equity) / samples)) * 100, 2)
+    
+    def _holding_analysis(self, game_state: GameState) -> Tuple[Dict, Dict]:
+        """
+        Equity against every opponent holding (heatmap data) and by next card.
+        
+        One stage because the runout breakdown reuses the holding grid.
+        """
+        if len(game_state.board_cards) < 3:
+            return {}, {}
+        try:
+            holding_equity = self.equity_calculator.equity_vs_holdings(
+                game_state.player_cards,
+                game_state.board_cards
+            )
+        except Exception as e:
+            logger.error(f"Holding equity calculation failed: {e}")
+            holding_equity = {"error": str(e)}
+        
+        runout_data = {}
+        if len(game_state.board_cards) in (3, 4):
+            try:
+                runout_data = self.equity_calculator.runout_breakdown(
+                    game_state.player_cards,
+                    game_state.board_cards
+                )
+            except Exception as e:
+                logger.error(f"Runout breakdown failed: {e}")
+                runout_data = {"error": str(e)}
+        return holding_equity, runout_data
+    
+    def estimate_equity(self, game_state: GameState) -> Dict[str, any]:
+        """Approximate equity from the precomputed model (fraction of a millisecond)"""
+        if self.equity_approximator is None:
+            return {}
+        if len(game_state.player_cards) != 2 or len(game_state.board_cards) < 3:
+            return {}
+        try:
+            return self.equity_approximator.estimate(
+                game_state.player_cards,
+                game_state.board_cards,
+                num_opponents=game_state.get_opponents_count()
+            )
+        except Exception as e:
+            logger.error(f"Equity estimate failed: {e}")
+            return {"error": str(e)}
+    
+    def expected_values(self, game_state: GameState, equity_data: Dict,
+                        holding_equity: Dict) -> Dict[str, any]:
+        """
+        EV of every action for the current pot and stacks (empty without pot and stacks).
+        
+        Heads-up, the exact equity against each opponent holding is used as
+        the distribution, so fold probability follows from bet size.
+        """
+        if game_state.pot is None or not game_state.stacks or "win_rate" not in equity_data:
+            return {}
+        try:
+            villains = [stack for stack in game_state.stacks[1:] if stack > 0]
+            holdings = holding_equity.get("holdings")
+            distribution = None
+            if game_state.get_opponents_count() == 1 and holdings:
+                distribution = np.fromiter(holdings.values(), dtype=np.float64, count=len(holdings)) / 100.0
+            equity = (equity_data["win_rate"] + equity_data.get("tie_rate", 0) / 2) / 100.0
+            return self.ev_calculator.calculate(
+                pot=game_state.pot,
+                to_call=game_state.to_call or 0.0,
+                hero_stack=game_state.stacks[0],
+                villain_stack=max(villains) if villains else None,
+                equity=equity,
+                equity_distribution=distribution
+            )
+        except Exception as e:
+            logger.error(f"EV calculation failed: {e}")
+            return {"error": str(e)}
+    
+    def tournament_equity(self, game_state: GameState) -> Dict[str, any]:
+        """ICM prize equity and bubble factors when tournament stacks and payouts are known"""
+        if game_state.game_type != GameType.TOURNAMENT:
+            return {}
+        if not game_state.stacks or not game_state.payouts:
+            return {}
+        try:
+            return self.icm_calculator.calculate(game_state.stacks, game_state.payouts, hero=0)
+        except Exception as e:
+            logger.error(f"ICM calculation failed: {e}")
+            return {"error": str(e)}
+    
+    def push_fold_advice(self, game_state: GameState) -> Dict[str, any]:
+        """Chart lookup for short-stacked tournament hands (needs stacks, big blind and position)"""
+        if self.push_fold_chart is None or game_state.game_type != GameType.TOURNAMENT:
+            return {}
+        if not game_state.stacks or not game_state.big_blind or game_state.position is None:
+            return {}
+        
+        live = [stack for stack in game_state.stacks[1:] if stack > 0]
+        if not live or game_state.stacks[0] <= 0:
+            return {}
+        players = len(live) + 1
+        stack_bb = min(game_state.stacks[0], max(live)) / game_state.big_blind
+        hand_class = int(hand_class_indices([cards_to_indices(game_state.player_cards)])[0])
+        return self.push_fold_chart.advice(
+            hand_class, players, seats_behind(game_state.position, players), stack_bb
+        )
+    
     def _generate_improved_strategy(
         self,
         current_hand: str,
@@ -126,7 +849,8 @@ class AnalysisService:
         outs_data: Dict,
         total_outs: int,
         texture_analysis: Dict,
-        game_state: GameState
+        game_state: GameState,
+        ev_analysis: Optional[Dict] = None
     ) -> str:
         """Generate improved strategic recommendation"""
         
@@ -141,7 +865,8 @@ class AnalysisService:
                 texture_analysis=texture_analysis,
                 num_opponents=game_state.get_opponents_count(),
                 stage=game_state.stage,
-                board_cards=game_state.board_cards
+                board_cards=game_state.board_cards,
+                ev_analysis=ev_analysis
             )
             
             return recommendation
@@ -195,4 +920,24 @@ class AnalysisService:
         if board_cards_count == 5:
             return "❌ СЛАБАЯ РУКА - Скорее всего ФОЛД к ставкам"
         else:
-            return "😕 СЛАБАЯ ПОЗИЦИЯ - Чек или фолд к агрессии"
\ No newline at end of file
+            return "😕 СЛАБАЯ ПОЗИЦИЯ - Чек или фолд к агрессии"
+
+# ==================== Batch workers ====================
+
+_batch_service: Optional[AnalysisService] = None
+
+
+def _init_batch_worker(backend_factory: Optional[Callable[[], MonteCarloBackend]]):
+    """Build the per-process service used by _analyze_batch"""
+    global _batch_service
+    backend = backend_factory() if backend_factory is not None else None
+    _batch_service = AnalysisService(EquityCalculator(backend))
+
+
+def _analyze_batch(states: List[GameState]) -> List[Dict[str, any]]:
+    """
+    Analyze a chunk of states on this process's service.
+    
+    Module-level so it can run in a worker process.
+    """
+    return [_batch_service._analyze_uncached(state) for state in states]
@@ -0,0 +1,398 @@
+"""Hand history import - Streams text hand histories into GameState snapshots for bulk analysis"""
+from typing import Dict, List, Optional, Iterator, Iterable
+from dataclasses import dataclass, field
+from collections import deque
+from pathlib import Path
+import json
+import logging
+import os
+import re
+import time
+from core.domain import Card, GameState, GameStage, GameType, TableSize, Position
+from core.poker.push_fold import seat_name
+
+logger = logging.getLogger(__name__)
+
+# Table size by number of players in the hand
+TABLE_SIZES = [
+    TableSize.HEADS_UP, TableSize.THREE_MAX, TableSize.FOUR_MAX, TableSize.FIVE_MAX,
+    TableSize.SIX_MAX, TableSize.SEVEN_MAX, TableSize.EIGHT_MAX, TableSize.NINE_MAX
+]
+
+STREETS = {"FLOP": GameStage.FLOP, "TURN": GameStage.TURN, "RIVER": GameStage.RIVER}
+
+# Hands between resume checkpoints
+CHECKPOINT_HANDS = 50
+
+# Result fields written per snapshot by the command line importer
+SUMMARY_KEYS = ("current_hand", "hand_key", "total_outs", "equity", "equity_vs_random",
+                "ev_analysis", "icm", "push_fold")
+
+_HEADER = re.compile(r"^\S.* Hand #(\d+):")
+_BLINDS = re.compile(r"\([$€£]?([\d.]+)/[$€£]?([\d.]+)")
+_BUTTON = re.compile(r"Seat #(\d+) is the button")
+_SEAT = re.compile(r"^Seat (\d+): (.+?) \([$€£]?([\d.]+) in chips")
+_DEALT = re.compile(r"^Dealt to (.+?) \[(\S\S) (\S\S)\]")
+_STREET = re.compile(r"^\*\*\* (FLOP|TURN|RIVER) \*\*\*")
+_CARDS = re.compile(r"\b([2-9TJQKA][cdhs])\b")
+_ACTION = re.compile(
+    r"^(.+?): (posts small blind|posts big blind|posts small & big blinds|posts the ante|"
+    r"folds|checks|calls|bets|raises)(?: [$€£]?([\d.]+))?(?: to [$€£]?([\d.]+))?"
+)
+_UNCALLED = re.compile(r"^Uncalled bet \([$€£]?([\d.]+)\) returned to (.+)$")
+
+
+@dataclass
+class ParsedHand:
+    """Snapshots of one hand: a GameState per street hero saw, at hero's first decision"""
+    hand_id: str
+    hero: str
+    states: List[GameState] = field(default_factory=list)
+    end_offset: int = 0  # Byte offset just past the hand in its file (resume point)
+
+
+class HandHistoryParser:
+    """
+    Streaming parser for PokerStars-format Hold'em hand histories.
+
+    Files are read line by line and only the current hand is buffered, so
+    memory does not grow with file size. Each street hero sees becomes a
+    GameState taken at hero's first decision there (or at the end of the
+    street if hero had none): players still in the hand set the table
+    size, pot includes the bet hero faces and stacks are what is left
+    behind, hero first. Hands without hero's hole cards, non Hold'em hands
+    and lines that do not parse are skipped.
+    """
+
+    def __init__(self, hero: Optional[str] = None):
+        # None: whoever the hole cards are dealt to
+        self.hero = hero
+
+    def iter_states(self, path: Path, start_offset: int = 0) -> Iterator[GameState]:
+        """GameState snapshots of every hand in the file, lazily"""
+        for hand in self.iter_hands(path, start_offset):
+            yield from hand.states
+
+    def iter_hands(self, path: Path, start_offset: int = 0) -> Iterator[ParsedHand]:
+        """Parsed hands in file order, starting at a byte offset from a previous end_offset"""
+        with open(path, "rb") as f:
+            f.seek(start_offset)
+            offset = start_offset
+            lines: List[str] = []
+            for raw in f:
+                line = raw.decode("utf-8", errors="replace").strip().lstrip("\ufeff")
+                if _HEADER.match(line) and lines:
+                    hand = self.parse_hand(lines)
+                    if hand is not None:
+                        hand.end_offset = offset
+                        yield hand
+                    lines = []
+                offset += len(raw)
+                if line and (lines or _HEADER.match(line)):
+                    lines.append(line)
+            if lines:
+                hand = self.parse_hand(lines)
+                if hand is not None:
+                    hand.end_offset = offset
+                    yield hand
+
+    def parse_hand(self, lines: List[str]) -> Optional[ParsedHand]:
+        """Snapshots of one hand's text lines, or None if it cannot be analyzed"""
+        header = lines[0]
+        if "Hold'em" not in header:
+            return None
+        blinds = _BLINDS.search(header)
+        game_type = GameType.TOURNAMENT if "Tournament #" in header else GameType.CASH
+
+        button = None
+        seats: Dict[str, float] = {}  # player -> starting stack, in seat order
+        seat_numbers: Dict[str, int] = {}
+        hand: Optional[_HandProgress] = None
+
+        for line in lines[1:]:
+            if line.startswith("*** SUMMARY") or line.startswith("*** SHOW DOWN"):
+                break
+
+            if hand is None:
+                match = _BUTTON.search(line)
+                if match:
+                    button = int(match.group(1))
+                    continue
+                match = _SEAT.match(line)
+                if match:
+                    if "sitting out" not in line:
+                        seats[match.group(2)] = float(match.group(3))
+                        seat_numbers[match.group(2)] = int(match.group(1))
+                    continue
+                if not seats:
+                    continue
+                hand = _HandProgress(seats, seat_numbers, button,
+                                     float(blinds.group(2)) if blinds else None, game_type)
+
+            match = _DEALT.match(line)
+            if match:
+                if hand.hero is None and (self.hero is None or match.group(1) == self.hero):
+                    try:
+                        hole_cards = [Card.parse(match.group(2)), Card.parse(match.group(3))]
+                    except ValueError:
+                        return None
+                    if not hand.deal(match.group(1), hole_cards):
+                        return None
+                continue
+
+            match = _STREET.match(line)
+            if match:
+                if hand.hero is None:
+                    return None
+                try:
+                    board = [Card.parse(text) for text in _CARDS.findall(line)]
+                except ValueError:
+                    return None
+                hand.next_street(STREETS[match.group(1)], board)
+                continue
+
+            match = _ACTION.match(line)
+            if match:
+                amount = float(match.group(3)) if match.group(3) else 0.0
+                to = float(match.group(4)) if match.group(4) else None
+                hand.act(match.group(1), match.group(2), amount, to)
+                continue
+
+            match = _UNCALLED.match(line)
+            if match:
+                hand.refund(match.group(2), float(match.group(1)))
+
+        if hand is None or hand.hero is None:
+            return None
+        hand.finish_street()
+        return ParsedHand(hand_id=_HEADER.match(header).group(1), hero=hand.hero, states=hand.states)
+
+
+class _HandProgress:
+    """Chips committed per player and per street while a hand is replayed"""
+
+    def __init__(self, seats: Dict[str, float], seat_numbers: Dict[str, int], button: Optional[int],
+                 big_blind: Optional[float], game_type: GameType):
+        self.stacks = dict(seats)
+        self.seat_numbers = seat_numbers
+        self.button = button
+        self.big_blind = big_blind
+        self.game_type = game_type
+        self.committed = {player: 0.0 for player in seats}
+        self.street_bets = {player: 0.0 for player in seats}
+        self.folded = set()
+        self.big_blind_player: Optional[str] = None
+        self.hero: Optional[str] = None
+        self.hole_cards: List[Card] = []
+        self.position: Optional[Position] = None
+        self.street = GameStage.PREFLOP
+        self.board: List[Card] = []
+        self.waiting = True  # Hero's snapshot for this street not taken yet
+        self.states: List[GameState] = []
+
+    def deal(self, hero: str, hole_cards: List[Card]) -> bool:
+        """Start following hero; False if hero has no seat"""
+        if hero not in self.stacks:
+            return False
+        self.hero, self.hole_cards = hero, hole_cards
+        self.position = self._position()
+        return True
+
+    def act(self, player: str, action: str, amount: float, to: Optional[float]):
+        if player not in self.committed:
+            return
+        if player == self.hero and self.waiting and not action.startswith("posts"):
+            self.snapshot()
+        if action == "folds":
+            self.folded.add(player)
+        elif action == "posts the ante":
+            self.committed[player] += amount
+        elif action == "raises":
+            self._put(player, (to if to is not None else amount) - self.street_bets[player])
+        elif action != "checks":
+            self._put(player, amount)
+            if action in ("posts big blind", "posts small & big blinds"):
+                self.big_blind_player = player
+
+    def refund(self, player: str, amount: float):
+        if player in self.committed:
+            self.committed[player] -= amount
+            self.street_bets[player] -= amount
+
+    def next_street(self, stage: GameStage, board: List[Card]):
+        self.finish_street()
+        self.street, self.board = stage, board
+        self.street_bets = {player: 0.0 for player in self.street_bets}
+        self.waiting = True
+
+    def finish_street(self):
+        """Snapshot a street hero saw without a decision (e.g. already all-in)"""
+        if self.waiting and self.hero not in self.folded:
+            self.snapshot()
+
+    def snapshot(self):
+        self.waiting = False
+        players = sum(1 for player in self.committed if player not in self.folded)
+        if players < 2:
+            return
+        stacks = [self.stacks[player] - self.committed[player] for player in self.stacks]
+        hero = list(self.stacks).index(self.hero)
+        to_call = max(self.street_bets.values()) - self.street_bets[self.hero]
+        self.states.append(GameState(
+            table_size=TABLE_SIZES[min(players, len(TABLE_SIZES) + 1) - 2],
+            game_type=self.game_type,
+            stage=self.street,
+            player_cards=list(self.hole_cards),
+            board_cards=list(self.board),
+            stacks=[round(stack, 2) for stack in stacks[hero:] + stacks[:hero]],
+            big_blind=self.big_blind,
+            position=self.position,
+            pot=round(sum(self.committed.values()), 2),
+            to_call=round(max(0.0, min(to_call, stacks[hero])), 2),
+        ))
+
+    def _put(self, player: str, amount: float):
+        self.committed[player] += amount
+        self.street_bets[player] += amount
+
+    def _position(self) -> Optional[Position]:
+        """Hero's position from the big blind poster, else from the button seat"""
+        players = list(self.stacks)
+        big_blind = self.big_blind_player
+        if big_blind is None:
+            if self.button is None:
+                return None
+            after_button = ([p for p in players if self.seat_numbers[p] > self.button] +
+                            [p for p in players if self.seat_numbers[p] <= self.button])
+            big_blind = after_button[0 if len(players) == 2 else 1]
+        # Preflop action ends with the big blind
+        index = players.index(big_blind)
+        order = players[index + 1:] + players[:index + 1]
+        return Position[seat_name(len(order), len(order) - 1 - order.index(self.hero))]
+
+
+# ==================== Bulk import ====================
+
+def import_hand_histories(paths: Iterable[Path], output: Path, service, hero: Optional[str] = None,
+                          workers: int = 1, resume: bool = False,
+                          report_seconds: float = 5.0) -> Dict[str, any]:
+    """
+    Analyze every snapshot in the files with service.analyze_many, one JSON line each.
+
+    Progress (byte offset per file and output size) is checkpointed to
+    output + ".progress" every CHECKPOINT_HANDS hands; with resume=True the
+    output is cut back to the checkpoint and parsing continues from the
+    saved offsets, so an interrupted import neither loses nor repeats hands.
+    """
+    parser = HandHistoryParser(hero)
+    output = Path(output)
+    checkpoint_path = output.with_name(output.name + ".progress")
+    progress = {"offsets": {}, "output_bytes": 0, "hands": 0, "states": 0}
+    resume = resume and output.exists() and checkpoint_path.exists()
+    if resume:
+        progress = json.loads(checkpoint_path.read_text())
+
+    hands = deque()  # (file, hand) in file order whose results are not written yet
+
+    def states() -> Iterator[GameState]:
+        for path in paths:
+            key = str(Path(path).resolve())
+            for hand in parser.iter_hands(path, progress["offsets"].get(key, 0)):
+                hands.append((key, hand))
+                yield from hand.states
+
+    def settle():
+        """Hands without snapshots only move the resume point"""
+        while hands and not hands[0][1].states:
+            key, hand = hands.popleft()
+            progress["offsets"][key] = hand.end_offset
+
+    start = last_report = time.perf_counter()
+    hands_done = states_done = 0
+    with open(output, "r+b" if resume else "wb") as out:
+        out.truncate(progress["output_bytes"])
+        out.seek(0, os.SEEK_END)
+        results: List[Dict] = []
+        for result in service.analyze_many(states(), workers=workers):
+            settle()
+            results.append(result)
+            key, hand = hands[0]
+            if len(results) < len(hand.states):
+                continue
+            hands.popleft()
+
+            for state, result in zip(hand.states, results):
+                row = {
+                    "file": key, "hand_id": hand.hand_id, "stage": state.stage.value,
+                    "hero_cards": " ".join(str(card) for card in state.player_cards),
+                    "board": " ".join(str(card) for card in state.board_cards),
+                    "players": state.get_players_count(), "pot": state.pot, "to_call": state.to_call,
+                }
+                row.update({name: result[name] for name in SUMMARY_KEYS if name in result})
+                if "error" in result:
+                    row["error"] = result["error"]
+                out.write((json.dumps(row, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+            results = []
+            hands_done += 1
+            states_done += len(hand.states)
+            progress["offsets"][key] = hand.end_offset
+            progress["hands"] += 1
+            progress["states"] += len(hand.states)
+            if hands_done % CHECKPOINT_HANDS == 0:
+                _save_checkpoint(checkpoint_path, out, progress)
+
+            now = time.perf_counter()
+            if now - last_report >= report_seconds:
+                logger.info(f"Imported {hands_done} hands ({hands_done / (now - start):.1f} hands/s)")
+                last_report = now
+        settle()
+        _save_checkpoint(checkpoint_path, out, progress)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "hands": hands_done,
+        "states": states_done,
+        "elapsed": round(elapsed, 3),
+        "hands_per_second": round(hands_done / elapsed, 1) if elapsed > 0 else 0.0,
+        "total_hands": progress["hands"],
+    }
+    logger.info(f"Hand history import: {hands_done} hands, {states_done} snapshots in {elapsed:.1f}s "
+                f"({stats['hands_per_second']} hands/s)")
+    return stats
+
+
+def _save_checkpoint(path: Path, out, progress: Dict[str, any]):
+    """Flush the output, then atomically replace the checkpoint"""
+    out.flush()
+    progress["output_bytes"] = out.tell()
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(json.dumps(progress))
+    os.replace(temp, path)
+
+
+if __name__ == "__main__":
+    import argparse
+    from core.poker import EquityCalculator
+    from services.analysis_service import AnalysisService
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    arguments = argparse.ArgumentParser(description="Analyze hand history files in bulk")
+    arguments.add_argument("files", nargs="+", type=Path, help="hand history text files")
+    arguments.add_argument("-o", "--output", type=Path, required=True, help="JSON lines output file")
+    arguments.add_argument("--hero", help="hero's screen name (default: player dealt hole cards)")
+    arguments.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    arguments.add_argument("--resume", action="store_true", help="continue an interrupted import")
+    args = arguments.parse_args()
+
+    try:
+        from core.poker import CppMonteCarloBackend
+        backend = CppMonteCarloBackend()
+    except Exception as e:
+        logger.warning(f"C++ backend not available, equity disabled: {e}")
+        backend = None
+    analysis_service = AnalysisService(EquityCalculator(backend))
+    try:
+        import_hand_histories(args.files, args.output, analysis_service, hero=args.hero,
+                              workers=args.workers, resume=args.resume)
+    finally:
+        analysis_service.shutdown()
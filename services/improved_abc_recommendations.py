@@ -3,7 +3,7 @@
 С учетом: board texture, количества оппонентов, стадии улицы, позиционной игры
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from core.domain import Card, GameState, GameStage
 
 
@@ -32,11 +32,34 @@ class ImprovedRecommendationEngine:
         texture_analysis: Dict,
         num_opponents: int,
         stage: GameStage,
-        board_cards: List[Card]
+        board_cards: List[Card],
+        ev_analysis: Optional[Dict] = None
     ) -> str:
         """
         Главная функция генерации рекомендаций
+        
+        ev_analysis (результат EVCalculator) добавляет к совету рейтинг действий по EV.
         """
+        recommendation = self._recommend_by_category(
+            current_hand, win_rate, total_outs, outs_breakdown,
+            texture_analysis, num_opponents, stage, board_cards
+        )
+        if ev_analysis and ev_analysis.get("actions"):
+            recommendation += "\n" + self._add_ev_advice(ev_analysis)
+        return recommendation
+    
+    def _recommend_by_category(
+        self,
+        current_hand: str,
+        win_rate: float,
+        total_outs: int,
+        outs_breakdown: Dict[str, int],
+        texture_analysis: Dict,
+        num_opponents: int,
+        stage: GameStage,
+        board_cards: List[Card]
+    ) -> str:
+        """Рекомендация по категории руки и текстуре борда"""
         
         # Нормализация названия руки
         hand_type = self._normalize_hand_name(current_hand)
@@ -78,6 +101,10 @@ class ImprovedRecommendationEngine:
                 texture_analysis, num_opponents, stage
             )
     
+    def hand_category(self, current_hand: str) -> str:
+        """Категория руки (monster / strong / medium / weak_made / draw) по названию комбинации"""
+        return self._categorize_hand(self._normalize_hand_name(current_hand))
+    
     def _normalize_hand_name(self, hand_name: str) -> str:
         """Нормализация названий комбинаций"""
         hand_map = {
@@ -706,6 +733,28 @@ class ImprovedRecommendationEngine:
             f"🔴 **Если вы БЕЗ ПОЗИЦИИ** (UTG/MP/SB/BB):\n   {out_of_position}\n"
         )
     
+    def rank_actions(self, ev_analysis: Dict) -> List[Dict]:
+        """Действия по убыванию EV (fold / call / check / bet / raise / all_in)"""
+        return sorted(ev_analysis.get("actions", []), key=lambda action: action["ev"], reverse=True)
+    
+    def _add_ev_advice(self, ev_analysis: Dict, top: int = 3) -> str:
+        """Добавляет рейтинг действий по EV"""
+        names = {
+            'fold': 'Фолд', 'call': 'Колл', 'check': 'Чек',
+            'bet': 'Бет', 'raise': 'Рейз', 'all_in': 'Олл-ин'
+        }
+        advice = (
+            "┌─────────────────────────────────────┐\n"
+            "│ 💰 EV ДЕЙСТВИЙ (фишки):             │\n"
+            "└─────────────────────────────────────┘\n"
+            f"Эквити {ev_analysis['equity']:.1f}% | Шансы банка {ev_analysis['pot_odds']:.1f}%\n"
+        )
+        for place, action in enumerate(self.rank_actions(ev_analysis)[:top]):
+            marker = '🟢' if place == 0 else '▫️'
+            amount = f" {action['amount']:g}" if action['amount'] else ""
+            advice += f"{marker} {names.get(action['action'], action['action'])}{amount}: EV {action['ev']:+.1f}\n"
+        return advice.rstrip()
+    
     def _add_opponent_behavior_advice(self, **behaviors) -> str:
         """Добавляет советы по поведению оппонента"""
         advice = (
@@ -765,5 +814,6 @@ def generate_improved_recommendation(analysis_result: Dict) -> str:
         texture_analysis=texture_analysis,
         num_opponents=num_opponents,
         stage=stage,
-        board_cards=board_cards
+        board_cards=board_cards,
+        ev_analysis=analysis_result.get('ev_analysis')
     )
@@ -0,0 +1,228 @@
+"""Recommendation table - ImprovedRecommendationEngine compiled into a precomputed decision table"""
+from typing import Dict, List, Tuple, Optional
+from bisect import bisect_right
+from itertools import product
+import logging
+import re
+import threading
+import time
+from core.domain import Card, GameStage
+from services.improved_abc_recommendations import ImprovedRecommendationEngine
+
+logger = logging.getLogger(__name__)
+
+# Inputs the rules of each hand type branch on, in table index order:
+#   ("win_rate" | "total_outs" | "num_opponents", None, edges) - bucket of the value (value >= edge moves up)
+#   ("outs", key, edges) - bucket of outs_breakdown[key]
+#   ("texture", flag, None) - board texture flag
+#   ("stage", None, stages) - one of the listed stages or any other
+# Values only printed in the text (opponent count, outs, draw win rate)
+# are filled into the cell template on lookup.
+RULE_INPUTS = {
+    'straight_flush': [],
+    'four_kind': [],
+    'full_house': [("texture", "paired", None), ("num_opponents", None, (1, 2))],
+    'flush': [("texture", "monotone", None), ("win_rate", None, (55, 75)), ("num_opponents", None, (1, 2))],
+    'straight': [
+        ("texture", "coordinated", None), ("texture", "monotone", None), ("texture", "flush_draw", None),
+        ("win_rate", None, (70,)), ("num_opponents", None, (3,)),
+    ],
+    'three_kind': [
+        ("texture", "paired", None), ("texture", "monotone", None), ("texture", "coordinated", None),
+        ("total_outs", None, (7,)), ("win_rate", None, (45, 60)), ("num_opponents", None, (3,)),
+    ],
+    'two_pair': [
+        ("texture", "paired", None), ("texture", "monotone", None), ("texture", "coordinated", None),
+        ("total_outs", None, (4,)), ("win_rate", None, (50, 65)), ("stage", None, (GameStage.RIVER,)),
+    ],
+    'one_pair': [
+        ("texture", "monotone", None), ("texture", "flush_draw", None), ("texture", "coordinated", None),
+        ("texture", "paired", None), ("total_outs", None, (5,)), ("outs", "set_trips", (2,)),
+        ("outs", "two_pair", (3,)), ("win_rate", None, (40, 55, 70)), ("num_opponents", None, (2, 4)),
+        ("stage", None, (GameStage.FLOP, GameStage.TURN, GameStage.RIVER)),
+    ],
+    'draw': [
+        ("total_outs", None, (1, 4, 6, 9, 12, 15)), ("outs", "flush", (9,)), ("outs", "straight", (4, 8)),
+        ("outs", "set_trips", (2,)), ("outs", "overcard", (3,)), ("win_rate", None, (30, 45)),
+        ("num_opponents", None, (3,)), ("stage", None, (GameStage.FLOP, GameStage.TURN)),
+    ],
+}
+
+OUTS_KEYS = ('set_trips', 'two_pair', 'flush', 'straight', 'overcard')
+
+# Printed inputs are rendered as \x00field|spec\x01 while compiling
+_FIELD = re.compile("(\x00[^\x01]*\x01)")
+
+
+class _IntField(int):
+    """Integer input that renders as a template field while the table is compiled"""
+
+    def __new__(cls, value: int, field: str):
+        slot = super().__new__(cls, value)
+        slot.field = field
+        return slot
+
+    def __format__(self, spec: str) -> str:
+        return f"\x00{self.field}|{spec}\x01"
+
+    def __mul__(self, factor):
+        # Draw odds print min(total_outs * factor, 100)
+        return _IntField(int(self) * factor, f"{self.field}*{factor}")
+
+
+class _FloatField(float):
+    """Float input that renders as a template field while the table is compiled"""
+
+    def __new__(cls, value: float, field: str):
+        slot = super().__new__(cls, value)
+        slot.field = field
+        return slot
+
+    def __format__(self, spec: str) -> str:
+        return f"\x00{self.field}|{spec}\x01"
+
+
+class CompiledRecommendationEngine(ImprovedRecommendationEngine):
+    """
+    ImprovedRecommendationEngine with the rules compiled into a decision table.
+
+    For every hand type the inputs its rules branch on (RULE_INPUTS) are
+    discretized at the engine's own thresholds, and the base engine is run
+    once per cell of the resulting grid. A recommendation is then a
+    bucket lookup and a join of the cell's lines, with the opponent count,
+    outs and draw win rate the cell prints filled in; EV advice is still
+    appended per call. Equal cells and lines are stored once, and tables
+    are built once per process and shared by all instances.
+    """
+
+    _tables: Optional[Dict[str, Tuple[List[Tuple], List[Tuple]]]] = None
+    _tables_lock = threading.Lock()
+
+    def __init__(self):
+        cls = type(self)
+        with cls._tables_lock:
+            if cls._tables is None:
+                start = time.perf_counter()
+                cls._tables = {hand_type: self._compile(hand_type, inputs)
+                              for hand_type, inputs in RULE_INPUTS.items()}
+                logger.info(f"Compiled {self.table_size()} recommendation cells "
+                            f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        # Table of each hand name seen ("One Pair", "one pair")
+        self._tables_by_name: Dict[str, Tuple[List[Tuple], List[Tuple]]] = {}
+
+    def table_size(self) -> int:
+        """Number of precomputed cells over all hand types"""
+        return sum(len(cells) for _, cells in self._tables.values())
+
+    def _recommend_by_category(
+        self,
+        current_hand: str,
+        win_rate: float,
+        total_outs: int,
+        outs_breakdown: Dict[str, int],
+        texture_analysis: Dict,
+        num_opponents: int,
+        stage: GameStage,
+        board_cards: List[Card]
+    ) -> str:
+        """Recommendation from the decision table"""
+        table = self._tables_by_name.get(current_hand)
+        if table is None:
+            hand_type = self._normalize_hand_name(current_hand)
+            table = self._tables_by_name[current_hand] = self._tables.get(hand_type) or self._tables['draw']
+        inputs, cells = table
+
+        index = 0
+        for source, key, edges, size in inputs:
+            if source == "texture":
+                bucket = 1 if texture_analysis.get(key) else 0
+            elif source == "win_rate":
+                bucket = bisect_right(edges, win_rate)
+            elif source == "total_outs":
+                bucket = bisect_right(edges, total_outs)
+            elif source == "outs":
+                bucket = bisect_right(edges, outs_breakdown.get(key, 0))
+            elif source == "num_opponents":
+                bucket = bisect_right(edges, num_opponents)
+            else:
+                bucket = edges.index(stage) if stage in edges else size - 1
+            index = index * size + bucket
+
+        pieces, fields = cells[index]
+        if fields:
+            pieces = list(pieces)
+            for position, source, arg, spec in fields:
+                if source == "outs":
+                    value = outs_breakdown.get(arg, 0)
+                elif source == "total_outs":
+                    value = total_outs if arg is None else min(total_outs * arg, 100)
+                elif source == "win_rate":
+                    value = win_rate
+                else:
+                    value = num_opponents
+                pieces[position] = format(value, spec)
+        return "".join(pieces)
+
+    # ==================== Compilation ====================
+
+    def _compile(self, hand_type: str, rule_inputs: List[Tuple]) -> Tuple[List[Tuple], List[Tuple]]:
+        """Lookup inputs (source, key, edges, size) and the cells of one hand type in row-major order"""
+        inputs = [(source, key, edges, len(edges) + 1 if source != "texture" else 2)
+                  for source, key, edges in rule_inputs]
+        if hand_type == 'draw':
+            hand_type = 'high_card'
+
+        cells = []
+        lines: Dict[str, str] = {}
+        shared: Dict[Tuple, Tuple] = {}
+        for buckets in product(*(range(size) for *_, size in inputs)):
+            values = {"win_rate": 0.0, "total_outs": 0, "num_opponents": 1, "stage": GameStage.FLOP}
+            outs_breakdown = {key: 0 for key in OUTS_KEYS}
+            texture = {}
+            for (source, key, edges, size), bucket in zip(inputs, buckets):
+                if source == "texture":
+                    texture[key] = bool(bucket)
+                elif source == "stage":
+                    values["stage"] = (edges[bucket] if bucket < len(edges)
+                                       else next(stage for stage in GameStage if stage not in edges))
+                else:
+                    value = edges[bucket - 1] if bucket else edges[0] - 1
+                    if source == "outs":
+                        outs_breakdown[key] = value
+                    else:
+                        values[source] = value
+
+            text = super()._recommend_by_category(
+                hand_type,
+                _FloatField(values["win_rate"], "win_rate"),
+                _IntField(values["total_outs"], "total_outs"),
+                {key: _IntField(value, f"outs:{key}") for key, value in outs_breakdown.items()},
+                texture,
+                _IntField(values["num_opponents"], "num_opponents"),
+                values["stage"],
+                []
+            )
+            cell = _cell(text, lines)
+            cells.append(shared.setdefault(cell, cell))
+        return inputs, cells
+
+
+def _cell(text: str, lines: Dict[str, str]) -> Tuple[Tuple[str, ...], Tuple[Tuple, ...]]:
+    """
+    Cell text split into lines, shared between cells through lines, and
+    the printed inputs as (position, source, arg, format spec)
+    """
+    pieces, fields = [], []
+    for part in _FIELD.split(text):
+        if part.startswith("\x00"):
+            name, _, spec = part[1:-1].partition("|")
+            if name.startswith("outs:"):
+                source, arg = "outs", name[len("outs:"):]
+            else:
+                source, _, multiplier = name.partition("*")
+                arg = int(multiplier) if multiplier else None
+            fields.append((len(pieces), source, arg, spec))
+            pieces.append("")
+        else:
+            pieces.extend(lines.setdefault(line, line) for line in part.splitlines(keepends=True))
+    return tuple(pieces), tuple(fields)
@@ -0,0 +1,240 @@
+"""Result store - Append-only columnar storage of analysis outputs with indexed queries"""
+from typing import Dict, List, Optional, Union, Iterable
+from pathlib import Path
+import logging
+import os
+import shutil
+import numpy as np
+from core.domain import GameState, GameStage
+from core.poker import BoardTextureIndex
+from core.poker.fast_evaluator import cards_to_indices
+from core.poker.holding_equity import HAND_CLASS_NAMES, NUM_HAND_CLASSES, hand_class_indices
+from services.improved_abc_recommendations import ImprovedRecommendationEngine
+
+logger = logging.getLogger(__name__)
+
+# Column name -> dtype; -1 marks "not applicable" (preflop board, outs, category)
+COLUMNS = {
+    "hand_key": np.int16,        # Hand class index into HAND_CLASS_NAMES ("AKs")
+    "board_id": np.int16,        # Canonical flop id (turn and river grouped by flop)
+    "texture_bucket": np.int8,   # BoardTextureIndex bucket of the flop
+    "stage": np.int8,            # Index into STAGES
+    "equity": np.float32,        # Hero equity in percent (win + tie / 2)
+    "outs": np.int8,
+    "recommendation": np.int8,   # Index into RECOMMENDATION_CATEGORIES
+}
+
+STAGES = [GameStage.PREFLOP, GameStage.FLOP, GameStage.TURN, GameStage.RIVER]
+RECOMMENDATION_CATEGORIES = ["monster", "strong", "medium", "weak_made", "draw"]
+
+# Indexed columns and their number of values (-1 is kept in the last slot)
+INDEXES = {"hand_key": NUM_HAND_CLASSES, "texture_bucket": BoardTextureIndex.DEFAULT_BUCKETS}
+
+TextureQuery = Union[int, str]
+
+
+class AnalysisResultStore:
+    """
+    Append-only columnar store of analysis outputs.
+
+    Rows are buffered and written as chunk directories of one .npy file
+    per column, memory-mapped on read, so a store grows to millions of
+    hands with a few bytes per row. Each chunk also stores a CSR index
+    (row order plus offsets) on hand key and texture bucket, so queries by
+    either read only the matching rows. Chunks are written to a temporary
+    directory and renamed, so a crash never leaves a partial chunk.
+    """
+
+    CHUNK_ROWS = 65536
+
+    def __init__(self, path: Path, texture_index: Optional[BoardTextureIndex] = None):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._texture_index = texture_index
+        self._recommendation_engine = ImprovedRecommendationEngine()
+        self._buffer: Dict[str, List] = {name: [] for name in COLUMNS}
+        # Unfinished writes from an interrupted flush
+        for temp in self.path.glob(".chunk_*"):
+            shutil.rmtree(temp, ignore_errors=True)
+        self._chunks = [self._load_chunk(chunk_dir) for chunk_dir in sorted(self.path.glob("chunk_*"))]
+
+    def __len__(self) -> int:
+        return sum(len(chunk["hand_key"]) for chunk in self._chunks) + len(self._buffer["hand_key"])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    @property
+    def texture_index(self) -> BoardTextureIndex:
+        if self._texture_index is None:
+            self._texture_index = BoardTextureIndex()
+        return self._texture_index
+
+    # ==================== Writing ====================
+
+    def append(self, game_state: GameState, result: Dict[str, any]):
+        """Buffer one analysis result; results with an error are skipped"""
+        if "error" in result or result.get("cancelled") or len(game_state.player_cards) != 2:
+            return
+        row = self._row(game_state, result)
+        for name, value in row.items():
+            self._buffer[name].append(value)
+        if len(self._buffer["hand_key"]) >= self.CHUNK_ROWS:
+            self.flush()
+
+    def extend(self, states: Iterable[GameState], results: Iterable[Dict[str, any]]):
+        """Append results paired with their states (e.g. analyze_many output)"""
+        for game_state, result in zip(states, results):
+            self.append(game_state, result)
+
+    def append_columns(self, columns: Dict[str, np.ndarray]):
+        """Write already encoded rows (one array per column in COLUMNS) as chunks"""
+        self.flush()
+        rows = len(columns["hand_key"])
+        for start in range(0, rows, self.CHUNK_ROWS):
+            self._write_chunk({name: np.asarray(columns[name][start:start + self.CHUNK_ROWS], dtype=dtype)
+                               for name, dtype in COLUMNS.items()})
+
+    def flush(self):
+        """Write buffered rows as a new chunk"""
+        if not self._buffer["hand_key"]:
+            return
+        self._write_chunk({name: np.asarray(values, dtype=COLUMNS[name]) for name, values in self._buffer.items()})
+        self._buffer = {name: [] for name in COLUMNS}
+
+    def _write_chunk(self, columns: Dict[str, np.ndarray]):
+        number = len(self._chunks)
+        final = self.path / f"chunk_{number:06d}"
+        temp = self.path / f".chunk_{number:06d}"
+        temp.mkdir()
+        for name, values in columns.items():
+            np.save(temp / f"{name}.npy", values)
+        for name, size in INDEXES.items():
+            order, starts = _csr_index(columns[name], size)
+            np.save(temp / f"{name}.order.npy", order)
+            np.save(temp / f"{name}.starts.npy", starts)
+        os.replace(temp, final)
+        self._chunks.append(self._load_chunk(final))
+        logger.debug(f"Result store: wrote {len(columns['hand_key'])} rows to {final.name}")
+
+    def _row(self, game_state: GameState, result: Dict[str, any]) -> Dict[str, any]:
+        """Column values of one analysis result"""
+        hand_key = int(hand_class_indices([cards_to_indices(game_state.player_cards)])[0])
+        board_id = texture_bucket = -1
+        if len(game_state.board_cards) >= 3:
+            board_id = self.texture_index.table.flop_id(game_state.board_cards[:3])
+            texture_bucket = int(self.texture_index.bucket_ids[board_id])
+
+        equity = result.get("equity", {})
+        if "win_rate" in equity:
+            equity = equity["win_rate"] + equity.get("tie_rate", 0) / 2
+        else:
+            equity = result.get("equity_vs_random", np.nan)
+
+        current_hand = result.get("current_hand")
+        category = (RECOMMENDATION_CATEGORIES.index(self._recommendation_engine.hand_category(current_hand))
+                    if current_hand else -1)
+        return {
+            "hand_key": hand_key,
+            "board_id": board_id,
+            "texture_bucket": texture_bucket,
+            "stage": STAGES.index(game_state.stage),
+            "equity": equity,
+            "outs": result.get("total_outs", -1),
+            "recommendation": category,
+        }
+
+    # ==================== Reading ====================
+
+    def columns(self, hand_key: Optional[str] = None,
+                texture: Optional[TextureQuery] = None) -> Dict[str, np.ndarray]:
+        """
+        Column arrays of the stored rows, optionally filtered.
+
+        hand_key is a hand class ("AKs", "QQ"); texture is a texture bucket
+        id or a BoardTextureIndex family name ("paired low rainbow").
+        Buffered rows are flushed first.
+        """
+        self.flush()
+        parts = {name: [] for name in COLUMNS}
+        hand_class = _hand_class(hand_key) if hand_key is not None else None
+        buckets = self._texture_buckets(texture) if texture is not None else None
+        families = (self.texture_index.flops_in_family(texture)
+                    if isinstance(texture, str) else None)
+
+        for chunk in self._chunks:
+            rows = None
+            if hand_class is not None:
+                rows = _csr_rows(chunk, "hand_key", [hand_class])
+            if buckets is not None:
+                texture_rows = _csr_rows(chunk, "texture_bucket", buckets)
+                rows = texture_rows if rows is None else np.intersect1d(rows, texture_rows)
+            if families is not None:
+                rows = rows[np.isin(chunk["board_id"][rows], families)]
+            for name in COLUMNS:
+                parts[name].append(chunk[name] if rows is None else chunk[name][rows])
+
+        return {name: (np.concatenate(values) if values else np.empty(0, dtype=COLUMNS[name]))
+                for name, values in parts.items()}
+
+    def to_frame(self, hand_key: Optional[str] = None, texture: Optional[TextureQuery] = None):
+        """Stored rows as a pandas DataFrame with readable hand, stage and recommendation columns"""
+        import pandas as pd
+
+        columns = self.columns(hand_key, texture)
+        frame = pd.DataFrame(columns)
+        frame["hand"] = pd.Categorical.from_codes(columns["hand_key"], HAND_CLASS_NAMES)
+        frame["street"] = pd.Categorical.from_codes(columns["stage"], [stage.value for stage in STAGES])
+        frame["category"] = pd.Categorical.from_codes(columns["recommendation"], RECOMMENDATION_CATEGORIES)
+        family_ids = np.where(columns["board_id"] >= 0,
+                              self.texture_index.family_ids[np.maximum(columns["board_id"], 0)], -1)
+        frame["family"] = pd.Categorical.from_codes(family_ids, self.texture_index.family_names)
+        return frame
+
+    def mean_equity_by(self, by: Union[str, List[str]] = "texture_bucket",
+                       hand_key: Optional[str] = None, texture: Optional[TextureQuery] = None):
+        """Mean equity and row count per group (e.g. "texture_bucket", "family", "hand", "street")"""
+        frame = self.to_frame(hand_key, texture)
+        return frame.groupby(by, observed=True)["equity"].agg(["mean", "count"])
+
+    # ==================== Internals ====================
+
+    def _texture_buckets(self, texture: TextureQuery) -> List[int]:
+        """Buckets to read for a bucket id or family name"""
+        if isinstance(texture, str):
+            flops = self.texture_index.flops_in_family(texture)
+            return sorted(set(self.texture_index.buckets_for(flops).tolist()))
+        return [int(texture)]
+
+    @staticmethod
+    def _load_chunk(chunk_dir: Path) -> Dict[str, np.ndarray]:
+        chunk = {name: np.load(chunk_dir / f"{name}.npy", mmap_mode='r') for name in COLUMNS}
+        for name in INDEXES:
+            chunk[f"{name}.order"] = np.load(chunk_dir / f"{name}.order.npy", mmap_mode='r')
+            chunk[f"{name}.starts"] = np.load(chunk_dir / f"{name}.starts.npy")
+        return chunk
+
+
+def _hand_class(hand_key: str) -> int:
+    """Chart index of a hand class name"""
+    if hand_key not in HAND_CLASS_NAMES:
+        raise ValueError(f"Unknown hand class: {hand_key}")
+    return HAND_CLASS_NAMES.index(hand_key)
+
+
+def _csr_index(values: np.ndarray, size: int):
+    """Rows sorted by value and the start offset of every value (-1 stored last)"""
+    keys = np.where(values < 0, size, values).astype(np.int64)
+    order = np.argsort(keys, kind='stable').astype(np.int32)
+    starts = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=size + 1))]).astype(np.int64)
+    return order, starts
+
+
+def _csr_rows(chunk: Dict[str, np.ndarray], name: str, values: List[int]) -> np.ndarray:
+    """Sorted row numbers of a chunk whose indexed column has one of the values"""
+    order, starts = chunk[f"{name}.order"], chunk[f"{name}.starts"]
+    rows = [order[starts[value]:starts[value + 1]] for value in values if 0 <= value < len(starts) - 1]
+    return np.sort(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int32)
@@ -0,0 +1,201 @@
+"""
+Test script for the headless analysis server
+Run: python test_analysis_server.py
+"""
+import sys
+import logging
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = Path(__file__).parent
+
+
+def test_headless_startup():
+    """The stdio server is ready well under a second and imports no Qt or torch"""
+    import json
+    import subprocess
+    import time
+
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, str(PROJECT_DIR / "main_headless.py"), "--no-ml"],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True)
+    try:
+        ready = json.loads(process.stdout.readline())
+        startup = time.perf_counter() - start
+        assert ready == {"id": None, "result": {"ready": True}}
+        assert startup < 1.0, startup
+
+        process.stdin.write('{"id": 1, "method": "ping"}\n{"id": 2, "method": "shutdown"}\n')
+        process.stdin.flush()
+        replies = {reply["id"]: reply for reply in map(json.loads, process.stdout)}
+        assert "uptime" in replies[1]["result"] and replies[2]["result"] is True
+        assert process.wait(timeout=10) == 0
+    finally:
+        process.kill()
+
+    modules = subprocess.run(
+        [sys.executable, "-c", "import sys, main_headless, services.analysis_server; "
+                               "print([m for m in sys.modules if m.split('.')[0] in ('PySide6', 'torch')])"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    assert modules == "[]", modules
+    logger.info(f"✅ Headless server ready in {startup * 1000:.0f} ms")
+
+
+def test_concurrent_requests():
+    """Requests on one connection run concurrently and are matched by id"""
+    import json
+    import socket
+    import time
+    from services.analysis_server import AnalysisServer
+    from test_analysis_service import SPOTS, _service
+
+    server = AnalysisServer(_service)
+    tcp = server.serve_tcp()
+    try:
+        with socket.create_connection(tcp.server_address) as connection:
+            requests = [{"id": i, "method": "analyze_hand",
+                         "params": {"player_cards": hole, "board_cards": board, "table_size": "3max",
+                                    "fields": ["current_hand", "board_cards_list", "equity"]}}
+                        for i, (hole, board) in enumerate(SPOTS)]
+            requests.append({"id": "progress", "method": "analyze_hand",
+                             "params": {"player_cards": ["Ah", "Qh"], "board_cards": ["Kh", "7h", "2c"],
+                                        "table_size": "heads_up", "progress": True}})
+            requests.append({"id": "stale", "method": "analyze_hand",
+                             "params": {"player_cards": "Tc Jc", "board_cards": "Qd 9h 2s 3c"}})
+            requests.append({"id": "cancel", "method": "cancel", "params": {"id": "stale"}})
+            requests.append({"id": "bad", "method": "solve_game"})
+            requests.append({"id": "short board", "method": "analyze_hand",
+                             "params": {"player_cards": "Ah Kd", "board_cards": "Qh 7h"}})
+            start = time.perf_counter()
+            connection.sendall("".join(json.dumps(r) + "\n" for r in requests).encode() + b"{oops\n")
+
+            replies, progress = {}, []
+            reader = connection.makefile("r", encoding="utf-8")
+            while len(replies) < len(requests) + 1:
+                message = json.loads(reader.readline())
+                if "progress" in message:
+                    assert message["id"] == "progress" and message["id"] not in replies
+                    progress.append(message["progress"])
+                else:
+                    replies[message["id"]] = message
+            elapsed = time.perf_counter() - start
+
+        reference = _service()
+        try:
+            from test_analysis_service import _state
+            for i, spot in enumerate(SPOTS):
+                result = replies[i]["result"]
+                expected = reference.analyze_hand(_state(*spot))
+                assert set(result) == {"current_hand", "board_cards_list", "equity"}
+                assert result["current_hand"] == expected["current_hand"]
+                assert result["board_cards_list"] == [str(card) for card in expected["board_cards_list"]]
+                assert abs(result["equity"]["win_rate"] - expected["equity"]["win_rate"]) < 2
+        finally:
+            reference.shutdown()
+
+        assert progress[0] in ("equity_estimate", "hand") and progress[-1] == "recommendation", progress
+        assert "strategy_recommendation" in replies["progress"]["result"]
+        assert replies["stale"]["result"] == {"cancelled": True}
+        assert replies["cancel"]["result"] is True
+        assert replies["bad"]["error"] == "Unknown method: solve_game"
+        assert replies["short board"]["error"] == "Board must have 0, 3, 4 or 5 cards, got 2"
+        assert replies[None]["error"].startswith("Invalid request")
+        logger.info(f"✅ {len(requests)} concurrent requests answered in {elapsed * 1000:.0f} ms")
+    finally:
+        tcp.shutdown()
+        server.shutdown()
+
+
+def test_request_ids():
+    """Ids are scoped to their connection; missing and duplicate in-flight ids are rejected"""
+    import json
+    import socket
+    from services.analysis_server import AnalysisServer
+    from test_analysis_service import _service
+
+    def analyze(request_id, board):
+        return json.dumps({"id": request_id, "method": "analyze_hand",
+                           "params": {"player_cards": "Ah Qd", "board_cards": board,
+                                      "fields": ["board_cards_list"]}}) + "\n"
+
+    def read(reader, count):
+        replies = []
+        while len(replies) < count:
+            message = json.loads(reader.readline())
+            if "progress" not in message:
+                replies.append(message)
+        return replies
+
+    server = AnalysisServer(_service)
+    tcp = server.serve_tcp()
+    try:
+        with socket.create_connection(tcp.server_address) as first, \
+                socket.create_connection(tcp.server_address) as second:
+            first_reader = first.makefile("r", encoding="utf-8")
+            second_reader = second.makefile("r", encoding="utf-8")
+            # The same id in flight twice on one connection, once on another
+            first.sendall((analyze(1, "Kh 7h 2c") + analyze(1, "Kh 7h 2c Ts")
+                           + '{"method": "ping"}\n').encode())
+            second.sendall((analyze(1, "Jc 8d 3s") + '{"id": 2, "method": "cancel", "params": {"id": 7}}\n')
+                           .encode())
+            first_replies = read(first_reader, 3)
+            second_replies = read(second_reader, 2)
+
+        assert {"id": 1, "error": "Duplicate request id: 1"} in first_replies, first_replies
+        assert {"id": None, "error": "Invalid request: Request id is required"} in first_replies
+        results = [reply["result"] for reply in first_replies + second_replies
+                   if reply["id"] == 1 and "result" in reply]
+        assert sorted(result["board_cards_list"] for result in results) == [["Jc", "8d", "3s"], ["Kh", "7h", "2c"]]
+        assert {"id": 2, "result": False} in second_replies
+
+        # A cancel only reaches its own connection's request with that id
+        with socket.create_connection(tcp.server_address) as first, \
+                socket.create_connection(tcp.server_address) as second:
+            first.sendall(analyze(5, "Qc 9d 4s").encode())
+            second.sendall(b'{"id": 6, "method": "cancel", "params": {"id": 5}}\n')
+            assert read(second.makefile("r", encoding="utf-8"), 1) == [{"id": 6, "result": False}]
+            reply = read(first.makefile("r", encoding="utf-8"), 1)[0]
+            assert reply["result"]["board_cards_list"] == ["Qc", "9d", "4s"], reply
+        logger.info("✅ Request ids are scoped to their connection")
+    finally:
+        tcp.shutdown()
+        server.shutdown()
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "Headless startup": test_headless_startup,
+        "Concurrent requests": test_concurrent_requests,
+        "Request ids": test_request_ids,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    sys.path.insert(0, str(PROJECT_DIR))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
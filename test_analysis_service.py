@@ -0,0 +1,394 @@
+"""
+Test script for the analysis service pipeline
+Run: python test_analysis_service.py
+"""
+import sys
+import logging
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SPOTS = [
+    ("Ah Qh", "Kh 7h 2c"),
+    ("9s 9d", "9c 4h 4d Js"),
+    ("Tc Jc", "Qd 9h 2s"),
+    ("As Kd", "2h 3h 8c 8d Qs"),
+]
+
+
+def _service():
+    """Service on the vectorized range engine (no native executable needed)"""
+    from core.poker import EquityCalculator
+    from services.analysis_service import AnalysisService
+
+    return AnalysisService(EquityCalculator(_vectorized_backend()))
+
+
+def _vectorized_backend():
+    """Backend on the vectorized range engine; module-level so worker processes can build it"""
+    from core.poker import MonteCarloBackend
+    from core.poker.range_equity import RangeEquityCalculator
+
+    class VectorizedBackend(MonteCarloBackend):
+        def __init__(self):
+            self.engine = RangeEquityCalculator()
+            self.calls = 0
+
+        def calculate_equity(self, hole_cards, board_cards, num_opponents, iterations):
+            self.calls += 1
+            return self.engine.calculate(hole_cards, board_cards, ["random"] * num_opponents, iterations)
+
+    return VectorizedBackend()
+
+
+def _state(hole: str, board: str):
+    from core.domain import Card, GameState, GameStage, GameType, TableSize
+    board_cards = [Card.parse(c) for c in board.split()]
+    stage = {3: GameStage.FLOP, 4: GameStage.TURN, 5: GameStage.RIVER}[len(board_cards)]
+    return GameState(TableSize.THREE_MAX, GameType.CASH, stage,
+                     [Card.parse(c) for c in hole.split()], board_cards)
+
+
+def test_pipeline_timings_and_results():
+    """Concurrent stages report timings; concurrent requests give the same results as sequential ones"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    service = _service()
+    try:
+        sequential = [service.analyze_hand(_state(*spot)) for spot in SPOTS]
+        for result in sequential:
+            timings = result["timings"]
+            for stage in ("estimate", "hand", "outs", "texture", "strength", "equity", "holdings", "recommendation"):
+                assert stage in timings, (stage, timings)
+            assert timings["total"] >= max(v for k, v in timings.items() if k != "total") - 1.0
+            assert "win_rate" in result["equity"]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            concurrent = list(pool.map(lambda spot: service.analyze_hand(_state(*spot)), SPOTS * 2))
+        for before, after in zip(sequential * 2, concurrent):
+            for key in ("current_hand", "hand_strength_numeric", "outs_analysis", "board_texture"):
+                assert before[key] == after[key], key
+            assert before["holding_equity"]["equity"] == after["holding_equity"]["equity"]
+        logger.info(f"✅ Pipeline timings (ms): {sequential[0]['timings']}")
+    finally:
+        service.shutdown()
+
+    # With the simulation and the holding grid each held for a known time,
+    # the total is clearly below the sum of the stages
+    import time
+    from core.poker import EquityCalculator, MonteCarloBackend
+    from services.analysis_service import AnalysisService
+
+    delay = 0.2
+
+    class SleepingBackend(MonteCarloBackend):
+        honours_iterations = False
+
+        def calculate_equity(self, hole_cards, board_cards, num_opponents, iterations):
+            time.sleep(delay)
+            return {"win_rate": 50.0, "tie_rate": 0.0, "lose_rate": 50.0, "simulations_completed": iterations}
+
+    service = AnalysisService(EquityCalculator(SleepingBackend()))
+    holding_analysis = service._holding_analysis
+
+    def slow_holding_analysis(game_state):
+        time.sleep(delay)
+        return holding_analysis(game_state)
+
+    service._holding_analysis = slow_holding_analysis
+    try:
+        timings = service.analyze_hand(_state(*SPOTS[0]))["timings"]
+        stage_sum = sum(v for k, v in timings.items() if k != "total")
+        assert timings["equity"] >= delay * 1000 and timings["holdings"] >= delay * 1000, timings
+        assert timings["total"] < stage_sum - delay * 1000 / 2, timings
+        logger.info(f"✅ Total {timings['total']:.0f} ms against {stage_sum:.0f} ms of stages")
+    finally:
+        service.shutdown()
+
+
+def test_progressive_results():
+    """Hand, outs and texture arrive before the simulation; equity is refined with a shrinking CI"""
+    import time
+
+    service = _service()
+    backend = service.equity_calculator.backend
+    try:
+        service.analyze_hand(_state(*SPOTS[0]))
+        simulations = backend.calls
+        events = []
+        start = time.perf_counter()
+        result = service.analyze_hand(
+            _state(*SPOTS[2]),
+            progress=lambda stage, fields: events.append((stage, fields, time.perf_counter(), backend.calls))
+        )
+        stages = [stage for stage, *_ in events]
+        assert stages.index("hand") < stages.index("equity") < stages.index("recommendation"), stages
+        assert stages[-1] == "recommendation"
+
+        # Hand, outs and texture are reported before the first simulation chunk
+        for stage in ("hand", "outs", "texture"):
+            assert events[stages.index(stage)][3] == simulations, stage
+        first_ms = (events[stages.index("hand")][2] - start) * 1000
+
+        chunks = [fields["equity"] for stage, fields, *_ in events if stage == "equity"]
+        assert len(chunks) > 1
+        assert all(a["ci"] > b["ci"] for a, b in zip(chunks, chunks[1:]))
+        assert chunks[-1]["simulations_completed"] == service.SIMULATION_ITERATIONS
+        assert chunks[-1] == result["equity"]
+        for stage, fields, *_ in events:
+            for key, value in fields.items():
+                if stage != "equity":
+                    assert result[key] == value, key
+
+        # A backend that ignores the iteration count is called once for the whole budget
+        backend.honours_iterations = False
+        calls = backend.calls
+        events.clear()
+        service.analyze_hand(_state(*SPOTS[1]), progress=lambda stage, fields: events.append((stage, fields)))
+        assert backend.calls == calls + 1
+        assert [stage for stage, _ in events].count("equity") == 1
+        logger.info(f"✅ First partial result after {first_ms:.1f} ms, "
+                    f"equity CI {[c['ci'] for c in chunks]}")
+    finally:
+        service.shutdown()
+
+
+def test_incremental_reanalysis():
+    """Only stages whose inputs changed rerun; carried-forward results match a fresh analysis"""
+    from dataclasses import replace
+    from core.domain import Card, GameStage, TableSize
+
+    service = _service()
+    fresh = _service()
+    try:
+        flop = _state("Ah Qh", "Kh 7h 2c")
+        service.analyze_hand(flop)
+
+        fewer_opponents = replace(flop, table_size=TableSize.HEADS_UP)
+        result = service.analyze_hand(fewer_opponents)
+        assert set(result["reused_stages"]) == {"hand", "outs", "texture", "holdings"}, result["reused_stages"]
+        assert "equity" in result["timings"] and "holdings" not in result["timings"]
+
+        turn = replace(fewer_opponents, stage=GameStage.TURN, board_cards=flop.board_cards + [Card.parse("Ts")])
+        river = replace(turn, stage=GameStage.RIVER, board_cards=turn.board_cards + [Card.parse("3h")])
+        for state in (turn, river):
+            result = service.analyze_hand(state)
+            expected = fresh.analyze_hand(state)
+            assert result["reused_stages"] == []
+            for key in ("current_hand", "hand_strength_numeric", "outs_analysis", "board_texture"):
+                assert result[key] == expected[key], key
+            assert sorted(result["best_5_cards"]) == sorted(expected["best_5_cards"])
+
+        service.clear_cache()
+        repeat = service.analyze_hand(river)
+        assert set(repeat["reused_stages"]) == set(service._stage_inputs(river))
+        assert repeat["equity"] == result["equity"]
+        logger.info(f"✅ Incremental re-analysis: {repeat['timings']['total']} ms when nothing changed")
+    finally:
+        service.shutdown()
+        fresh.shutdown()
+
+
+def test_result_cache():
+    """Suit-permuted, reordered repeats are served from the LRU cache with suits renamed"""
+    import copy
+
+    service = _service()
+    fresh = _service()
+    backend = service.equity_calculator.backend
+    try:
+        service.RESULT_CACHE_SIZE = service._cache_max_size = 2
+        original = service.analyze_hand(_state("Ah Qh", "Kh 7h 2c"))
+        snapshot = copy.deepcopy(original)
+        simulations = backend.calls
+        # Hearts -> spades, clubs -> diamonds, cards in a different order
+        events = []
+        permuted = service.analyze_hand(_state("Qs As", "2d Ks 7s"),
+                                        progress=lambda stage, fields: events.append((stage, fields)))
+        assert permuted["cached"] and "cached" not in original
+        assert backend.calls == simulations
+        assert permuted["equity"] == original["equity"]
+        assert permuted["current_hand"] == original["current_hand"]
+        swap = {"h": "s", "c": "d", "s": "h", "d": "c"}
+        assert sorted(str(c) for c in permuted["best_5_cards"]) == sorted(
+            str(c)[0] + swap[str(c)[1]] for c in original["best_5_cards"])
+        expected = fresh.analyze_hand(_state("Qs As", "2d Ks 7s"))
+        assert set(permuted["holding_equity"]["holdings"]) == set(expected["holding_equity"]["holdings"])
+        assert permuted["board_texture"] == expected["board_texture"]
+        assert [str(c) for c in permuted["board_cards_list"]] == ["2d", "Ks", "7s"]
+        # Hits report their final fields as progress
+        assert events[-1][0] == "recommendation" and "hand" in dict(events)
+        for stage, fields in events:
+            assert all(permuted[key] == value for key, value in fields.items()), stage
+
+        # Results are copies: changing one does not reach the cache or later hits
+        flop_id = original["board_texture"]["flop_id"]
+        original["board_texture"]["flop_id"] = -999
+        permuted["equity"]["win_rate"] = -1.0
+        repeat = service.analyze_hand(_state("Ah Qh", "Kh 7h 2c"))
+        assert repeat["cached"] and repeat["board_texture"]["flop_id"] == flop_id
+        repeat["holding_equity"]["holdings"].clear()
+        again = service.analyze_hand(_state("Ah Qh", "Kh 7h 2c"))
+        assert again["equity"] == snapshot["equity"] and again["holding_equity"] == snapshot["holding_equity"]
+        assert backend.calls == simulations
+
+        for spot in SPOTS[1:3]:
+            service.analyze_hand(_state(*spot))
+        stats = service.get_cache_stats()
+        assert stats["hits"] == 3 and stats["misses"] == 3, stats
+        assert stats["evictions"] == 1 and stats["cache_size"] == 2, stats
+        assert "cached" not in service.analyze_hand(_state("Ah Qh", "Kh 7h 2c"))
+
+        # The flop is a set, but which cards are the flop, turn and river matters
+        turn = service.analyze_hand(_state("Ah Qd", "Kh 7h 2c Ts"))
+        moved = service.analyze_hand(_state("Ah Qd", "Ts 7h 2c Kh"))
+        assert "cached" not in moved
+        assert moved["board_texture"] == fresh.analyze_hand(_state("Ah Qd", "Ts 7h 2c Kh"))["board_texture"]
+        assert moved["board_texture"]["flop_id"] != turn["board_texture"]["flop_id"]
+        reordered = service.analyze_hand(_state("Ah Qd", "2c Kh 7h Ts"))
+        assert reordered["cached"] and reordered["board_texture"] == turn["board_texture"]
+        assert [str(c) for c in reordered["board_cards_list"]] == ["2c", "Kh", "7h", "Ts"]
+        logger.info(f"✅ Result cache: {service.get_cache_stats()}, hit in {permuted['timings']['total']} ms")
+    finally:
+        service.shutdown()
+        fresh.shutdown()
+
+
+def test_cached_progress_without_equity():
+    """Without a simulation backend a cache hit reports the same progress events as the miss did"""
+    from core.poker import EquityCalculator
+    from services.analysis_service import AnalysisService
+
+    service = AnalysisService(EquityCalculator(None))
+    try:
+        sequences = []
+        for _ in range(2):
+            events = []
+            result = service.analyze_hand(_state(*SPOTS[0]),
+                                          progress=lambda stage, fields: events.append((stage, fields)))
+            sequences.append(events)
+        assert result["cached"] and "error" in result["equity"]
+        miss, hit = ([stage for stage, _ in events] for events in sequences)
+        assert miss == hit and "equity" not in hit, (miss, hit)
+        assert [fields for _, fields in sequences[0]] == [fields for _, fields in sequences[1]]
+        logger.info(f"✅ Cached progress without equity: {hit}")
+    finally:
+        service.shutdown()
+
+
+def test_batch_analysis():
+    """analyze_many yields in input order across processes, analyzing duplicate situations once"""
+    service = _service()
+    try:
+        states = [_state(*spot) for spot in SPOTS]
+        # Same situations with hearts and spades swapped, plus exact repeats
+        swapped = [_state(*(" ".join(c.translate(str.maketrans("hs", "sh")) for c in text.split())
+                            for text in spot)) for spot in SPOTS]
+        batch = states + swapped + states
+
+        results = list(service.analyze_many(iter(batch), workers=2, backend_factory=_vectorized_backend,
+                                            chunk_size=2))
+        assert len(results) == len(batch)
+        expected = [service.analyze_hand(state) for state in batch]
+        for state, result, reference in zip(batch, results, expected):
+            assert sorted(map(str, result["best_5_cards"])) == sorted(map(str, reference["best_5_cards"]))
+            for key in ("current_hand", "outs_analysis", "board_texture", "board_cards_list"):
+                assert result[key] == reference[key], key
+            assert result["holding_equity"]["holdings"] == reference["holding_equity"]["holdings"]
+
+        stats = service.get_batch_stats()
+        assert stats["states"] == len(batch) and stats["analyzed"] == len(SPOTS), stats
+        assert stats["duplicates"] == len(batch) - len(SPOTS), stats
+        assert stats["states_per_second"] > 0
+
+        inline = list(service.analyze_many(states + [_state("Ah", "Kh 7h 2c")]))
+        assert [r["current_hand"] for r in inline[:-1]] == [r["current_hand"] for r in results[:len(SPOTS)]]
+        assert inline[-1] == {"error": "Need exactly 2 player cards"}
+        logger.info(f"✅ Batch analysis: {stats}")
+    finally:
+        service.shutdown()
+
+
+def test_cancelled_analysis():
+    """A stale request drops its stages; the next one still completes"""
+    import time
+
+    service = _service()
+    backend = service.equity_calculator.backend
+    try:
+        assert service.analyze_hand(_state(*SPOTS[0]), cancelled=lambda: True) == {"cancelled": True}
+        assert backend.calls == 0
+
+        # Stale once the first simulation chunk has run: no further chunks are simulated
+        start = time.perf_counter()
+        result = service.analyze_hand(_state(*SPOTS[1]), cancelled=lambda: backend.calls >= 1)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        assert result == {"cancelled": True}
+        assert backend.calls == 1, backend.calls
+
+        assert "win_rate" in service.analyze_hand(_state(*SPOTS[2]), cancelled=lambda: False)["equity"]
+        logger.info(f"✅ Cancelled analysis returned after {elapsed_ms:.1f} ms")
+    finally:
+        service.shutdown()
+
+
+def test_hand_evaluator_cache_threads():
+    """The shared strength memo gives identical results under concurrent use"""
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    from core.domain import Card
+    from core.poker import HandEvaluator
+
+    deck = [Card.parse(r + s) for r in "23456789TJQKA" for s in "cdhs"]
+    rng = random.Random(5)
+    hands = [rng.sample(deck, 7) for _ in range(400)]
+    expected = [HandEvaluator().get_best_5_card_hand(hand)[1] for hand in hands]
+
+    shared = HandEvaluator()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda hand: shared.get_best_5_card_hand(hand)[1], hands * 3))
+    assert results == expected * 3
+    logger.info(f"✅ Hand evaluator cache: {len(shared._cache)} entries")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "Pipeline timings and results": test_pipeline_timings_and_results,
+        "Progressive results": test_progressive_results,
+        "Incremental re-analysis": test_incremental_reanalysis,
+        "Result cache": test_result_cache,
+        "Cached progress without equity": test_cached_progress_without_equity,
+        "Batch analysis": test_batch_analysis,
+        "Cancelled analysis": test_cancelled_analysis,
+        "Hand evaluator cache threads": test_hand_evaluator_cache_threads,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,150 @@
+"""
+Test script for the canonical flop texture table
+Run: python test_board_texture.py
+"""
+import sys
+import random
+import logging
+from itertools import combinations
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+BASE_FIELDS = ["monotone", "two_tone", "rainbow", "paired", "coordinated",
+               "straight_draws", "flush_draw", "dry"]
+
+
+def test_canonical_flop_count():
+    """22,100 raw flops collapse to 1,755 canonical ids"""
+    from core.poker import BoardTextureTable
+    from core.poker.fast_evaluator import index_to_card
+
+    table = BoardTextureTable()
+    ids = {table.flop_id([index_to_card(i) for i in flop]) for flop in combinations(range(52), 3)}
+    assert len(ids) == BoardTextureTable.NUM_CANONICAL_FLOPS
+    logger.info(f"✅ {len(ids)} canonical flops")
+
+
+def test_table_matches_direct_computation():
+    """Table lookups return the same fields as the direct computation"""
+    from core.poker import BoardAnalyzer
+    from core.poker.fast_evaluator import index_to_card
+
+    analyzer = BoardAnalyzer()
+    boards = [list(flop) for flop in combinations(range(52), 3)]
+    rng = random.Random(3)
+    boards += [rng.sample(range(52), rng.choice([4, 5])) for _ in range(5000)]
+
+    for board in boards:
+        cards = [index_to_card(i) for i in board]
+        fast = analyzer.analyze_texture(cards)
+        direct = analyzer._compute_texture(cards)
+        for field in BASE_FIELDS:
+            assert fast[field] == direct[field], (cards, field, fast, direct)
+    logger.info(f"✅ {len(boards)} boards match direct texture computation")
+
+
+def test_suit_isomorphic_boards_share_texture():
+    """Relabeling suits changes neither id nor texture"""
+    from core.domain import Card
+    from core.poker import BoardTextureTable
+
+    table = BoardTextureTable()
+    a = [Card('K', 's'), Card('K', 'h'), Card('2', 's'), Card('7', 'd')]
+    b = [Card('K', 'c'), Card('K', 'd'), Card('2', 'c'), Card('7', 'h')]
+    assert table.flop_id(a) == table.flop_id(b)
+    assert table.lookup(a) == table.lookup(b)
+    logger.info("✅ Suit-isomorphic boards share texture")
+
+
+def test_turn_river_memo_is_bounded():
+    """Turn and river textures are memoized up to MEMO_SIZE boards, least recently used first out"""
+    from core.poker import BoardTextureTable
+    from core.poker.fast_evaluator import cards_to_indices, index_to_card
+
+    table = BoardTextureTable()
+    rng = random.Random(11)
+    boards = [[index_to_card(i) for i in rng.sample(range(52), rng.choice([4, 5]))] for _ in range(300)]
+    expected = [table.lookup(board) for board in boards]
+
+    size = BoardTextureTable.MEMO_SIZE
+    BoardTextureTable.MEMO_SIZE = 16
+    table._memo.clear()
+    try:
+        for _ in range(2):
+            assert [table.lookup(board) for board in boards] == expected
+            assert len(table._memo) <= 16, len(table._memo)
+        # The board looked up last is still memoized
+        assert table._canonical(table._suit_masks(cards_to_indices(boards[-1]))) in table._memo
+    finally:
+        BoardTextureTable.MEMO_SIZE = size
+    logger.info(f"✅ Texture memo stays at {len(table._memo)} boards")
+
+
+def test_texture_index_queries():
+    """Every flop has a bucket and family; a flop's nearest neighbours start with itself"""
+    import numpy as np
+    from core.domain import Card
+    from core.poker import BoardTextureIndex, BoardTextureTable
+
+    index = BoardTextureIndex()
+    board = [Card('K', 'h'), Card('K', 'd'), Card('4', 'c')]
+    flop_id = index.table.flop_id(board)
+
+    assert index.nearest(board, 1) == [(flop_id, 0.0)]
+    # Flops sharing a feature vector are at distance 0; the query comes first even
+    # when a tied flop has a lower id
+    tied = next(i for i in range(1, len(index.vectors))
+                if np.all(index.vectors[:i] == index.vectors[i], axis=1).any())
+    same_vector = set(np.nonzero(np.all(index.vectors == index.vectors[tied], axis=1))[0].tolist())
+    neighbours = index.nearest(index.table.flop_cards(tied), len(same_vector) + 5)
+    assert neighbours[0] == (tied, 0.0)
+    assert all((distance == 0.0) == (neighbour in same_vector) for neighbour, distance in neighbours)
+    assert [distance for _, distance in neighbours] == sorted(distance for _, distance in neighbours)
+    assert index.family(board) == "paired broadway rainbow"
+    assert flop_id in index.flops_in_family("paired broadway rainbow")
+    assert flop_id in index.flops_in_bucket(index.bucket(board))
+    assert len(index.bucket_ids) == BoardTextureTable.NUM_CANONICAL_FLOPS
+    assert set(index.buckets_for(range(BoardTextureTable.NUM_CANONICAL_FLOPS))) == set(range(index.num_buckets))
+    assert index.family([Card('A', 's'), Card('K', 's'), Card('Q', 's')]) == "unpaired ace monotone"
+    logger.info(f"✅ {index.num_buckets} buckets, {len(index.family_names)} families")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "Canonical flop count": test_canonical_flop_count,
+        "Table vs direct computation": test_table_matches_direct_computation,
+        "Suit isomorphism": test_suit_isomorphic_boards_share_texture,
+        "Turn and river memo bound": test_turn_river_memo_is_bounded,
+        "Texture index queries": test_texture_index_queries,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,100 @@
+"""
+Test script for the EV calculator
+Run: python test_ev_calculator.py
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_ev_matches_formulas():
+    """Call and raise EVs match the pot-odds formulas; actions are ranked"""
+    from core.poker import EVCalculator
+
+    calculator = EVCalculator()
+    result = calculator.calculate(pot=150, to_call=50, hero_stack=1000, equity=0.3, bet_sizes=[200])
+    assert abs(result["call"]["ev"] - (0.3 * 200 - 50)) < 0.01
+    assert result["pot_odds"] == 25.0
+    # Raise to 200: opponent calls 150 more, pot 500
+    assert abs(result["raises"][0]["ev"] - (0.3 * 500 - 200)) < 0.01
+    assert result["best"]["action"] == "call"
+    assert [a["ev"] for a in result["actions"]] == sorted((a["ev"] for a in result["actions"]), reverse=True)
+
+    with_folds = calculator.calculate(pot=150, to_call=50, hero_stack=1000, equity=0.3, bet_sizes=[200],
+                                      fold_equity=0.6)
+    assert abs(with_folds["raises"][0]["ev"] - (0.6 * 150 + 0.4 * (0.3 * 500 - 200))) < 0.01
+
+    # Opponent can only call 100 more: the extra is never at risk
+    capped = calculator.calculate(pot=100, to_call=0, hero_stack=500, villain_stack=100, equity=0.6)
+    assert "fold" not in [a["action"] for a in capped["actions"]] and capped["check"]["ev"] == 60.0
+    assert capped["raises"][-1]["action"] == "all_in"
+    assert abs(capped["raises"][-1]["ev"] - (0.6 * 300 - 100)) < 0.01
+    assert "error" in calculator.calculate(pot=100, to_call=0, hero_stack=500)
+    logger.info(f"✅ EV formulas: best {result['best']}")
+
+
+def test_ev_distribution():
+    """Distribution mode: fold probability grows with size, opponent continues only when priced in"""
+    import numpy as np
+    from core.poker import EVCalculator
+
+    distribution = np.random.RandomState(1).beta(2, 2, 1081)
+    calculator = EVCalculator()
+    calculator.calculate(pot=150, to_call=50, hero_stack=1000, equity_distribution=distribution)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        result = calculator.calculate(pot=150, to_call=50, hero_stack=1000, equity_distribution=distribution)
+    elapsed_ms = (time.perf_counter() - start) * 10
+    assert elapsed_ms < 1.0, elapsed_ms
+
+    folds = [option["fold_probability"] for option in result["raises"]]
+    assert folds == sorted(folds) and folds[0] > 0
+    assert all(option["equity_when_called"] < result["equity"] for option in result["raises"])
+
+    # A raise to 200 costs the opponent 150 into a 500 pot: holdings below 30% villain equity fold
+    size = result["raises"][[o["amount"] for o in result["raises"]].index(200.0)]
+    expected_fold = float(((1 - distribution) < 0.3).mean()) * 100
+    assert abs(size["fold_probability"] - expected_fold) < 0.01
+    assert result["model"] == "distribution"
+    logger.info(f"✅ EV distribution: {elapsed_ms:.3f} ms, fold probabilities {folds}")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "EV formulas": test_ev_matches_formulas,
+        "EV distribution": test_ev_distribution,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,297 @@
+"""
+Test script for the fast batch evaluator and runout analysis
+Run: python test_fast_evaluator.py
+"""
+import sys
+import random
+import logging
+from itertools import combinations
+from collections import Counter
+from pathlib import Path
+import numpy as np
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _reference_score(cards):
+    """Slow but obvious 5-card ranking tuple, maximised over all 5-card subsets"""
+    best = None
+    for five in combinations(cards, 5):
+        ranks = sorted((c % 13 for c in five), reverse=True)
+        flush = len(set(c // 13 for c in five)) == 1
+        groups = sorted(Counter(ranks).items(), key=lambda x: (x[1], x[0]), reverse=True)
+        unique = sorted(set(ranks), reverse=True)
+        straight = None
+        if len(unique) == 5 and unique[0] - unique[4] == 4:
+            straight = unique[0]
+        if unique == [12, 3, 2, 1, 0]:
+            straight = 3
+        counts = [g[1] for g in groups]
+        group_ranks = tuple(g[0] for g in groups)
+
+        if straight is not None and flush:
+            score = (8, straight)
+        elif counts[0] == 4:
+            score = (7,) + group_ranks
+        elif counts[:2] == [3, 2]:
+            score = (6,) + group_ranks
+        elif flush:
+            score = (5,) + tuple(ranks)
+        elif straight is not None:
+            score = (4, straight)
+        elif counts[0] == 3:
+            score = (3,) + group_ranks
+        elif counts[:2] == [2, 2]:
+            score = (2,) + group_ranks
+        elif counts[0] == 2:
+            score = (1,) + group_ranks
+        else:
+            score = (0,) + tuple(ranks)
+        best = score if best is None else max(best, score)
+    return best
+
+
+def test_evaluator_matches_reference():
+    """Fast scores order hands exactly like the reference ranking"""
+    from core.poker.fast_evaluator import FastHandEvaluator
+
+    evaluator = FastHandEvaluator()
+    rng = random.Random(7)
+    hands = [rng.sample(range(52), rng.choice([5, 6, 7])) for _ in range(2000)]
+    reference = [_reference_score(hand) for hand in hands]
+    fast = [int(evaluator.evaluate_batch([hand])[0]) for hand in hands]
+
+    for ref, score in zip(reference, fast):
+        assert ref[0] == int(evaluator.category(score)), (ref, score)
+
+    for i in range(0, len(hands) - 1):
+        a, b = reference[i], reference[i + 1]
+        assert (a > b) == (fast[i] > fast[i + 1]), (hands[i], hands[i + 1])
+        assert (a == b) == (fast[i] == fast[i + 1]), (hands[i], hands[i + 1])
+    logger.info("✅ Fast evaluator matches reference ranking")
+
+
+def test_evaluator_matches_hand_evaluator():
+    """Category descriptions agree with HandEvaluator"""
+    from core.poker import HandEvaluator, FastHandEvaluator
+    from core.poker.fast_evaluator import index_to_card
+
+    evaluator = FastHandEvaluator()
+    slow = HandEvaluator()
+    rng = random.Random(11)
+    for _ in range(500):
+        cards = [index_to_card(i) for i in rng.sample(range(52), 7)]
+        best, _ = slow.get_best_5_card_hand(cards)
+        assert slow.get_hand_description(best) == evaluator.describe(evaluator.evaluate(cards))
+    logger.info("✅ Fast evaluator categories match HandEvaluator")
+
+
+def test_runout_enumeration():
+    """Exact runouts are every set of 0-2 remaining cards, pairs in index order"""
+    from itertools import combinations
+    from core.poker import FastHandEvaluator
+
+    remaining = FastHandEvaluator.remaining_indices([0, 13, 26, 39, 51])
+    assert FastHandEvaluator.runouts(remaining, 0).shape == (1, 0)
+    assert FastHandEvaluator.runouts(remaining, 1)[:, 0].tolist() == remaining.tolist()
+    assert [tuple(pair) for pair in FastHandEvaluator.runouts(remaining, 2).tolist()] == list(
+        combinations(remaining.tolist(), 2))
+    assert FastHandEvaluator.hole_combos().shape == (1326, 2)
+    logger.info(f"✅ {len(FastHandEvaluator.runouts(remaining, 2))} two-card runouts from {len(remaining)} cards")
+
+
+def test_backdoor_flush_count():
+    """Three to a flush on the flop: exactly C(10,2) runner-runner flush runouts"""
+    from core.domain import Card
+    from core.poker import RunoutAnalyzer
+
+    analyzer = RunoutAnalyzer()
+    hole = [Card('A', 'h'), Card('5', 'h')]
+    board = [Card('K', 'h'), Card('8', 'c'), Card('2', 'd')]
+    result = analyzer.analyze_backdoors(hole, board)
+
+    assert result["runouts"] == 1081
+    assert result["backdoor_flush"] == round(45 * 100.0 / 1081, 2)
+    assert abs(sum(result["category_distribution"].values()) - 100.0) < 0.1
+    assert "error" in analyzer.analyze_backdoors(hole, board + [Card('3', 's')])
+    logger.info(f"✅ Backdoor analysis: {result}")
+
+
+def test_hand_strength_matches_enumeration():
+    """River HS equals a plain loop over all opponent holdings"""
+    from core.poker import HandStrengthCalculator, FastHandEvaluator
+    from core.poker.fast_evaluator import index_to_card
+
+    evaluator = FastHandEvaluator()
+    calculator = HandStrengthCalculator(evaluator)
+    rng = random.Random(3)
+    for _ in range(5):
+        dealt = rng.sample(range(52), 7)
+        hole, board = dealt[:2], dealt[2:]
+        hero = evaluator.evaluate_batch([hole + board])[0]
+        rest = [c for c in range(52) if c not in dealt]
+        opponents = np.array([list(pair) + board for pair in combinations(rest, 2)])
+        scores = evaluator.evaluate_batch(opponents)
+        expected = ((scores < hero).sum() + (scores == hero).sum() / 2.0) / len(scores)
+
+        result = calculator.calculate([index_to_card(c) for c in hole],
+                                      [index_to_card(c) for c in board])
+        assert result["opponent_holdings"] == 990
+        assert result["hand_strength"] == round(expected * 100, 2)
+        assert result["ehs"] == result["hand_strength"]
+
+    flop = calculator.calculate([index_to_card(c) for c in (12, 25)],
+                                [index_to_card(c) for c in (5, 20, 33)])
+    assert flop["opponent_holdings"] == 1081
+    assert 0 <= flop["npot"] <= 100 and 0 <= flop["ppot"] <= 100
+    logger.info(f"✅ Hand strength: {flop}")
+
+
+def test_equity_vs_holdings():
+    """Per-holding equity agrees with HS on the river and aggregates to 169 classes"""
+    from core.domain import Card
+    from core.poker import EquityCalculator, HandStrengthCalculator
+
+    calculator = EquityCalculator()
+    hole = [Card('A', 'h'), Card('Q', 'h')]
+    board = [Card('K', 'h'), Card('8', 'h'), Card('2', 'd'), Card('3', 's'), Card('4', 'c')]
+
+    river = calculator.equity_vs_holdings(hole, board)
+    strength = HandStrengthCalculator().calculate(hole, board)
+    assert river["combos"] == 990
+    assert abs(river["equity"] - strength["hand_strength"]) < 0.01
+
+    flop = calculator.equity_vs_holdings(hole, board[:3])
+    assert flop["combos"] == 1081
+    assert sum(c["combos"] for c in flop["classes"].values()) == 1081
+    assert sum(c["combos"] for c in flop["by_category"].values()) == 1081
+    assert flop["classes"]["AA"]["combos"] == 3 and flop["classes"]["65o"]["combos"] == 12
+    assert flop["grid"][0][0] == flop["classes"]["AA"]["equity"]
+    assert flop["grid"][1][0] == flop["classes"]["AKo"]["equity"]
+    logger.info(f"✅ Equity vs holdings: {flop['equity']}% over {flop['combos']} combos")
+
+
+def test_runout_breakdown():
+    """Per-river equity on the turn equals the river equity grid for that card"""
+    from core.domain import Card
+    from core.poker import EquityCalculator
+
+    calculator = EquityCalculator()
+    hole = [Card('A', 'h'), Card('Q', 'h')]
+    turn = [Card('K', 'h'), Card('8', 'h'), Card('2', 'd'), Card('3', 's')]
+
+    breakdown = calculator.runout_breakdown(hole, turn)
+    assert breakdown["runouts"] == 46 and len(breakdown["next_cards"]) == 46
+    for card in (Card('5', 'h'), Card('8', 'c')):
+        river = calculator.equity_vs_holdings(hole, turn + [card])
+        assert abs(breakdown["next_cards"][str(card)]["equity"] - river["equity"]) < 0.01
+
+    flop = calculator.runout_breakdown(hole, turn[:3])
+    assert flop["runouts"] == 1081 and len(flop["next_cards"]) == 47
+    assert flop["next_cards"][flop["best_cards"][0]]["change"] > 0
+    assert abs(sum(flop["histogram"]) - 100) < 0.1
+    assert "error" in calculator.runout_breakdown(hole, turn + [Card('4', 'c')])
+    logger.info(f"✅ Runout breakdown: best {flop['best_cards']}, worst {flop['worst_cards']}")
+
+
+def test_showdown_categories():
+    """Exact and sampled showdown category distributions agree and sum to 100%"""
+    from core.domain import Card
+    from core.poker import EquityCalculator
+    from core.poker.fast_evaluator import cards_to_indices
+
+    calculator = EquityCalculator()
+    hole = [Card('A', 'h'), Card('Q', 'h')]
+    board = [Card('K', 'h'), Card('8', 'h'), Card('2', 'd')]
+
+    exact = calculator.calculate_range_equity(hole, board, ["random"])
+    weights = [np.ones(1326)]
+    weights[0][np.isnan(calculator._range_equity.holding_equity.outcome_vectors(hole, board)[0])] = 0
+    sampled = calculator._range_equity._sampled(cards_to_indices(hole + board), 3, weights, 100000, seed=2)
+
+    for result in (exact, sampled):
+        for key in ("hero_categories", "opponent_categories"):
+            assert abs(sum(result[key].values()) - 100) < 0.1
+    for name, pct in exact["hero_categories"].items():
+        assert abs(sampled["hero_categories"].get(name, 0) - pct) < 1.0, name
+    assert exact["hero_categories"]["flush"] > 30
+    logger.info(f"✅ Showdown categories: {exact['hero_categories']}")
+
+
+def test_equity_model_estimate():
+    """Shipped equity model is fast and its 95% error bound holds on random spots"""
+    import time
+    from core.poker import EquityApproximator, FastHandEvaluator
+    from core.poker.equity_model import simulate_spot
+    from core.poker.fast_evaluator import index_to_card
+
+    evaluator = FastHandEvaluator()
+    model = EquityApproximator.load(evaluator=evaluator)
+    rng = np.random.RandomState(7)
+
+    errors, covered = [], []
+    for spot in range(60):
+        cards = rng.choice(52, 2 + 3 + spot % 3, replace=False).tolist()
+        hole, board = cards[:2], cards[2:]
+        simulated, _ = simulate_spot(evaluator, rng, hole, board, 10000)
+        for opponents in (1, 3):
+            estimate = model.estimate([index_to_card(i) for i in hole], [index_to_card(i) for i in board], opponents)
+            error = abs(estimate["win_rate"] - simulated[opponents - 1])
+            errors.append(error)
+            covered.append(error <= estimate["error_bound"] + 1.0)
+    assert np.mean(errors) < 5.0
+    assert np.mean(covered) >= 0.85
+
+    hole, board = [index_to_card(i) for i in (10, 9)], [index_to_card(i) for i in (8, 2, 13)]
+    start = time.perf_counter()
+    for _ in range(200):
+        model.estimate(hole, board, 2)
+    elapsed = (time.perf_counter() - start) / 200
+    assert elapsed < 0.002
+    assert "error" in model.estimate(hole, [], 1)
+    logger.info(f"✅ Equity model: MAE {np.mean(errors):.2f}%, coverage {np.mean(covered):.0%}, "
+                f"{elapsed * 1e6:.0f} us per estimate")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "Evaluator vs reference": test_evaluator_matches_reference,
+        "Evaluator vs HandEvaluator": test_evaluator_matches_hand_evaluator,
+        "Runout enumeration": test_runout_enumeration,
+        "Backdoor flush count": test_backdoor_flush_count,
+        "Hand strength vs enumeration": test_hand_strength_matches_enumeration,
+        "Equity vs holdings": test_equity_vs_holdings,
+        "Runout breakdown": test_runout_breakdown,
+        "Showdown categories": test_showdown_categories,
+        "Equity model estimate": test_equity_model_estimate,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,212 @@
+"""
+Test script for hand history import
+Run: python test_hand_history.py
+"""
+import sys
+import logging
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+HISTORY = """﻿PokerStars Hand #1001:  Hold'em No Limit ($0.01/$0.02 USD) - 2024/01/01 12:00:00 ET
+Table 'Alpha' 6-max Seat #1 is the button
+Seat 1: Villain1 ($2.00 in chips)
+Seat 2: Villain2 ($2.00 in chips)
+Seat 3: Hero ($2.00 in chips)
+Seat 4: Villain3 ($2.00 in chips)
+Villain2: posts small blind $0.01
+Hero: posts big blind $0.02
+*** HOLE CARDS ***
+Dealt to Hero [Ah Qh]
+Villain3: raises $0.04 to $0.06
+Villain1: folds
+Villain2: calls $0.05
+Hero: calls $0.04
+*** FLOP *** [Kh 7h 2c]
+Villain2: checks
+Hero: checks
+Villain3: bets $0.10
+Villain2: folds
+Hero: raises $0.20 to $0.30
+Villain3: calls $0.20
+*** TURN *** [Kh 7h 2c] [Ts]
+Hero: bets $0.50
+Villain3: calls $0.50
+*** RIVER *** [Kh 7h 2c Ts] [3h]
+Hero: bets $1.14 and is all-in
+Villain3: folds
+Uncalled bet ($1.14) returned to Hero
+Hero collected $1.88 from pot
+*** SUMMARY ***
+Total pot $1.88 | Rake $0
+Seat 3: Hero (big blind) collected ($1.88)
+
+
+PokerStars Hand #1002: Omaha Pot Limit ($0.01/$0.02 USD) - 2024/01/01 12:01:00 ET
+Table 'Alpha' 6-max Seat #2 is the button
+Seat 1: Villain1 ($2.00 in chips)
+Seat 3: Hero ($2.00 in chips)
+*** HOLE CARDS ***
+Dealt to Hero [Ah Qh Kd 2c]
+*** SUMMARY ***
+
+
+PokerStars Hand #1003: Tournament #77, $1+$0.10 USD Hold'em No Limit - Level III (25/50) - 2024/01/01 12:02:00 ET
+Table '77 1' 9-max Seat #4 is the button
+Seat 2: Shorty (400 in chips)
+Seat 4: Hero (900 in chips)
+Seat 7: Bigstack (2000 in chips)
+Shorty: posts the ante 5
+Hero: posts the ante 5
+Bigstack: posts the ante 5
+Bigstack: posts small blind 25
+Shorty: posts big blind 50
+*** HOLE CARDS ***
+Dealt to Hero [9s 9d]
+Hero: raises 845 to 895 and is all-in
+Bigstack: folds
+Shorty: calls 345 and is all-in
+Uncalled bet (500) returned to Hero
+*** FLOP *** [9c 4h 4d]
+*** TURN *** [9c 4h 4d] [Js]
+*** RIVER *** [9c 4h 4d Js] [2h]
+*** SHOW DOWN ***
+Hero: shows [9s 9d] (a full house, Nines full of Fours)
+*** SUMMARY ***
+"""
+
+
+def _write_history(directory: Path, copies: int = 1) -> Path:
+    path = directory / "history.txt"
+    text = HISTORY
+    for i in range(1, copies):
+        text += "\n\n" + HISTORY.lstrip("﻿").replace("Hand #100", f"Hand #{i}00")
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_parse_streets():
+    """Each street hero sees becomes a GameState at hero's first decision"""
+    import tempfile
+    from core.domain import GameStage, GameType, Position, TableSize
+    from services.hand_history import HandHistoryParser
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write_history(Path(directory))
+        hands = list(HandHistoryParser().iter_hands(path))
+
+    assert [hand.hand_id for hand in hands] == ["1001", "1003"]
+    cash, tournament = hands
+    assert [state.stage for state in cash.states] == [GameStage.PREFLOP, GameStage.FLOP,
+                                                      GameStage.TURN, GameStage.RIVER]
+    preflop, flop, turn, river = cash.states
+    assert [str(card) for card in preflop.player_cards] == ["Ah", "Qh"]
+    # Villain1 folded before hero's decision
+    assert preflop.position == Position.BB and preflop.table_size == TableSize.THREE_MAX
+    assert (preflop.pot, preflop.to_call) == (0.14, 0.04)
+    assert preflop.stacks == [1.98, 1.94, 2.0, 1.94]
+    assert flop.table_size == TableSize.THREE_MAX and (flop.pot, flop.to_call) == (0.18, 0.0)
+    assert [str(card) for card in turn.board_cards] == ["Kh", "7h", "2c", "Ts"]
+    assert turn.table_size == TableSize.HEADS_UP and (turn.pot, turn.to_call) == (0.78, 0.0)
+    assert river.pot == 1.78 and river.stacks[0] == 1.14
+
+    # Hero is all-in preflop: later streets are snapshotted without a decision
+    assert [state.stage for state in tournament.states] == [GameStage.PREFLOP, GameStage.FLOP,
+                                                            GameStage.TURN, GameStage.RIVER]
+    first, last = tournament.states[0], tournament.states[-1]
+    assert first.game_type == GameType.TOURNAMENT and first.big_blind == 50.0
+    assert first.position == Position.BTN and first.table_size == TableSize.THREE_MAX
+    assert (first.pot, first.to_call) == (90.0, 50.0)
+    assert last.table_size == TableSize.HEADS_UP and last.pot == 830.0 and last.stacks == [500.0, 1970.0, 0.0]
+
+    # Resuming from a hand's end offset continues with the next hand
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write_history(Path(directory))
+        resumed = list(HandHistoryParser().iter_hands(path, cash.end_offset))
+    assert [hand.hand_id for hand in resumed] == ["1003"]
+    logger.info(f"✅ Parsed {sum(len(hand.states) for hand in hands)} snapshots from {len(hands)} hands")
+
+
+def test_import_resume():
+    """An interrupted import resumes from its checkpoint without losing or repeating hands"""
+    import json
+    import tempfile
+    from services import hand_history
+    from test_analysis_service import _service
+
+    class Interrupting:
+        """Service whose batch stops after a number of results"""
+        def __init__(self, service, limit):
+            self.service, self.limit = service, limit
+
+        def analyze_many(self, states, workers=1):
+            for count, result in enumerate(self.service.analyze_many(states, workers=workers)):
+                if count == self.limit:
+                    raise KeyboardInterrupt
+                yield result
+
+    service = _service()
+    checkpoint_hands = hand_history.CHECKPOINT_HANDS
+    hand_history.CHECKPOINT_HANDS = 2
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = _write_history(Path(directory), copies=4)
+            complete = Path(directory) / "complete.jsonl"
+            stats = hand_history.import_hand_histories([path], complete, service)
+            assert stats["hands"] == 8 and stats["states"] == 32 and stats["hands_per_second"] > 0
+
+            output = Path(directory) / "resumed.jsonl"
+            try:
+                hand_history.import_hand_histories([path], output, Interrupting(service, 21))
+                assert False, "import was not interrupted"
+            except KeyboardInterrupt:
+                pass
+            stats = hand_history.import_hand_histories([path], output, service, resume=True)
+            assert stats["hands"] == 4 and stats["total_hands"] == 8, stats
+
+            def rows(file):
+                return [(row["hand_id"], row["stage"], row["board"], row["current_hand"] if "current_hand" in row
+                         else row["hand_key"]) for row in map(json.loads, file.read_text().splitlines())]
+            assert rows(output) == rows(complete)
+            assert len(rows(complete)) == 32
+        logger.info(f"✅ Hand history import resumed: {stats}")
+    finally:
+        hand_history.CHECKPOINT_HANDS = checkpoint_hands
+        service.shutdown()
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "Parse streets": test_parse_streets,
+        "Import and resume": test_import_resume,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,184 @@
+"""
+Test script for hand ranges and range-aware equity
+Run: python test_ranges.py
+"""
+import sys
+import logging
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_range_parser_combo_counts():
+    """Standard notation expands to the expected number of combos"""
+    from core.poker import HandRange
+
+    expected = {
+        "AA": 6, "AKs": 4, "AKo": 12, "AK": 16, "TT+": 30, "22-55": 24,
+        "ATs+": 16, "A5s-A2s": 16, "KQo": 12, "AhKh": 1, "random": 1326,
+        "TT+, AKs, A5s-A2s, KQo": 62,
+    }
+    for text, combos in expected.items():
+        assert len(HandRange.parse(text)) == combos, text
+    assert HandRange.parse("QJs:0.5").combos == 2.0
+
+    for bad in ("XX", "AAs", "AKs-Q2s", "AhAh", "AK:2"):
+        try:
+            HandRange.parse(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad} should not parse")
+    logger.info("✅ Range parser combo counts")
+
+
+def test_range_equity_matches_holdings():
+    """Heads-up range equity is the range-weighted holding equity"""
+    from core.domain import Card
+    from core.poker import EquityCalculator
+
+    calculator = EquityCalculator()
+    hole = [Card('A', 'h'), Card('Q', 'h')]
+    board = [Card('K', 'h'), Card('8', 'h'), Card('2', 'd')]
+
+    single = calculator.calculate_range_equity(hole, board, ["KsKc"])
+    holdings = calculator.equity_vs_holdings(hole, board)["holdings"]
+    assert abs(single["win_rate"] + single["tie_rate"] / 2 - holdings["KcKs"]) < 0.01
+
+    exact = calculator.calculate_range_equity(hole, board, ["TT+, AKs, KQo"])
+    assert exact["calculation_mode"] == "range_exact"
+    assert exact["opponent_combos"] == [30.0]  # 21 pairs + 3 AKs + 6 KQo after Ah/Qh/Kh blockers
+
+    # The multiway sampler, run with one opponent, agrees with the exact value
+    from core.poker import HandRange
+    from core.poker.range_equity import RangeEquityCalculator
+    from core.poker.fast_evaluator import cards_to_indices
+
+    dead = cards_to_indices(hole + board)
+    weights = HandRange.parse("TT+, AKs, KQo").live_weights(dead)
+    sampled = RangeEquityCalculator()._sampled(dead, len(board), [weights], 200000, seed=1)
+    assert abs(sampled["win_rate"] - exact["win_rate"]) < 0.5
+
+    assert "error" in calculator.calculate_range_equity(hole, board, ["AhKh"])
+    assert "error" in calculator.calculate_range_equity(hole, board, ["XX"])
+    logger.info(f"✅ Range equity: {exact}")
+
+
+def _brute_force_equity(range_a, range_b, board):
+    """Pairwise loop over runouts and non-conflicting combo pairs"""
+    import numpy as np
+    from itertools import combinations
+    from core.poker import HandRange, FastHandEvaluator
+    from core.poker.fast_evaluator import cards_to_indices
+    from core.poker.holding_equity import ALL_COMBOS
+
+    evaluator = FastHandEvaluator()
+    dead = cards_to_indices(board)
+    weights_a = HandRange.parse(range_a).live_weights(dead)
+    weights_b = HandRange.parse(range_b).live_weights(dead)
+    remaining = [card for card in range(52) if card not in dead]
+
+    points = total = 0.0
+    for runout in combinations(remaining, 5 - len(dead)):
+        full = dead + list(runout)
+        scores = {}
+        for i in np.nonzero((weights_a > 0) | (weights_b > 0))[0]:
+            if not set(ALL_COMBOS[i]) & set(runout):
+                scores[i] = evaluator.evaluate_batch([list(ALL_COMBOS[i]) + full])[0]
+        for i in scores:
+            for j in scores:
+                if weights_a[i] and weights_b[j] and not set(ALL_COMBOS[i]) & set(ALL_COMBOS[j]):
+                    weight = weights_a[i] * weights_b[j]
+                    total += weight
+                    points += weight * (1.0 if scores[i] > scores[j] else 0.5 if scores[i] == scores[j] else 0.0)
+    return points / total * 100
+
+
+def test_range_vs_range_matches_brute_force():
+    """Rank/cumsum engine equals the pairwise loop, with overlapping ranges"""
+    from core.domain import Card
+    from core.poker import RangeVsRangeCalculator
+
+    calculator = RangeVsRangeCalculator()
+    range_a = "22+, A2s+, KTs+, AJo+, KQo"
+    range_b = "TT+, AKs, AQs, KQs, AKo, 87s"
+    board = [Card('K', 'h'), Card('8', 'h'), Card('2', 'd'), Card('3', 's')]
+
+    for cards in (board, board + [Card('4', 'c')]):
+        result = calculator.calculate(range_a, range_b, cards)
+        assert abs(result["equity"][0] - _brute_force_equity(range_a, range_b, cards)) < 0.01
+        assert abs(sum(result["equity"]) - 100) < 0.02
+        for summary in result["ranges"]:
+            assert abs(sum(summary["histogram"]) - 100) < 0.1
+
+    flop = calculator.calculate("random", "random", board[:3])
+    assert flop["equity"] == [50.0, 50.0]
+    assert flop["ranges"][0]["nut_share"] == flop["ranges"][1]["nut_share"]
+    logger.info(f"✅ Range vs range: {result['equity']}")
+
+
+def test_known_hands_equity():
+    """Several known hands in one pass match per-hand heads-up results"""
+    from core.domain import Card
+    from core.poker import EquityCalculator
+
+    calculator = EquityCalculator()
+    aces = [Card('A', 's'), Card('K', 'h')]
+    queens = [Card('Q', 'd'), Card('Q', 'c')]
+    board = [Card('J', 'h'), Card('T', 's'), Card('9', 'c')]
+
+    result = calculator.calculate_hands_equity([aces, queens], board)
+    assert result["calculation_mode"] == "known_exact"
+    assert [hand["hand"] for hand in result["hands"]] == ["AsKh", "QdQc"]
+
+    heads_up = calculator.calculate_range_equity(aces, board, ["QdQc"])
+    first, second = result["hands"]
+    assert first["win_rate"] == heads_up["win_rate"] and first["tie_rate"] == heads_up["tie_rate"]
+    assert abs(second["win_rate"] - first["lose_rate"]) < 0.02
+
+    # Unknown players are sampled; all players' wins and ties cover every showdown
+    result = calculator.calculate_hands_equity([aces, queens], board, num_unknown=2, iterations=20000)
+    unknown = result["unknown"]
+    assert unknown["players"] == 2
+    wins = sum(hand["win_rate"] for hand in result["hands"]) + unknown["win_rate"] * 2
+    assert wins <= 100.05
+    assert "error" in calculator.calculate_hands_equity([aces, aces], board)
+    logger.info(f"✅ Known hands: {[(h['hand'], h['win_rate']) for h in result['hands']]}")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "Range parser": test_range_parser_combo_counts,
+        "Range equity vs holdings": test_range_equity_matches_holdings,
+        "Range vs range vs brute force": test_range_vs_range_matches_brute_force,
+        "Known hands equity": test_known_hands_equity,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
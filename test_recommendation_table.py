@@ -0,0 +1,153 @@
+"""
+Test script for the compiled recommendation table
+Run: python test_recommendation_table.py
+"""
+import sys
+import logging
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+HAND_NAMES = {
+    'straight_flush': 'Straight Flush', 'four_kind': 'Four of a Kind', 'full_house': 'Full House',
+    'flush': 'Flush', 'straight': 'Straight', 'three_kind': 'Three of a Kind',
+    'two_pair': 'Two Pair', 'one_pair': 'One Pair', 'draw': 'High Card',
+}
+TEXTURE_FLAGS = ['monotone', 'coordinated', 'paired', 'flush_draw']
+
+
+def _grid():
+    """Input values at every threshold of ImprovedRecommendationEngine (and below the lowest)"""
+    from core.domain import GameStage
+
+    grid = {
+        ("win_rate", None): [12.5, 30, 40, 45, 50, 55, 60, 65, 70, 75, 88.8],
+        ("total_outs", None): [0, 1, 4, 5, 6, 7, 9, 12, 15],
+        ("num_opponents", None): [0, 1, 2, 3, 4, 6],
+        ("stage", None): list(GameStage),
+        ("outs", "set_trips"): [0, 2],
+        ("outs", "two_pair"): [0, 3],
+        ("outs", "flush"): [0, 9],
+        ("outs", "straight"): [0, 4, 8],
+        ("outs", "overcard"): [0, 3],
+    }
+    grid.update({("texture", flag): [False, True] for flag in TEXTURE_FLAGS})
+    return grid
+
+
+def _inputs(hand_name, values):
+    """generate_recommendation arguments for one grid point"""
+    return dict(
+        current_hand=hand_name,
+        win_rate=values[("win_rate", None)],
+        total_outs=values[("total_outs", None)],
+        outs_breakdown={key: value for (source, key), value in values.items() if source == "outs"},
+        texture_analysis={key: value for (source, key), value in values.items() if source == "texture"},
+        num_opponents=values[("num_opponents", None)],
+        stage=values[("stage", None)],
+        board_cards=[],
+    )
+
+
+def test_table_equivalence():
+    """The compiled table matches the engine over the full threshold grid of every hand type"""
+    import itertools
+    import random
+    from services.improved_abc_recommendations import ImprovedRecommendationEngine
+    from services.recommendation_table import CompiledRecommendationEngine, RULE_INPUTS
+
+    engine = ImprovedRecommendationEngine()
+    compiled = CompiledRecommendationEngine()
+    grid = _grid()
+    rng = random.Random(5)
+    checked = 0
+
+    for hand_type, rule_inputs in RULE_INPUTS.items():
+        # Every combination of the inputs the rules branch on, the others drawn at random
+        table_keys = [(source, key) for source, key, _ in rule_inputs]
+        other_keys = [name for name in grid if name not in table_keys]
+        table_points = list(itertools.product(*(grid[name] for name in table_keys)))
+        for point in itertools.islice(itertools.cycle(table_points), max(len(table_points), 2000)):
+            values = dict(zip(table_keys, point))
+            values.update({name: rng.choice(grid[name]) for name in other_keys})
+            inputs = _inputs(HAND_NAMES[hand_type], values)
+            expected = engine.generate_recommendation(**inputs)
+            assert compiled.generate_recommendation(**inputs) == expected, (hand_type, values)
+            checked += 1
+
+    # Unlisted hand names fall back to draws; EV advice is appended as before
+    ev_analysis = {"equity": 41.5, "pot_odds": 25.0, "actions": [
+        {"action": "fold", "amount": 0, "ev": 0.0},
+        {"action": "call", "amount": 20, "ev": 6.6},
+        {"action": "raise", "amount": 60, "ev": -3.1},
+    ]}
+    values = {name: options[-1] for name, options in grid.items()}
+    for hand_name in ["Royal Flush", "one pair", "TWO PAIR"]:
+        inputs = _inputs(hand_name, values)
+        assert (compiled.generate_recommendation(**inputs, ev_analysis=ev_analysis)
+                == engine.generate_recommendation(**inputs, ev_analysis=ev_analysis))
+    logger.info(f"✅ {checked} grid points match over {compiled.table_size()} table cells")
+
+
+def test_lookup_benchmark():
+    """Table lookups are faster than running the engine's rules"""
+    import random
+    import time
+    from services.improved_abc_recommendations import ImprovedRecommendationEngine
+    from services.recommendation_table import CompiledRecommendationEngine
+
+    engine = ImprovedRecommendationEngine()
+    compiled = CompiledRecommendationEngine()
+    grid = _grid()
+    rng = random.Random(8)
+    calls = [_inputs(rng.choice(list(HAND_NAMES.values())),
+                     {name: rng.choice(options) for name, options in grid.items()})
+             for _ in range(20000)]
+
+    timings = {}
+    for name, recommender in (("engine", engine), ("table", compiled)):
+        start = time.perf_counter()
+        for inputs in calls:
+            recommender.generate_recommendation(**inputs)
+        timings[name] = (time.perf_counter() - start) / len(calls) * 1e6
+
+    assert timings["table"] < timings["engine"], timings
+    logger.info(f"✅ Recommendation: engine {timings['engine']:.1f} us, table {timings['table']:.1f} us "
+                f"per call ({timings['engine'] / timings['table']:.1f}x)")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "Table equivalence": test_table_equivalence,
+        "Lookup benchmark": test_lookup_benchmark,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,149 @@
+"""
+Test script for the columnar analysis result store
+Run: python test_result_store.py
+"""
+import sys
+import logging
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_store_results():
+    """Analysis results round-trip through the store and can be queried by hand and texture"""
+    import tempfile
+    import numpy as np
+    from core.domain import Card, GameState, GameStage, GameType, TableSize
+    from services.result_store import AnalysisResultStore, RECOMMENDATION_CATEGORIES
+    from test_analysis_service import SPOTS, _service, _state
+
+    service = _service()
+    try:
+        states = [_state(*spot) for spot in SPOTS]
+        states.append(GameState(TableSize.THREE_MAX, GameType.CASH, GameStage.PREFLOP,
+                                [Card.parse("Ah"), Card.parse("Qh")], []))
+        results = list(service.analyze_many(states))
+    finally:
+        service.shutdown()
+
+    with tempfile.TemporaryDirectory() as directory:
+        with AnalysisResultStore(directory) as store:
+            store.extend(states, results)
+            assert len(store) == len(states)
+
+        store = AnalysisResultStore(directory)
+        assert len(store) == len(states)
+        frame = store.to_frame()
+        assert list(frame["hand"]) == ["AQs", "99", "JTs", "AKo", "AQs"]
+        assert list(frame["street"]) == ["Flop", "Turn", "Flop", "River", "Preflop"]
+        for row, result in zip(frame.itertuples(), results):
+            if "win_rate" in result.get("equity", {}):
+                expected = result["equity"]["win_rate"] + result["equity"]["tie_rate"] / 2
+                assert abs(row.equity - expected) < 1e-3
+                assert row.outs == result["total_outs"]
+                assert row.board_id == result["board_texture"]["flop_id"]
+                assert row.category in RECOMMENDATION_CATEGORIES
+            else:
+                assert abs(row.equity - result["equity_vs_random"]) < 1e-3
+                assert row.board_id == -1 and row.texture_bucket == -1 and row.outs == -1
+        assert frame["category"].iloc[1] == "monster"
+
+        # Indexed queries
+        aqs = store.columns(hand_key="AQs")
+        assert len(aqs["hand_key"]) == 2
+        bucket = int(frame["texture_bucket"].iloc[0])
+        by_bucket = store.columns(texture=bucket)
+        assert set(by_bucket["board_id"]) == set(frame.loc[frame["texture_bucket"] == bucket, "board_id"])
+        family = frame["family"].iloc[0]
+        assert np.all(store.to_frame(texture=family)["family"] == family)
+        assert len(store.columns(hand_key="AQs", texture=bucket)["hand_key"]) == 1
+
+        # The flop comes from the state, not from the result's texture
+        stale = dict(results[1], board_texture={**results[1]["board_texture"], "flop_id": 0})
+        store.append(states[1], stale)
+        assert store.columns()["board_id"][-1] == store.texture_index.table.flop_id(states[1].board_cards)
+        logger.info(f"✅ Stored {len(store)} results:\n{frame[['hand', 'street', 'family', 'equity', 'category']]}")
+
+
+def test_store_aggregation_scale():
+    """Mean equity by texture over millions of rows runs in seconds and matches numpy"""
+    import tempfile
+    import time
+    import numpy as np
+    from core.poker import BoardTextureIndex
+    from core.poker.holding_equity import HAND_CLASS_NAMES
+    from services.result_store import AnalysisResultStore, COLUMNS
+
+    rows = 2_000_000
+    rng = np.random.RandomState(3)
+    index = BoardTextureIndex()
+    board_id = rng.randint(len(index.bucket_ids), size=rows)
+    columns = {
+        "hand_key": rng.randint(169, size=rows),
+        "board_id": board_id,
+        "texture_bucket": index.bucket_ids[board_id],
+        "stage": rng.randint(1, 4, size=rows),
+        "equity": rng.uniform(0, 100, size=rows),
+        "outs": rng.randint(0, 16, size=rows),
+        "recommendation": rng.randint(5, size=rows),
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = AnalysisResultStore(directory, texture_index=index)
+        store.append_columns(columns)
+        store = AnalysisResultStore(directory, texture_index=index)
+        assert len(store) == rows
+
+        start = time.perf_counter()
+        means = store.mean_equity_by("texture_bucket")
+        elapsed = time.perf_counter() - start
+        equity = columns["equity"].astype(COLUMNS["equity"]).astype(np.float64)
+        expected = (np.bincount(columns["texture_bucket"], weights=equity)
+                    / np.bincount(columns["texture_bucket"]))
+        assert np.allclose(means["mean"].to_numpy(), expected, atol=1e-3)
+        assert elapsed < 5, elapsed
+
+        start = time.perf_counter()
+        aks = store.columns(hand_key="AKs", texture=7)
+        query_ms = (time.perf_counter() - start) * 1000
+        mask = (columns["hand_key"] == HAND_CLASS_NAMES.index("AKs")) & (columns["texture_bucket"] == 7)
+        assert np.array_equal(aks["board_id"], columns["board_id"][mask])
+        logger.info(f"✅ Mean equity by texture over {rows} rows in {elapsed:.2f}s, "
+                    f"indexed query {query_ms:.1f} ms ({mask.sum()} rows)")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "Store results": test_store_results,
+        "Aggregation at scale": test_store_aggregation_scale,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,159 @@
+"""
+Test script for tournament tools (ICM, preflop equity matrix, push/fold charts)
+Run: python test_tournament.py
+"""
+import sys
+import time
+import logging
+from itertools import permutations
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _brute_force_icm(stacks, payouts):
+    """Malmuth-Harville equity by enumerating every order of the paid places"""
+    equity = [0.0] * len(stacks)
+    for order in permutations(range(len(stacks)), len(payouts)):
+        probability, remaining = 1.0, float(sum(stacks))
+        for player in order:
+            probability *= stacks[player] / remaining
+            remaining -= stacks[player]
+        for place, player in enumerate(order):
+            equity[player] += probability * payouts[place]
+    return equity
+
+
+def test_icm_matches_brute_force():
+    """Exact and sampled ICM agree with full enumeration; busted stacks take the last places"""
+    from core.poker import ICMCalculator
+
+    stacks, payouts = [5000, 3000, 2000, 1500, 800, 400], [50, 30, 20]
+    expected = _brute_force_icm(stacks, payouts)
+    calculator = ICMCalculator(samples=50000, seed=7)
+    exact = calculator.equity(stacks, payouts)
+    assert max(abs(a - b) for a, b in zip(exact, expected)) < 1e-9
+
+    calculator.EXACT_SUBSET_LIMIT = 10
+    sampled = calculator.equity(stacks, payouts)
+    assert max(abs(a - b) for a, b in zip(sampled, expected)) < 0.5
+
+    result = ICMCalculator().calculate([5000, 0, 3000], [50, 30, 20])
+    assert result["equity"][1] == 20.0 and result["method"] == "exact"
+    assert abs(sum(result["equity"]) - 100.0) < 1e-6
+    assert "error" in ICMCalculator().calculate([1000], [100])
+    logger.info(f"✅ ICM equity: {[round(value, 2) for value in exact]}")
+
+
+def test_icm_final_table_speed():
+    """9-handed final table equity under 1 ms; bubble factors above chip EV"""
+    from core.poker import ICMCalculator
+
+    stacks = [1000 + 137 * i for i in range(9)]
+    payouts = [30, 20, 14, 10, 8, 6, 5, 4, 3]
+    calculator = ICMCalculator()
+    calculator.equity(stacks, payouts)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        calculator.equity(stacks, payouts)
+    elapsed_ms = (time.perf_counter() - start) * 10
+    assert elapsed_ms < 1.0, elapsed_ms
+
+    result = calculator.calculate(stacks, payouts)
+    assert result["bubble_factors"][0] is None
+    assert all(factor > 1.0 for factor in result["bubble_factors"][1:])
+    assert all(required > 50.0 for required in result["required_equity"][1:])
+    logger.info(f"✅ 9-handed ICM: {elapsed_ms:.3f} ms, bubble factors {result['bubble_factors'][1:]}")
+
+
+def test_preflop_matrix():
+    """Shipped matrix matches known matchups, is antisymmetric and agrees with fresh samples"""
+    import numpy as np
+    from core.poker import PreflopEquityMatrix
+    from core.poker.preflop_matrix import _sample_pairs, CLASS_INDEX
+
+    matrix = PreflopEquityMatrix.load()
+    assert isinstance(matrix.equity, np.memmap) and matrix.equity.shape == (169, 169)
+    assert np.allclose(matrix.equity + matrix.equity.T, 1.0, atol=1e-6)
+
+    # Reference all-in equities (ties half)
+    known = {("AA", "KK"): 0.820, ("AKs", "QQ"): 0.461, ("AKo", "22"): 0.475, ("72o", "AA"): 0.124}
+    for (a, b), expected in known.items():
+        assert abs(matrix.lookup(a, b) - expected) < 0.012, (a, b, matrix.lookup(a, b))
+    assert abs(matrix.versus_random("AA") - 0.852) < 0.005
+    assert abs(matrix.versus_random("72o") - 0.346) < 0.005
+
+    pairs = np.array([CLASS_INDEX["JTs"] * 169 + CLASS_INDEX["AKo"], CLASS_INDEX["T9s"] * 169 + CLASS_INDEX["77"]])
+    sampled = _sample_pairs(pairs, 20000, seed=11)
+    assert np.all(np.abs(sampled - matrix.equity.ravel()[pairs]) < 0.015), sampled
+
+    result = matrix.range_equity("QQ+, AKs", "random")
+    assert 75 < result["equity"][0] < 82, result
+    logger.info(f"✅ Preflop matrix: AA vs KK {matrix.lookup('AA', 'KK'):.3f}, QQ+/AKs vs random {result['equity'][0]}%")
+
+
+def test_push_fold_charts():
+    """Solver reproduces heads-up Nash at 10 BB; shipped charts answer by lookup"""
+    import numpy as np
+    from core.poker import PushFoldChart, PreflopEquityMatrix
+    from core.poker.push_fold import solve_push_fold, CLASS_COMBOS
+    from core.poker.preflop_matrix import CLASS_INDEX as names
+
+    matrix = PreflopEquityMatrix.load()
+    push, call = solve_push_fold(matrix.equity, matrix.pair_counts, 2, 10, ante=0.0)
+    push_pct = float((push[0] >= 0.5) @ CLASS_COMBOS) / CLASS_COMBOS.sum() * 100
+    call_pct = float((call[0, 1] >= 0.5) @ CLASS_COMBOS) / CLASS_COMBOS.sum() * 100
+    # Published heads-up Nash at 10 BB without antes: ~58% shove, ~38% call
+    assert 52 < push_pct < 64 and 32 < call_pct < 43, (push_pct, call_pct)
+
+    chart = PushFoldChart.load()
+    assert chart.should_push(9, 8, 10, names["AA"]) is True
+    assert chart.should_push(9, 8, 10, names["72o"]) is False
+    assert chart.should_push(2, 1, 1, names["72o"]) is True
+    assert chart.should_call(6, 2, 0, 8, names["AKo"]) is True
+    assert chart.should_push(6, 2, 35, names["AA"]) is None
+    shares = chart.push_share[7, 9]
+    assert np.all(np.diff(shares) < 0), shares
+    advice = chart.advice(names["A5s"], 6, 2, 12.4)
+    assert advice["seat"] == "BTN" and advice["stack_bb"] == 12 and len(advice["call_vs"]) == 3
+    logger.info(f"✅ Push/fold: HU 10bb {push_pct:.1f}% / {call_pct:.1f}%, {advice}")
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = {
+        "ICM vs brute force": test_icm_matches_brute_force,
+        "ICM final table speed": test_icm_final_table_speed,
+        "Preflop equity matrix": test_preflop_matrix,
+        "Push/fold charts": test_push_fold_charts,
+    }
+
+    results = {}
+    for name, test in tests.items():
+        try:
+            test()
+            results[name] = True
+        except Exception as e:
+            logger.error(f"❌ {name} failed: {e}", exc_info=True)
+            results[name] = False
+
+    passed = sum(1 for r in results.values() if r)
+    for name, result in results.items():
+        logger.info(f"{'✅ PASS' if result else '❌ FAIL'} - {name}")
+    logger.info(f"Results: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    # Change to project directory
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
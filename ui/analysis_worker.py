@@ -0,0 +1,107 @@
+"""Analysis Worker Thread for hand analysis off the GUI thread"""
+import logging
+import threading
+from dataclasses import replace
+from typing import Optional
+from PySide6.QtCore import QThread, Signal
+
+from core.domain import GameState
+from services.analysis_service import AnalysisService
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorker(QThread):
+    """
+    Background worker for hand analysis with latest-wins coalescing.
+
+    Only the most recent request is kept: submitting while an analysis runs
+    replaces any queued request and marks the running one stale, so the
+    service drops its remaining stages and no result is emitted for it.
+    Signals carry the request id returned by submit(), so receivers can
+    ignore anything still queued from an older request.
+    """
+
+    # Signals
+    analysis_complete = Signal(int, dict)  # request_id, analysis result
+    analysis_failed = Signal(int, str)  # request_id, error_message
+    analysis_cancelled = Signal()  # stale analysis dropped
+    analysis_progress = Signal(int, str, dict)  # request_id, stage, partial result
+
+    def __init__(self, analysis_service: AnalysisService):
+        super().__init__()
+        self.analysis_service = analysis_service
+        self._lock = threading.Lock()
+        self._pending: Optional[GameState] = None
+        self._generation = 0
+        self._active = False
+        self._should_stop = False
+
+    def submit(self, game_state: GameState) -> int:
+        """Queue a snapshot of the state for analysis, superseding older requests; returns the request id"""
+        snapshot = replace(
+            game_state,
+            player_cards=list(game_state.player_cards),
+            board_cards=list(game_state.board_cards),
+            stacks=list(game_state.stacks) if game_state.stacks else game_state.stacks,
+            payouts=list(game_state.payouts) if game_state.payouts else game_state.payouts,
+        )
+        with self._lock:
+            self._pending = snapshot
+            self._generation += 1
+            request_id = self._generation
+            start = not self._active
+            self._active = True
+        if start:
+            # A previous run may still be returning from run()
+            self.wait()
+            self.start()
+        return request_id
+
+    def cancel(self):
+        """Drop the queued request and mark the running analysis stale"""
+        with self._lock:
+            self._pending = None
+            self._generation += 1
+        logger.debug("AnalysisWorker analysis cancelled")
+
+    def run(self):
+        """Analyze requests until none is pending, emitting only current results"""
+        while True:
+            with self._lock:
+                game_state, generation = self._pending, self._generation
+                self._pending = None
+                if game_state is None or self._should_stop:
+                    self._active = False
+                    return
+
+            def is_stale() -> bool:
+                return self._should_stop or generation != self._generation
+
+            def progress(stage: str, data: dict):
+                if not is_stale():
+                    self.analysis_progress.emit(generation, stage, data)
+
+            try:
+                result = self.analysis_service.analyze_hand(
+                    game_state, progress=progress, cancelled=is_stale
+                )
+            except Exception as e:
+                logger.error(f"Analysis worker error: {e}", exc_info=True)
+                result = {"error": str(e)}
+
+            # Check cancellation after analysis
+            if is_stale() or result.get("cancelled"):
+                logger.debug("Stale analysis dropped")
+                self.analysis_cancelled.emit()
+            elif "error" in result:
+                self.analysis_failed.emit(generation, result["error"])
+            else:
+                self.analysis_complete.emit(generation, result)
+
+    def stop(self):
+        """Stop the worker thread gracefully"""
+        self._should_stop = True
+        self.cancel()
+        self.quit()
+        self.wait()
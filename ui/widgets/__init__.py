@@ -1,5 +1,6 @@
 """UI widgets package"""
 from .card_input import CardInputWidget
 from .selection_overlay import SelectionOverlay
+from .equity_grid import EquityGridWidget
 
-__all__ = ['CardInputWidget', 'SelectionOverlay']
+__all__ = ['CardInputWidget', 'SelectionOverlay', 'EquityGridWidget']
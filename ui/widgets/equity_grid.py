@@ -0,0 +1,52 @@
+"""13x13 hero equity heatmap against opponent hand classes"""
+
+from typing import Dict, Any, Optional
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QLabel
+
+
+class EquityGridWidget(QLabel):
+    """Rich-text chart: each cell is hero equity vs that opponent class"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setTextFormat(Qt.TextFormat.RichText)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setStyleSheet("padding: 4px; background-color: rgba(0, 0, 0, 0.3); border-radius: 4px;")
+
+    def set_grid(self, data: Dict[str, Any]):
+        """Render the result of EquityCalculator.equity_vs_holdings"""
+        grid = data.get("grid")
+        labels = data.get("grid_labels", "AKQJT98765432")
+        if not grid:
+            self.setText("")
+            return
+
+        rows = []
+        for row in range(13):
+            cells = []
+            for col in range(13):
+                if row == col:
+                    name = labels[row] * 2
+                elif row < col:
+                    name = labels[row] + labels[col] + "s"
+                else:
+                    name = labels[col] + labels[row] + "o"
+                cells.append(self._cell(name, grid[row][col]))
+            rows.append("<tr>" + "".join(cells) + "</tr>")
+
+        self.setText(
+            '<table cellspacing="1" cellpadding="2" style="font-size: 10px;">'
+            + "".join(rows) + "</table>"
+        )
+        self.setToolTip(f"Эквити против {data.get('combos', 0)} рук: {data.get('equity', 0):.2f}%")
+
+    @staticmethod
+    def _cell(name: str, equity: Optional[float]) -> str:
+        """One chart cell colored from red (hero behind) to green (hero ahead)"""
+        if equity is None:
+            return f'<td align="center" style="color: #555;">{name}</td>'
+        red = int(200 * (100 - equity) / 100)
+        green = int(200 * equity / 100)
+        return (f'<td align="center" style="background-color: rgb({red}, {green}, 40); color: #fff;">'
+                f'{name}<br>{equity:.0f}</td>')
@@ -16,8 +16,9 @@ from core.domain import Card, GameState, GameStage, TableSize, GameType
 from services.ml_service import MLService
 from services.analysis_service import AnalysisService
 from ui.dock_widgets import (TableConfigDock, CardsDock, ImagePreviewDock)
-from ui.widgets import SelectionOverlay
+from ui.widgets import SelectionOverlay, EquityGridWidget
 from ui.ml_worker import MLWorker
+from ui.analysis_worker import AnalysisWorker
 from ui.ui_config import UIConfigManager, WindowGeometry, DockState
 from utils.screen_capture import ScreenCapture
 
@@ -35,6 +36,9 @@ class AdaptiveMainWindow(QMainWindow):
     - Multi-monitor support
     """
     
+    # Analysis sections in display order (filled in as partial results arrive)
+    ANALYSIS_SECTIONS = ("hand_group", "texture_group", "holdings_group", "strategy_group")
+    
     def __init__(self, ml_service: MLService, analysis_service: AnalysisService):
         super().__init__()
 
@@ -48,6 +52,15 @@ class AdaptiveMainWindow(QMainWindow):
         self.ml_worker.detection_complete.connect(self._on_detection_complete)
         self.ml_worker.detection_failed.connect(self._on_detection_failed)
 
+        # Analysis Worker Thread keeps the GUI responsive during equity runs
+        self.analysis_worker = AnalysisWorker(analysis_service)
+        self.analysis_worker.analysis_complete.connect(self._on_analysis_complete)
+        self.analysis_worker.analysis_failed.connect(self._on_analysis_failed)
+        self.analysis_worker.analysis_progress.connect(self._on_analysis_progress)
+        self._analysis_request = 0
+        self._partial_result: Dict[str, Any] = {}
+        self._analysis_view: Dict[str, Any] = {}
+
         # UI Config Manager
         self.ui_config_manager = UIConfigManager()
 
@@ -493,6 +506,7 @@ class AdaptiveMainWindow(QMainWindow):
         
         self.update_game_state_display()
         
+        self.analysis_worker.cancel()
         self.create_default_analysis()
         
         self.statusBar().showMessage("🔄 All inputs cleared", 3000)
@@ -726,6 +740,7 @@ class AdaptiveMainWindow(QMainWindow):
     
     def clear_analysis_content(self):
         """Clear all content from analysis area"""
+        self._analysis_view = {}
         while self.analysis_layout.count():
             child = self.analysis_layout.takeAt(0)
             if child.widget():
@@ -760,34 +775,165 @@ class AdaptiveMainWindow(QMainWindow):
             self.update_game_state_display()
             self.statusBar().showMessage("🧠 Analyzing...", 1000)
             
-            # Perform analysis
-            analysis_result = self.analysis_service.analyze_hand(self.game_state)
-            
-            if "error" in analysis_result:
-                QMessageBox.warning(self, "Analysis Error", analysis_result["error"])
-            else:
-                self._display_analysis_result(analysis_result)
-            
-            self.statusBar().showMessage("✅ Analysis complete", 3000)
+            self._partial_result = {}
+            self._analysis_view = {}
+            self._analysis_request = self.analysis_worker.submit(self.game_state)
         
         except Exception as e:
             logger.error(f"Analysis error: {e}", exc_info=True)
             QMessageBox.critical(self, "Analysis Error", f"Failed to analyze: {e}")
             self.statusBar().showMessage("❌ Analysis error", 3000)
     
+    def _on_analysis_complete(self, request_id: int, result: dict):
+        """Handle analysis results from the worker thread"""
+        if request_id != self._analysis_request:
+            return
+        self._display_analysis_result(result)
+        self.statusBar().showMessage("✅ Analysis complete", 3000)
+    
+    def _on_analysis_failed(self, request_id: int, error_message: str):
+        """Handle analysis failure from the worker thread"""
+        if request_id != self._analysis_request:
+            return
+        logger.error(f"Analysis failed: {error_message}")
+        QMessageBox.warning(self, "Analysis Error", error_message)
+        self.statusBar().showMessage("❌ Analysis error", 3000)
+    
+    def _on_analysis_progress(self, request_id: int, stage: str, data: dict):
+        """Show partial results in place as the analysis stages finish"""
+        if request_id != self._analysis_request:
+            return
+        self._partial_result.update(data)
+        self._display_analysis_result(self._partial_result)
+        
+        if stage == "equity_estimate":
+            estimate = data["equity_estimate"]
+            self.statusBar().showMessage(
+                f"⚡ Эквити ≈ {estimate['win_rate']:.1f}% ±{estimate['error_bound']:.1f}% (оценка, идёт симуляция...)"
+            )
+        elif stage == "equity":
+            equity = data["equity"]
+            self.statusBar().showMessage(
+                f"⚡ Эквити {equity['win_rate']:.1f}% ±{equity['ci']:.1f}% "
+                f"({equity['simulations_completed']} симуляций, идёт уточнение...)"
+            )
+    
     def _display_analysis_result(self, result: Dict[str, Any]):
-        """Display analysis results in central analysis area"""
-        self.clear_analysis_content()
+        """
+        Display analysis results in central analysis area.
         
-        stage = result.get("stage", "")
+        The first call after a new request builds the view; later calls with
+        partial or final results update the shown sections in place and add
+        the ones that became available.
+        """
+        if not self._analysis_view:
+            self._build_analysis_view()
+        view = self._analysis_view
         
         # Cards display
         cards_display = " ".join(str(c) for c in self.game_state.player_cards)
         board_display = (" ".join(str(c) for c in self.game_state.board_cards) 
                         if self.game_state.board_cards else "No board")
+        view["title"].setText(f"Анализ - {result.get('stage', '')}")
+        view["cards"].setText(f"Player: {cards_display} | Board: {board_display}")
+        
+        # Hand strength analysis
+        if "current_hand" in result:
+            if "hand_group" not in view:
+                strength_group = QGroupBox("Анализ руки")
+                strength_layout = QVBoxLayout(strength_group)
+                
+                current_hand_label = QLabel()
+                current_hand_label.setStyleSheet("""
+                    font-size: 16px; 
+                    color: #fff; 
+                    padding: 8px; 
+                    font-weight: bold;
+                """)
+                strength_layout.addWidget(current_hand_label)
+                
+                outs_label = QLabel()
+                outs_label.setStyleSheet("""
+                    font-size: 14px; 
+                    color: #ccc; 
+                    padding: 8px; 
+                    font-family: 'Consolas', monospace;
+                    background-color: rgba(0, 0, 0, 0.3);
+                    border-radius: 4px;
+                """)
+                outs_label.setWordWrap(True)
+                strength_layout.addWidget(outs_label)
+                
+                view["current_hand"] = current_hand_label
+                view["outs"] = outs_label
+                self._add_analysis_section("hand_group", strength_group)
+            
+            view["current_hand"].setText(f"Текущая комбинация: {result['current_hand']}")
+            view["outs"].setText(self._outs_text(result))
+        
+        # Board texture
+        texture = result.get("board_texture", {})
+        if texture and "error" not in texture:
+            if "texture_group" not in view:
+                texture_group = QGroupBox("Текстура доски")
+                texture_layout = QVBoxLayout(texture_group)
+                
+                texture_label = QLabel()
+                texture_label.setStyleSheet("font-size: 14px; color: #ccc; padding: 8px;")
+                texture_label.setWordWrap(True)
+                texture_layout.addWidget(texture_label)
+                
+                view["texture"] = texture_label
+                self._add_analysis_section("texture_group", texture_group)
+            
+            view["texture"].setText(self._texture_text(texture))
+        
+        # Equity against every opponent holding
+        holding_equity = result.get("holding_equity", {})
+        if holding_equity and "error" not in holding_equity:
+            if "holdings_group" not in view:
+                grid_group = QGroupBox()
+                grid_layout = QVBoxLayout(grid_group)
+                grid_widget = EquityGridWidget()
+                grid_layout.addWidget(grid_widget)
+                
+                view["grid"] = grid_widget
+                self._add_analysis_section("holdings_group", grid_group)
+            
+            view["holdings_group"].setTitle(f"Эквити против рук соперника ({holding_equity.get('equity', 0):.2f}%)")
+            view["grid"].set_grid(holding_equity)
+        
+        # Strategy recommendation
+        strategy = result.get("strategy_recommendation", "")
+        if strategy:
+            if "strategy_group" not in view:
+                recommendations_group = QGroupBox("ABC Рекомендации")
+                recommendations_layout = QVBoxLayout(recommendations_group)
+                
+                strategy_label = QLabel()
+                strategy_label.setStyleSheet("""
+                    font-size: 14px; 
+                    color: #FFF9CB; 
+                    padding: 15px; 
+                    font-weight: bold; 
+                    border: 2px solid #FFD700; 
+                    border-radius: 8px; 
+                    background-color: rgba(180, 140, 0, 0.1);
+                """)
+                strategy_label.setWordWrap(True)
+                recommendations_layout.addWidget(strategy_label)
+                
+                view["strategy"] = strategy_label
+                self._add_analysis_section("strategy_group", recommendations_group)
+            
+            view["strategy"].setText(f"🎯 {strategy}")
+    
+    def _build_analysis_view(self):
+        """Replace the analysis area with the title and cards of a new analysis"""
+        self.clear_analysis_content()
         
         # Title
-        title = QLabel(f"Анализ - {stage}")
+        title = QLabel()
         title.setStyleSheet("""
             font-size: 20px; 
             font-weight: bold; 
@@ -798,7 +944,7 @@ class AdaptiveMainWindow(QMainWindow):
         """)
         
         # Cards info
-        cards_label = QLabel(f"Player: {cards_display} | Board: {board_display}")
+        cards_label = QLabel()
         cards_label.setStyleSheet("""
             font-size: 16px; 
             color: #81C784; 
@@ -811,135 +957,105 @@ class AdaptiveMainWindow(QMainWindow):
         
         self.add_analysis_widget(title)
         self.add_analysis_widget(cards_label)
-        
-        # Hand strength analysis
-        if "current_hand" in result:
-            from PySide6.QtWidgets import QGroupBox, QVBoxLayout
-            
-            strength_group = QGroupBox("Анализ руки")
-            strength_layout = QVBoxLayout(strength_group)
-            
-            current_hand_label = QLabel(f"Текущая комбинация: {result['current_hand']}")
-            current_hand_label.setStyleSheet("""
-                font-size: 16px; 
-                color: #fff; 
-                padding: 8px; 
-                font-weight: bold;
-            """)
-            strength_layout.addWidget(current_hand_label)
-            
-            # Outs analysis
-            outs_data = result.get("outs_analysis", {})
-            total_outs = result.get("total_outs", 0)
-            
-            if total_outs >= 0:
-                outs_text = f"🎯 АНАЛИЗ АУТОВ:\n"
-                outs_text += f"• Флеш: {outs_data.get('flush', 0)} аутов\n"
-                outs_text += f"• Стрит: {outs_data.get('straight', 0)} аутов\n"
-                outs_text += f"• Сет/Трипс: {outs_data.get('set_trips', 0)} аутов\n"
-                outs_text += f"• Оверкарты: {outs_data.get('overcard', 0)} аутов\n"
-                outs_text += f"━━━━━━━━━━━━━━━━━━━\n"
-                outs_text += f"📊 ВСЕГО АУТОВ: {total_outs}\n\n"
-                
-                # Calculate improvement equity
-                cards_to_come = 5 - len(self.game_state.board_cards)
-                if cards_to_come == 2:
-                    improvement_equity = min(total_outs * 4, 100)
-                    stage_text = "до ривера"
-                elif cards_to_come == 1:
-                    improvement_equity = min(total_outs * 2, 100)
-                    stage_text = "на ривере"
-                else:
-                    improvement_equity = 0
-                    stage_text = "завершен"
-                
-                outs_text += f"📈 Шанс улучшения {stage_text}: {improvement_equity:.2f}%\n"
-                
-                # Add equity if available
-                equity = result.get("equity", {})
-                if "win_rate" in equity and not equity.get("error"):
-                    outs_text += f"\n🏆 ВЕРОЯТНОСТЬ ПОБЕДЫ:\n"
-                    outs_text += f"• Победа: {equity.get('win_rate', 0):.2f}%\n"
-                    outs_text += f"• Ничья: {equity.get('tie_rate', 0):.2f}%\n"
-                    outs_text += f"• Поражение: {equity.get('lose_rate', 0):.2f}%"
-            else:
-                outs_text = "❌ Значимых дро не обнаружено"
-            
-            outs_label = QLabel(outs_text)
-            outs_label.setStyleSheet("""
-                font-size: 14px; 
-                color: #ccc; 
-                padding: 8px; 
-                font-family: 'Consolas', monospace;
-                background-color: rgba(0, 0, 0, 0.3);
-                border-radius: 4px;
-            """)
-            outs_label.setWordWrap(True)
-            strength_layout.addWidget(outs_label)
-            
-            self.add_analysis_widget(strength_group)
-        
-        # Board texture
-        texture = result.get("board_texture", {})
-        if texture and "error" not in texture:
-            from PySide6.QtWidgets import QGroupBox, QVBoxLayout
-            
-            texture_group = QGroupBox("Текстура доски")
-            texture_layout = QVBoxLayout(texture_group)
-            
-            features = []
-            if texture.get('monotone'):
-                features.append("🔴 Монотон")
-            elif texture.get('two_tone'):
-                features.append("🟡 Двухцветная")
-            elif texture.get('rainbow'):
-                features.append("🌈 Радужная")
-            
-            if texture.get('paired'):
-                features.append("👥 Спаренная")
-            
-            if texture.get('coordinated'):
-                features.append("🔗 Скоординированная")
-            elif texture.get('dry'):
-                features.append("🏜️ Сухая")
-            
-            if texture.get('flush_draw'):
-                features.append("💧 Флеш-дро")
-            
-            texture_text = ("Характеристики:\n" + "\n".join(f"• {f}" for f in features) 
-                          if features else "Стандартная")
-            
-            texture_label = QLabel(texture_text)
-            texture_label.setStyleSheet("font-size: 14px; color: #ccc; padding: 8px;")
-            texture_label.setWordWrap(True)
-            texture_layout.addWidget(texture_label)
-            
-            self.add_analysis_widget(texture_group)
-        
-        # Strategy recommendation
-        strategy = result.get("strategy_recommendation", "")
-        if strategy:
-            from PySide6.QtWidgets import QGroupBox, QVBoxLayout
-            
-            recommendations_group = QGroupBox("ABC Рекомендации")
-            recommendations_layout = QVBoxLayout(recommendations_group)
-            
-            strategy_label = QLabel(f"🎯 {strategy}")
-            strategy_label.setStyleSheet("""
-                font-size: 14px; 
-                color: #FFF9CB; 
-                padding: 15px; 
-                font-weight: bold; 
-                border: 2px solid #FFD700; 
-                border-radius: 8px; 
-                background-color: rgba(180, 140, 0, 0.1);
-            """)
-            strategy_label.setWordWrap(True)
-            recommendations_layout.addWidget(strategy_label)
-            
-            self.add_analysis_widget(recommendations_group)
-        
         self.add_analysis_stretch()
+        self._analysis_view = {"title": title, "cards": cards_label}
+    
+    def _add_analysis_section(self, name: str, widget: QWidget):
+        """Insert a section group at its place in ANALYSIS_SECTIONS order (after title and cards)"""
+        earlier = self.ANALYSIS_SECTIONS[:self.ANALYSIS_SECTIONS.index(name)]
+        index = 2 + sum(1 for section in earlier if section in self._analysis_view)
+        self.analysis_layout.insertWidget(index, widget)
+        self._analysis_view[name] = widget
+    
+    def _outs_text(self, result: Dict[str, Any]) -> str:
+        """Outs, draws and equity summary for the hand section"""
+        outs_data = result.get("outs_analysis", {})
+        total_outs = result.get("total_outs", 0)
+        
+        if total_outs < 0:
+            return "❌ Значимых дро не обнаружено"
+        
+        outs_text = f"🎯 АНАЛИЗ АУТОВ:\n"
+        outs_text += f"• Флеш: {outs_data.get('flush', 0)} аутов\n"
+        outs_text += f"• Стрит: {outs_data.get('straight', 0)} аутов\n"
+        outs_text += f"• Сет/Трипс: {outs_data.get('set_trips', 0)} аутов\n"
+        outs_text += f"• Оверкарты: {outs_data.get('overcard', 0)} аутов\n"
+        outs_text += f"━━━━━━━━━━━━━━━━━━━\n"
+        outs_text += f"📊 ВСЕГО АУТОВ: {total_outs}\n\n"
+        
+        # Calculate improvement equity
+        cards_to_come = 5 - len(self.game_state.board_cards)
+        if cards_to_come == 2:
+            improvement_equity = min(total_outs * 4, 100)
+            stage_text = "до ривера"
+        elif cards_to_come == 1:
+            improvement_equity = min(total_outs * 2, 100)
+            stage_text = "на ривере"
+        else:
+            improvement_equity = 0
+            stage_text = "завершен"
+        
+        outs_text += f"📈 Шанс улучшения {stage_text}: {improvement_equity:.2f}%\n"
+        
+        backdoor = result.get("backdoor_analysis", {})
+        if backdoor and "error" not in backdoor:
+            outs_text += (f"🔙 Бэкдор: флеш {backdoor.get('backdoor_flush', 0):.2f}%, "
+                          f"стрит {backdoor.get('backdoor_straight', 0):.2f}%\n")
+        strength = result.get("hand_strength_analysis", {})
+        if "ehs" in strength:
+            outs_text += (f"💡 Сила руки: HS {strength['hand_strength']:.2f}%, "
+                          f"EHS {strength['ehs']:.2f}% (+{strength['ppot']:.2f}% / -{strength['npot']:.2f}%)\n")
+        runouts = result.get("runout_breakdown", {})
+        if runouts and "error" not in runouts:
+            outs_text += (f"🃏 Лучшие карты: {' '.join(runouts.get('best_cards', []))} | "
+                          f"худшие: {' '.join(runouts.get('worst_cards', []))} "
+                          f"({runouts.get('improving_cards', 0)} улучшают)\n")
+        showdown = result.get("showdown_categories", {}).get("hero", {})
+        if showdown:
+            top = sorted(showdown.items(), key=lambda item: item[1], reverse=True)[:3]
+            outs_text += ("🎲 На шоудауне: " +
+                          ", ".join(f"{name.replace('_', ' ')} {pct:.1f}%" for name, pct in top) + "\n")
+        
+        # Add equity if available (refined while the simulation runs)
+        equity = result.get("equity", {})
+        if "win_rate" in equity and not equity.get("error"):
+            outs_text += f"\n🏆 ВЕРОЯТНОСТЬ ПОБЕДЫ:\n"
+            outs_text += f"• Победа: {equity.get('win_rate', 0):.2f}%\n"
+            outs_text += f"• Ничья: {equity.get('tie_rate', 0):.2f}%\n"
+            outs_text += f"• Поражение: {equity.get('lose_rate', 0):.2f}%"
+            if equity.get("ci"):
+                outs_text += (f"\n• Точность: ±{equity['ci']:.2f}% "
+                              f"({equity.get('simulations_completed', 0)} симуляций)")
+        elif "win_rate" in result.get("equity_estimate", {}):
+            estimate = result["equity_estimate"]
+            outs_text += (f"\n🏆 ВЕРОЯТНОСТЬ ПОБЕДЫ (оценка): "
+                          f"≈{estimate['win_rate']:.1f}% ±{estimate['error_bound']:.1f}%")
+        return outs_text
+    
+    @staticmethod
+    def _texture_text(texture: Dict[str, Any]) -> str:
+        """Board texture features for the texture section"""
+        features = []
+        if texture.get('monotone'):
+            features.append("🔴 Монотон")
+        elif texture.get('two_tone'):
+            features.append("🟡 Двухцветная")
+        elif texture.get('rainbow'):
+            features.append("🌈 Радужная")
+        
+        if texture.get('paired'):
+            features.append("👥 Спаренная")
+        
+        if texture.get('coordinated'):
+            features.append("🔗 Скоординированная")
+        elif texture.get('dry'):
+            features.append("🏜️ Сухая")
+        
+        if texture.get('flush_draw'):
+            features.append("💧 Флеш-дро")
+        
+        return ("Характеристики:\n" + "\n".join(f"• {f}" for f in features) 
+                if features else "Стандартная")
     
     # ==================== State Management ====================
     
@@ -1147,6 +1263,7 @@ class AdaptiveMainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event"""
+        self.analysis_worker.stop()
         self.save_ui_state()
         logger.info("Application closing - UI state saved")
         event.accept()
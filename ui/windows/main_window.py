@@ -16,8 +16,9 @@ from PySide6.QtGui import QImage, QPixmap
 from core.domain import Card, GameState, GameStage, TableSize, GameType
 from services.ml_service import MLService
 from services.analysis_service import AnalysisService
-from ui.widgets import CardInputWidget, SelectionOverlay
+from ui.widgets import CardInputWidget, SelectionOverlay, EquityGridWidget
 from ui.ml_worker import MLWorker
+from ui.analysis_worker import AnalysisWorker
 from utils.screen_capture import ScreenCapture
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,9 @@ logger = logging.getLogger(__name__)
 class MainWindow(QWidget):
     """Main application window with clean separation of concerns"""
     
+    # Analysis sections in display order (filled in as partial results arrive)
+    ANALYSIS_SECTIONS = ("hand_group", "texture_group", "holdings_group", "strategy_group")
+    
     def __init__(self, ml_service: MLService, analysis_service: AnalysisService):
         super().__init__()
         self.ml_service = ml_service
@@ -37,6 +41,15 @@ class MainWindow(QWidget):
         self.ml_worker.detection_complete.connect(self._on_detection_complete)
         self.ml_worker.detection_failed.connect(self._on_detection_failed)
 
+        # Analysis Worker Thread keeps the GUI responsive during equity runs
+        self.analysis_worker = AnalysisWorker(analysis_service)
+        self.analysis_worker.analysis_complete.connect(self._on_analysis_complete)
+        self.analysis_worker.analysis_failed.connect(self._on_analysis_failed)
+        self.analysis_worker.analysis_progress.connect(self._on_analysis_progress)
+        self._analysis_request = 0
+        self._partial_result = {}
+        self._analysis_view = {}
+
         self.roi: Optional[QRect] = None
         self.captured_frame: Optional[np.ndarray] = None
         self.game_state = GameState(
@@ -266,6 +279,7 @@ class MainWindow(QWidget):
         return frame
     
     def create_default_analysis(self):
+        self._analysis_view = {}
         while self.analysis_layout.count():
             child = self.analysis_layout.takeAt(0)
             if child.widget():
@@ -528,137 +542,237 @@ class MainWindow(QWidget):
             
             self.update_game_state_display()
             
-            analysis_result = self.analysis_service.analyze_hand(self.game_state)
-            
-            if "error" in analysis_result:
-                QMessageBox.warning(self, "Analysis Error", analysis_result["error"])
-            else:
-                self._display_analysis_result(analysis_result)
-            
-            self.status_label.setText("✅ Analysis complete")
+            self._partial_result = {}
+            self._analysis_view = {}
+            self._analysis_request = self.analysis_worker.submit(self.game_state)
         
         except Exception as e:
             logger.error(f"Analysis error: {e}", exc_info=True)
             QMessageBox.critical(self, "Analysis Error", f"Failed to analyze: {e}")
     
-    def _display_analysis_result(self, result: dict):
-        while self.analysis_layout.count():
-            child = self.analysis_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+    def _on_analysis_complete(self, request_id: int, result: dict):
+        """Handle analysis results from the worker thread"""
+        if request_id != self._analysis_request:
+            return
+        self._display_analysis_result(result)
+        self.status_label.setText("✅ Analysis complete")
+    
+    def _on_analysis_failed(self, request_id: int, error_message: str):
+        """Handle analysis failure from the worker thread"""
+        if request_id != self._analysis_request:
+            return
+        logger.error(f"Analysis failed: {error_message}")
+        QMessageBox.warning(self, "Analysis Error", error_message)
+        self.status_label.setText("❌ Analysis error")
+    
+    def _on_analysis_progress(self, request_id: int, stage: str, data: dict):
+        """Show partial results in place as the analysis stages finish"""
+        if request_id != self._analysis_request:
+            return
+        self._partial_result.update(data)
+        self._display_analysis_result(self._partial_result)
         
-        stage = result.get("stage", "")
+        if stage == "equity_estimate":
+            estimate = data["equity_estimate"]
+            self.status_label.setText(
+                f"⚡ Эквити ≈ {estimate['win_rate']:.1f}% ±{estimate['error_bound']:.1f}% (оценка, идёт симуляция...)"
+            )
+        elif stage == "equity":
+            equity = data["equity"]
+            self.status_label.setText(
+                f"⚡ Эквити {equity['win_rate']:.1f}% ±{equity['ci']:.1f}% "
+                f"({equity['simulations_completed']} симуляций, идёт уточнение...)"
+            )
+    
+    def _display_analysis_result(self, result: dict):
+        """Show (partial) results, updating existing sections in place"""
+        if not self._analysis_view:
+            self._build_analysis_view()
+        view = self._analysis_view
         
         cards_display = " ".join(str(c) for c in self.game_state.player_cards)
         board_display = " ".join(str(c) for c in self.game_state.board_cards) if self.game_state.board_cards else "No board"
-        
-        title = QLabel(f"Анализ - {stage}")
-        title.setStyleSheet("font-size: 20px; font-weight: bold; color: #4CAF50; padding: 10px;")
-        
-        cards_label = QLabel(f"Player: {cards_display} | Board: {board_display}")
-        cards_label.setStyleSheet("font-size: 16px; color: #81C784; padding: 8px; font-weight: bold;")
-        
-        self.analysis_layout.addWidget(title)
-        self.analysis_layout.addWidget(cards_label)
+        view["title"].setText(f"Анализ - {result.get('stage', '')}")
+        view["cards"].setText(f"Player: {cards_display} | Board: {board_display}")
         
         if "current_hand" in result:
-            strength_group = QGroupBox("Анализ руки")
-            strength_layout = QVBoxLayout(strength_group)
-            
-            current_hand_label = QLabel(f"Текущая комбинация: {result['current_hand']}")
-            current_hand_label.setStyleSheet("font-size: 16px; color: #fff; padding: 8px; font-weight: bold;")
-            strength_layout.addWidget(current_hand_label)
-            
-            outs_data = result.get("outs_analysis", {})
-            total_outs = result.get("total_outs", 0)
-            
-            if total_outs >= 0:
-                outs_text = f"🎯 АНАЛИЗ АУТОВ:\n"
-                outs_text += f"• Флеш: {outs_data.get('flush', 0)} аутов\n"
-                outs_text += f"• Стрит: {outs_data.get('straight', 0)} аутов\n"
-                outs_text += f"• Сет/Трипс: {outs_data.get('set_trips', 0)} аутов\n"
-                outs_text += f"• Оверкарты: {outs_data.get('overcard', 0)} аутов\n"
-                outs_text += f"━━━━━━━━━━━━━━━━━━━\n"
-                outs_text += f"📊 ВСЕГО АУТОВ: {total_outs}\n\n"
+            if "hand_group" not in view:
+                strength_group = QGroupBox("Анализ руки")
+                strength_layout = QVBoxLayout(strength_group)
                 
-                cards_to_come = 5 - len(self.game_state.board_cards)
-                if cards_to_come == 2:
-                    improvement_equity = min(total_outs * 4, 100)
-                    stage_text = "до ривера"
-                elif cards_to_come == 1:
-                    improvement_equity = min(total_outs * 2, 100)
-                    stage_text = "на ривере"
-                else:
-                    improvement_equity = 0
-                    stage_text = "завершен"
+                current_hand_label = QLabel()
+                current_hand_label.setStyleSheet("font-size: 16px; color: #fff; padding: 8px; font-weight: bold;")
+                strength_layout.addWidget(current_hand_label)
                 
-                outs_text += f"📈 Шанс улучшения {stage_text}: {improvement_equity:.2f}%\n"
+                outs_label = QLabel()
+                outs_label.setStyleSheet("font-size: 14px; color: #ccc; padding: 8px; font-family: 'Consolas';")
+                outs_label.setWordWrap(True)
+                strength_layout.addWidget(outs_label)
                 
-                equity = result.get("equity", {})
-                if "win_rate" in equity and not equity.get("error"):
-                    outs_text += f"\n🏆 ВЕРОЯТНОСТЬ ПОБЕДЫ:\n"
-                    outs_text += f"• Победа: {equity.get('win_rate', 0):.2f}%\n"
-                    outs_text += f"• Ничья: {equity.get('tie_rate', 0):.2f}%\n"
-                    outs_text += f"• Поражение: {equity.get('lose_rate', 0):.2f}%"
-            else:
-                outs_text = "❌ Значимых дро не обнаружено"
-            
-            outs_label = QLabel(outs_text)
-            outs_label.setStyleSheet("font-size: 14px; color: #ccc; padding: 8px; font-family: 'Consolas';")
-            outs_label.setWordWrap(True)
-            strength_layout.addWidget(outs_label)
+                view["current_hand"] = current_hand_label
+                view["outs"] = outs_label
+                self._add_analysis_section("hand_group", strength_group)
             
-            self.analysis_layout.addWidget(strength_group)
+            view["current_hand"].setText(f"Текущая комбинация: {result['current_hand']}")
+            view["outs"].setText(self._outs_text(result))
         
         texture = result.get("board_texture", {})
         if texture and "error" not in texture:
-            texture_group = QGroupBox("Текстура доски")
-            texture_layout = QVBoxLayout(texture_group)
-            
-            features = []
-            if texture.get('monotone'):
-                features.append("🔴 Монотон")
-            elif texture.get('two_tone'):
-                features.append("🟡 Двухцветная")
-            elif texture.get('rainbow'):
-                features.append("🌈 Радужная")
-            
-            if texture.get('paired'):
-                features.append("👥 Спаренная")
-            
-            if texture.get('coordinated'):
-                features.append("🔗 Скоординированная")
-            elif texture.get('dry'):
-                features.append("🏜️ Сухая")
-            
-            if texture.get('flush_draw'):
-                features.append("💧 Флеш-дро")
-            
-            texture_text = "Характеристики:\n" + "\n".join(f"• {f}" for f in features) if features else "Стандартная"
+            if "texture_group" not in view:
+                texture_group = QGroupBox("Текстура доски")
+                texture_layout = QVBoxLayout(texture_group)
+                
+                texture_label = QLabel()
+                texture_label.setStyleSheet("font-size: 14px; color: #ccc; padding: 8px;")
+                texture_label.setWordWrap(True)
+                texture_layout.addWidget(texture_label)
+                
+                view["texture"] = texture_label
+                self._add_analysis_section("texture_group", texture_group)
             
-            texture_label = QLabel(texture_text)
-            texture_label.setStyleSheet("font-size: 14px; color: #ccc; padding: 8px;")
-            texture_label.setWordWrap(True)
-            texture_layout.addWidget(texture_label)
+            view["texture"].setText(self._texture_text(texture))
+        
+        holding_equity = result.get("holding_equity", {})
+        if holding_equity and "error" not in holding_equity:
+            if "holdings_group" not in view:
+                grid_group = QGroupBox()
+                grid_layout = QVBoxLayout(grid_group)
+                grid_widget = EquityGridWidget()
+                grid_layout.addWidget(grid_widget)
+                view["grid"] = grid_widget
+                self._add_analysis_section("holdings_group", grid_group)
             
-            self.analysis_layout.addWidget(texture_group)
+            view["holdings_group"].setTitle(f"Эквити против рук соперника ({holding_equity.get('equity', 0):.2f}%)")
+            view["grid"].set_grid(holding_equity)
         
         strategy = result.get("strategy_recommendation", "")
         if strategy:
-            recommendations_group = QGroupBox("ABC Рекомендации")
-            recommendations_layout = QVBoxLayout(recommendations_group)
-            
-            strategy_label = QLabel(f"🎯 {strategy}")
-            strategy_label.setStyleSheet("""
-                font-size: 14px; color: #FFF9CB; padding: 15px; font-weight: bold; 
-                border: 2px solid #FFD700; border-radius: 8px; background-color: rgba(180, 140, 0, 0.1);
-            """)
-            strategy_label.setWordWrap(True)
-            recommendations_layout.addWidget(strategy_label)
+            if "strategy_group" not in view:
+                recommendations_group = QGroupBox("ABC Рекомендации")
+                recommendations_layout = QVBoxLayout(recommendations_group)
+                
+                strategy_label = QLabel()
+                strategy_label.setStyleSheet("""
+                    font-size: 14px; color: #FFF9CB; padding: 15px; font-weight: bold; 
+                    border: 2px solid #FFD700; border-radius: 8px; background-color: rgba(180, 140, 0, 0.1);
+                """)
+                strategy_label.setWordWrap(True)
+                recommendations_layout.addWidget(strategy_label)
+                
+                view["strategy"] = strategy_label
+                self._add_analysis_section("strategy_group", recommendations_group)
             
-            self.analysis_layout.addWidget(recommendations_group)
+            view["strategy"].setText(f"🎯 {strategy}")
+    
+    def _build_analysis_view(self):
+        """Replace the analysis area with the title and cards of a new analysis"""
+        while self.analysis_layout.count():
+            child = self.analysis_layout.takeAt(0)
+            if child.widget():
+                child.widget().deleteLater()
+        
+        title = QLabel()
+        title.setStyleSheet("font-size: 20px; font-weight: bold; color: #4CAF50; padding: 10px;")
         
+        cards_label = QLabel()
+        cards_label.setStyleSheet("font-size: 16px; color: #81C784; padding: 8px; font-weight: bold;")
+        
+        self.analysis_layout.addWidget(title)
+        self.analysis_layout.addWidget(cards_label)
         self.analysis_layout.addStretch()
+        self._analysis_view = {"title": title, "cards": cards_label}
+    
+    def _add_analysis_section(self, name: str, widget: QWidget):
+        """Insert a section group at its place in ANALYSIS_SECTIONS order (after title and cards)"""
+        earlier = self.ANALYSIS_SECTIONS[:self.ANALYSIS_SECTIONS.index(name)]
+        index = 2 + sum(1 for section in earlier if section in self._analysis_view)
+        self.analysis_layout.insertWidget(index, widget)
+        self._analysis_view[name] = widget
+    
+    def _outs_text(self, result: dict) -> str:
+        outs_data = result.get("outs_analysis", {})
+        total_outs = result.get("total_outs", 0)
+        
+        if total_outs < 0:
+            return "❌ Значимых дро не обнаружено"
+        
+        outs_text = f"🎯 АНАЛИЗ АУТОВ:\n"
+        outs_text += f"• Флеш: {outs_data.get('flush', 0)} аутов\n"
+        outs_text += f"• Стрит: {outs_data.get('straight', 0)} аутов\n"
+        outs_text += f"• Сет/Трипс: {outs_data.get('set_trips', 0)} аутов\n"
+        outs_text += f"• Оверкарты: {outs_data.get('overcard', 0)} аутов\n"
+        outs_text += f"━━━━━━━━━━━━━━━━━━━\n"
+        outs_text += f"📊 ВСЕГО АУТОВ: {total_outs}\n\n"
+        
+        cards_to_come = 5 - len(self.game_state.board_cards)
+        if cards_to_come == 2:
+            improvement_equity = min(total_outs * 4, 100)
+            stage_text = "до ривера"
+        elif cards_to_come == 1:
+            improvement_equity = min(total_outs * 2, 100)
+            stage_text = "на ривере"
+        else:
+            improvement_equity = 0
+            stage_text = "завершен"
+        
+        outs_text += f"📈 Шанс улучшения {stage_text}: {improvement_equity:.2f}%\n"
+        
+        backdoor = result.get("backdoor_analysis", {})
+        if backdoor and "error" not in backdoor:
+            outs_text += (f"🔙 Бэкдор: флеш {backdoor.get('backdoor_flush', 0):.2f}%, "
+                          f"стрит {backdoor.get('backdoor_straight', 0):.2f}%\n")
+        strength = result.get("hand_strength_analysis", {})
+        if "ehs" in strength:
+            outs_text += (f"💡 Сила руки: HS {strength['hand_strength']:.2f}%, "
+                          f"EHS {strength['ehs']:.2f}% (+{strength['ppot']:.2f}% / -{strength['npot']:.2f}%)\n")
+        runouts = result.get("runout_breakdown", {})
+        if runouts and "error" not in runouts:
+            outs_text += (f"🃏 Лучшие карты: {' '.join(runouts.get('best_cards', []))} | "
+                          f"худшие: {' '.join(runouts.get('worst_cards', []))} "
+                          f"({runouts.get('improving_cards', 0)} улучшают)\n")
+        showdown = result.get("showdown_categories", {}).get("hero", {})
+        if showdown:
+            top = sorted(showdown.items(), key=lambda item: item[1], reverse=True)[:3]
+            outs_text += ("🎲 На шоудауне: " +
+                          ", ".join(f"{name.replace('_', ' ')} {pct:.1f}%" for name, pct in top) + "\n")
+        
+        equity = result.get("equity", {})
+        if "win_rate" in equity and not equity.get("error"):
+            outs_text += f"\n🏆 ВЕРОЯТНОСТЬ ПОБЕДЫ:\n"
+            outs_text += f"• Победа: {equity.get('win_rate', 0):.2f}%\n"
+            outs_text += f"• Ничья: {equity.get('tie_rate', 0):.2f}%\n"
+            outs_text += f"• Поражение: {equity.get('lose_rate', 0):.2f}%"
+            if equity.get("ci"):
+                outs_text += (f"\n• Точность: ±{equity['ci']:.2f}% "
+                              f"({equity.get('simulations_completed', 0)} симуляций)")
+        elif "win_rate" in result.get("equity_estimate", {}):
+            estimate = result["equity_estimate"]
+            outs_text += (f"\n🏆 ВЕРОЯТНОСТЬ ПОБЕДЫ (оценка): "
+                          f"≈{estimate['win_rate']:.1f}% ±{estimate['error_bound']:.1f}%")
+        return outs_text
+    
+    @staticmethod
+    def _texture_text(texture: dict) -> str:
+        features = []
+        if texture.get('monotone'):
+            features.append("🔴 Монотон")
+        elif texture.get('two_tone'):
+            features.append("🟡 Двухцветная")
+        elif texture.get('rainbow'):
+            features.append("🌈 Радужная")
+        
+        if texture.get('paired'):
+            features.append("👥 Спаренная")
+        
+        if texture.get('coordinated'):
+            features.append("🔗 Скоординированная")
+        elif texture.get('dry'):
+            features.append("🏜️ Сухая")
+        
+        if texture.get('flush_draw'):
+            features.append("💧 Флеш-дро")
+        
+        return "Характеристики:\n" + "\n".join(f"• {f}" for f in features) if features else "Стандартная"
     
     def save_roi(self):
         if self.roi:
@@ -701,6 +815,7 @@ class MainWindow(QWidget):
         self.game_state.stage = GameStage.PREFLOP
         
         self.update_game_state_display()
+        self.analysis_worker.cancel()
         self.create_default_analysis()
         self.status_label.setText("🔄 All inputs cleared")
         logger.info("All inputs cleared")
@@ -808,6 +923,7 @@ class MainWindow(QWidget):
             logger.error(f"HANDLER: Exception: {e}", exc_info=True)   
 
     def closeEvent(self, event):
+        self.analysis_worker.stop()
         logger.info("Application closing")
         event.accept()
 